@@ -80,22 +80,170 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# DB_ENGINE permite una base SQLite local (DB_NAME = ruta) para benchmarks
+# El default es PostgreSQL con pool de conexiones (ver voting/backends/postgresql)
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': config('DB_ENGINE', default='voting.backends.postgresql'),
         'NAME': config('DB_NAME'),
-        'USER': config('DB_USER'),
-        'PASSWORD': config('DB_PASSWORD'),
-        'HOST': config('DB_HOST'),
+        'USER': config('DB_USER', default=''),
+        'PASSWORD': config('DB_PASSWORD', default=''),
+        'HOST': config('DB_HOST', default=''),
         'PORT': config('DB_PORT', default='5432'),
+        'OPTIONS': {},
     }
 }
 
+# ============================================
+# CONFIGURACIÓN DE CONEXIONES A LA BASE DE DATOS
+# ============================================
+
+# Pool de conexiones por proceso (0 = sin pool, una conexión por petición).
+# Cada petición toma una conexión y la devuelve al terminar; si no hay
+# libre en DB_POOL_TIMEOUT segundos la petición falla.
+# Con DB_MAX_CONNECTIONS (límite total de la base) el máximo por proceso
+# se reparte entre los WEB_CONCURRENCY workers de gunicorn.
+DB_MAX_CONNECTIONS = config('DB_MAX_CONNECTIONS', default=0, cast=int)
+WEB_CONCURRENCY = config('WEB_CONCURRENCY', default=1, cast=int)
+DB_POOL_MIN_SIZE = config('DB_POOL_MIN_SIZE', default=1, cast=int)
+DB_POOL_MAX_SIZE = config(
+    'DB_POOL_MAX_SIZE',
+    default=max(DB_MAX_CONNECTIONS // max(WEB_CONCURRENCY, 1), 1) if DB_MAX_CONNECTIONS else 10,
+    cast=int
+)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=10, cast=float)
+
+# Sin pool (WSGI): segundos que se reutiliza la conexión de cada thread.
+# Bajo ASGI cada petición corre en un thread nuevo, así que debe quedar en 0.
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=0, cast=int)
+
+# Verificar la conexión (reutilizada o tomada del pool) antes de usarla
+DB_CONN_HEALTH_CHECKS = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+
+# PgBouncer/Supavisor en modo transacción (puerto 6543 de Supabase): cada
+# transacción puede ir a una conexión distinta del servidor, así que no
+# sirven los cursores del lado del servidor, los prepared statements ni
+# los SET de sesión.
+DB_TRANSACTION_POOLING = config(
+    'DB_TRANSACTION_POOLING',
+    default=DATABASES['default']['PORT'] == '6543',
+    cast=bool
+)
+
+# statement_timeout en milisegundos (0 = sin límite). Las vistas de lectura
+# de resultados usan el corto y las exportaciones el largo; el resto, el
+# default. En modo transacción no se aplican: rige el statement_timeout
+# del rol en la base de datos.
+DB_STATEMENT_TIMEOUT = config('DB_STATEMENT_TIMEOUT', default=5000, cast=int)
+DB_READ_STATEMENT_TIMEOUT = config('DB_READ_STATEMENT_TIMEOUT', default=1000, cast=int)
+DB_EXPORT_STATEMENT_TIMEOUT = config('DB_EXPORT_STATEMENT_TIMEOUT', default=300000, cast=int)
+
+# El pool y statement_timeout son del backend voting.backends.postgresql
+voting_backend = DATABASES['default']['ENGINE'] == 'voting.backends.postgresql'
+
+if 'postgresql' in DATABASES['default']['ENGINE']:
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = DB_CONN_HEALTH_CHECKS
+
+    if voting_backend and DB_POOL_MAX_SIZE:
+        # El pool reemplaza a las conexiones persistentes de Django
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': min(DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE),
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+        }
+    else:
+        DATABASES['default']['CONN_MAX_AGE'] = DB_CONN_MAX_AGE
+
+    if DB_TRANSACTION_POOLING:
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+        DATABASES['default']['OPTIONS']['prepare_threshold'] = None
+    elif voting_backend:
+        DATABASES['default']['OPTIONS']['statement_timeout'] = DB_STATEMENT_TIMEOUT
+
+
+# ============================================
+# RÉPLICA DE LECTURA
+# ============================================
+
+# Con DB_REPLICA_HOST (PostgreSQL) o DB_REPLICA_NAME (otra base SQLite
+# local) resultados e historial leen de la réplica (ver voting/routers.py).
+# Tras votar, el usuario lee del primario durante REPLICA_PIN_SECONDS:
+# debe superar el atraso normal de la réplica.
+DB_REPLICA_HOST = config('DB_REPLICA_HOST', default='')
+DB_REPLICA_NAME = config('DB_REPLICA_NAME', default='')
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+
+if DB_REPLICA_HOST or DB_REPLICA_NAME:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': DB_REPLICA_NAME or DATABASES['default']['NAME'],
+        'HOST': DB_REPLICA_HOST or DATABASES['default']['HOST'],
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        # En los tests la réplica es la misma base de prueba
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['voting.routers.ReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Usar un backend compartido (ej. FileBasedCache) cuando hay varios procesos
+
+# Con WEB_CONCURRENCY > 1 debe ser compartido entre workers (Redis,
+# Memcached): versiones de ETag, resultados en vivo y has-voted viven aquí
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='app-votar'),
+    }
+}
+
+# Vigencia máxima (segundos) de las versiones usadas para ETag
+CONDITIONAL_VERSION_TIMEOUT = config('CONDITIONAL_VERSION_TIMEOUT', default=60, cast=int)
+
+# Cache de elecciones/candidatos: LRU local por proceso + cache compartido opcional
+# (alias de CACHES, vacío = solo LRU local)
+OBJECT_CACHE_MAX_ENTRIES = config('OBJECT_CACHE_MAX_ENTRIES', default=1024, cast=int)
+OBJECT_CACHE_LOCAL_TTL = config('OBJECT_CACHE_LOCAL_TTL', default=5, cast=int)
+OBJECT_CACHE_SHARED_ALIAS = config('OBJECT_CACHE_SHARED_ALIAS', default='')
+OBJECT_CACHE_SHARED_TTL = config('OBJECT_CACHE_SHARED_TTL', default=300, cast=int)
+
+# Cache por usuario de /api/has-voted/ (elecciones en que votó), 0 = desactivado
+HAS_VOTED_CACHE_TTL = config('HAS_VOTED_CACHE_TTL', default=30, cast=int)
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/4.2/topics/auth/passwords/
+# El primero se usa para hashes nuevos; los demás solo verifican hashes
+# existentes, que se recalculan con el primero al hacer login.
+
+PASSWORD_HASHERS = [
+    config('PASSWORD_HASHER', default='voting.passwords.PBKDF2PasswordHasher'),
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# Iteraciones de voting.passwords.PBKDF2PasswordHasher (vacío = default de Django)
+PASSWORD_HASH_ITERATIONS = config('PASSWORD_HASH_ITERATIONS', default=0, cast=int)
+
+# Pool de procesos para hashing (0 = en el thread de la petición)
+PASSWORD_HASH_WORKERS = config('PASSWORD_HASH_WORKERS', default=2, cast=int)
+# Hashes en curso + en cola antes de responder 429 (0 = sin límite)
+PASSWORD_HASH_MAX_PENDING = config('PASSWORD_HASH_MAX_PENDING', default=32, cast=int)
+PASSWORD_HASH_TIMEOUT = config('PASSWORD_HASH_TIMEOUT', default=10, cast=float)
+PASSWORD_HASH_RETRY_AFTER = config('PASSWORD_HASH_RETRY_AFTER', default=2, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -144,7 +292,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'voting.authentication.VotingJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
@@ -167,8 +315,70 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Segundos que cada proceso cachea la versión de tokens de un usuario
+# (ver voting/authentication.py): con un cache local por proceso es el
+# máximo que un token revocado sigue aceptándose en otros workers.
+TOKEN_VERSION_CACHE_TTL = config('TOKEN_VERSION_CACHE_TTL', default=30, cast=int)
+
 # ============================================
 # CONFIGURACIÓN DE CORS
 # ============================================
 
 CORS_ALLOW_ALL_ORIGINS = config('CORS_ALLOW_ALL_ORIGINS', default=True, cast=bool)
+
+# ============================================
+# CONFIGURACIÓN DE RESULTADOS EN VIVO (SSE)
+# ============================================
+
+# Máximo de actualizaciones por segundo enviadas por elección
+LIVE_RESULTS_MAX_UPDATES_PER_SECOND = config('LIVE_RESULTS_MAX_UPDATES_PER_SECOND', default=2, cast=float)
+
+# Duración máxima de cada conexión SSE (EventSource reconecta solo)
+LIVE_RESULTS_MAX_STREAM_SECONDS = config('LIVE_RESULTS_MAX_STREAM_SECONDS', default=300, cast=int)
+
+# Streams abiertos por proceso antes de responder 503 (0 = sin límite).
+# No ocupan conexiones del pool, pero cada uno es una conexión HTTP viva.
+LIVE_RESULTS_MAX_SUBSCRIBERS = config('LIVE_RESULTS_MAX_SUBSCRIBERS', default=500, cast=int)
+
+# ============================================
+# CONFIGURACIÓN DE EXPORTACIÓN
+# ============================================
+
+# Filas leídas por viaje al cursor del servidor en /api/export/
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# ============================================
+# CONFIGURACIÓN DE INGESTA DE VOTOS
+# ============================================
+
+# 'sync': cada voto se inserta en la petición
+# 'queued': se reclama vote_registry y el voto se encola en un journal local
+#           que un thread inserta por lotes (picos de apertura)
+VOTE_INGESTION_MODE = config('VOTE_INGESTION_MODE', default='sync')
+VOTE_JOURNAL_PATH = config('VOTE_JOURNAL_PATH', default=str(BASE_DIR / 'vote_journal.sqlite3'))
+VOTE_FLUSH_BATCH_SIZE = config('VOTE_FLUSH_BATCH_SIZE', default=500, cast=int)
+VOTE_FLUSH_INTERVAL = config('VOTE_FLUSH_INTERVAL', default=1.0, cast=float)
+
+# Filas reclamadas por un proceso que murió se reintentan tras este tiempo
+VOTE_FLUSH_STALE_SECONDS = config('VOTE_FLUSH_STALE_SECONDS', default=60, cast=int)
+
+# Intentos fallidos antes de mover una fila del journal a dead_letter
+VOTE_FLUSH_MAX_ATTEMPTS = config('VOTE_FLUSH_MAX_ATTEMPTS', default=5, cast=int)
+
+# ============================================
+# CONFIGURACIÓN DE PARTICIONES DE VOTOS
+# ============================================
+
+# Con votes/vote_registry particionadas por elección (`partition_votes`)
+# la partición de una elección se crea al activarla. Con True se separa
+# de la tabla al cerrarla: sus votos dejan de verse en exportaciones,
+# analíticas y rebuild_tallies (los resultados congelados se conservan).
+VOTES_DETACH_ON_CLOSE = config('VOTES_DETACH_ON_CLOSE', default=False, cast=bool)
+
+# ============================================
+# CONFIGURACIÓN DE ARCHIVO DE ELECCIONES
+# ============================================
+
+# Directorio de los archivos de elecciones archivadas (`archive_elections`).
+# Debe estar en disco persistente: es la única copia de sus votos.
+ARCHIVE_DIR = config('ARCHIVE_DIR', default=str(BASE_DIR / 'archive'))
@@ -5,7 +5,7 @@ import { Container, Typography, Box, Paper, Table, TableBody, TableCell, TableCo
 import Link from 'next/link';
 import ProtectedRoute from '@/components/ProtectedRoute';
 import LoadingSpinner from '@/components/LoadingSpinner';
-import { getResults } from '@/services/resultService';
+import { getResults, subscribeResults } from '@/services/resultService';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, PieChart, Pie, Cell } from 'recharts';
 import { EmojiEventsOutlined, RefreshOutlined } from '@mui/icons-material';
 
@@ -31,13 +31,42 @@ export default function ResultsPage() {
         }
     };
 
+    // Aplicar contadores recibidos por SSE sobre los resultados cargados
+    const applyTally = ({ total_votes, votes }: { total_votes: number; votes: Record<string, number> }) => {
+        setResults((prev: any) => {
+            if (!prev) return prev;
+            const updated = prev.results.map((r: any) => {
+                const count = votes[r.candidate_id] ?? r.votes;
+                return {
+                    ...r,
+                    votes: count,
+                    percentage: total_votes > 0 ? Math.round((count / total_votes) * 10000) / 100 : 0
+                };
+            });
+            updated.sort((a: any, b: any) => b.votes - a.votes);
+            return { ...prev, total_votes, results: updated };
+        });
+        setLastUpdate(new Date());
+    };
+
     useEffect(() => {
+        let interval: ReturnType<typeof setInterval> | undefined;
+
         fetchResults();
 
-        // Polling cada 10 segundos
-        const interval = setInterval(fetchResults, 10000);
+        // Resultados en vivo; si el stream no está disponible, polling cada 10 segundos
+        const unsubscribe = subscribeResults(electionId, {
+            onSnapshot: applyTally,
+            onTally: applyTally,
+            onError: () => {
+                interval = setInterval(fetchResults, 10000);
+            }
+        });
 
-        return () => clearInterval(interval);
+        return () => {
+            unsubscribe();
+            if (interval) clearInterval(interval);
+        };
     }, [electionId]);
 
     if (loading) return <LoadingSpinner />;
@@ -1,6 +1,6 @@
 'use client';
 import { useState, useEffect } from 'react';
-import { Container, Typography, Box, Paper, Accordion, AccordionSummary, AccordionDetails, Chip } from '@mui/material';
+import { Container, Typography, Box, Paper, Accordion, AccordionSummary, AccordionDetails, Chip, Button } from '@mui/material';
 import ProtectedRoute from '@/components/ProtectedRoute';
 import LoadingSpinner from '@/components/LoadingSpinner';
 import { getHistory } from '@/services/resultService';
@@ -8,13 +8,16 @@ import { ExpandMoreOutlined, EmojiEventsOutlined } from '@mui/icons-material';
 
 export default function HistoryPage() {
     const [history, setHistory] = useState<any[]>([]);
+    const [nextPage, setNextPage] = useState<string | null>(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     useEffect(() => {
         const fetchHistory = async () => {
             try {
                 const data = await getHistory();
-                setHistory(data);
+                setHistory(data.results);
+                setNextPage(data.next);
             } catch (error) {
                 console.error('Error fetching history:', error);
             } finally {
@@ -25,6 +28,20 @@ export default function HistoryPage() {
         fetchHistory();
     }, []);
 
+    const loadMore = async () => {
+        if (!nextPage) return;
+        setLoadingMore(true);
+        try {
+            const data = await getHistory(nextPage);
+            setHistory((prev) => [...prev, ...data.results]);
+            setNextPage(data.next);
+        } catch (error) {
+            console.error('Error fetching history:', error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     if (loading) return <LoadingSpinner />;
 
     return (
@@ -81,6 +98,19 @@ export default function HistoryPage() {
                             </Accordion>
                         ))
                     )}
+
+                    {nextPage && (
+                        <Box sx={{ mt: 4, textAlign: 'center' }}>
+                            <Button
+                                variant="outlined"
+                                onClick={loadMore}
+                                disabled={loadingMore}
+                                sx={{ borderColor: '#1e3c72', color: '#1e3c72' }}
+                            >
+                                {loadingMore ? 'Cargando...' : 'Cargar más'}
+                            </Button>
+                        </Box>
+                    )}
                 </Container>
             </Box>
         </ProtectedRoute>
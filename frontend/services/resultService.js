@@ -5,7 +5,30 @@ export const getResults = async (electionId) => {
     return response.data;
 };
 
-export const getHistory = async () => {
-    const response = await api.get('/api/history/');
+// Historial paginado por cursor: pasar `next` de la respuesta anterior
+export const getHistory = async (cursorUrl) => {
+    const response = await api.get(cursorUrl || '/api/history/');
     return response.data;
 };
+
+// Resultados en vivo (SSE): retorna función para cerrar la conexión
+export const subscribeResults = (electionId, { onSnapshot, onTally, onError }) => {
+    const source = new EventSource(`${process.env.NEXT_PUBLIC_API_URL}/api/results/${electionId}/stream/`);
+    let received = false;
+
+    source.addEventListener('snapshot', (event) => {
+        received = true;
+        onSnapshot(JSON.parse(event.data));
+    });
+    source.addEventListener('tally', (event) => onTally(JSON.parse(event.data)));
+
+    // EventSource reconecta solo; si nunca recibió datos el stream no está disponible
+    source.onerror = () => {
+        if (!received) {
+            source.close();
+            onError();
+        }
+    };
+
+    return () => source.close();
+};
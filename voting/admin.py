@@ -1,12 +1,31 @@
-from django.contrib import admin
-from .models import User, Election, Candidate, VoteRegistry, Vote
+import io
+
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.db import transaction
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
+from .models import User, Election, Candidate, VoteRegistry, Vote, ResultSnapshot, ElectionArchive
+from .imports import import_voters
+from .snapshots import close_election, discard_snapshot
 
 # ============================================
 # ADMIN: USER
 # ============================================
 
+class VoterImportForm(forms.Form):
+    file = forms.FileField(label='Archivo CSV', help_text='Columnas: email, full_name, password (opcional), role (opcional)')
+    dry_run = forms.BooleanField(label='Solo validar', required=False)
+
+
+MAX_REPORTED_ERRORS = 20
+
+
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
+    change_list_template = 'admin/voting/user/change_list.html'
     list_display = ['email', 'full_name', 'role', 'is_active', 'created_at']
     list_filter = ['role', 'is_active', 'created_at']
     search_fields = ['email', 'full_name']
@@ -25,6 +44,61 @@ class UserAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_urls(self):
+        return [
+            path(
+                'import-csv/',
+                self.admin_site.admin_view(self.import_csv_view),
+                name='voting_user_import_csv'
+            ),
+        ] + super().get_urls()
+
+    def import_csv_view(self, request):
+        """Importación de votantes desde CSV (archivos grandes: usar import_voters)"""
+        if not self.has_add_permission(request):
+            return redirect('admin:voting_user_changelist')
+
+        form = VoterImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            errors = []
+
+            def on_error(line, email, message):
+                errors.append(f'Línea {line} ({email}): {message}')
+
+            lines = io.TextIOWrapper(form.cleaned_data['file'].file, encoding='utf-8-sig', newline='')
+            try:
+                result = import_voters(
+                    lines,
+                    workers=settings.PASSWORD_HASH_WORKERS,
+                    dry_run=form.cleaned_data['dry_run'],
+                    on_error=on_error
+                )
+            except (ValueError, UnicodeDecodeError) as error:
+                self.message_user(request, f'❌ {error}', level=messages.ERROR)
+            else:
+                verb = 'se crearían' if form.cleaned_data['dry_run'] else 'creados'
+                self.message_user(
+                    request,
+                    f'✅ {result.created} usuario(s) {verb} · {result.existing} existentes · '
+                    f'{result.duplicates} duplicados en el archivo · {result.errors} con error'
+                )
+                for error in errors[:MAX_REPORTED_ERRORS]:
+                    self.message_user(request, error, level=messages.WARNING)
+                if len(errors) > MAX_REPORTED_ERRORS:
+                    self.message_user(
+                        request,
+                        f'… y {len(errors) - MAX_REPORTED_ERRORS} error(es) más',
+                        level=messages.WARNING
+                    )
+                return redirect('admin:voting_user_changelist')
+
+        return TemplateResponse(request, 'admin/voting/user/import_csv.html', {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'form': form,
+            'title': 'Importar votantes',
+        })
+
 
 # ============================================
 # ADMIN: ELECTION
@@ -42,8 +116,20 @@ def activate_elections(modeladmin, request, queryset):
             )
             continue
 
+        # Sus votos están en el archivo: reabrirla la dejaría en cero
+        if ElectionArchive.objects.filter(election=election).exists():
+            modeladmin.message_user(
+                request,
+                f'❌ No se puede activar "{election.title}" porque está archivada.',
+                level='ERROR'
+            )
+            continue
+
         election.status = 'active'
         election.save()
+
+        # Reabrir invalida los resultados finales congelados
+        discard_snapshot(election)
         modeladmin.message_user(
             request,
             f'✅ Elección "{election.title}" activada exitosamente.'
@@ -52,8 +138,12 @@ def activate_elections(modeladmin, request, queryset):
 activate_elections.short_description = "✅ Activar elecciones seleccionadas"
 
 def close_elections(modeladmin, request, queryset):
-    """Acción: Cerrar elecciones seleccionadas"""
-    updated = queryset.update(status='closed')
+    """Acción: Cerrar elecciones seleccionadas y congelar sus resultados"""
+    updated = 0
+    for election in queryset:
+        close_election(election)
+        updated += 1
+
     modeladmin.message_user(
         request,
         f'✅ {updated} elección(es) cerrada(s) exitosamente.'
@@ -85,6 +175,16 @@ class ElectionAdmin(admin.ModelAdmin):
         }),
     )
 
+    def save_model(self, request, obj, form, change):
+        """Congelar resultados al cerrar desde el formulario"""
+        super().save_model(request, obj, form, change)
+        if obj.status == 'closed':
+            # Igual que la acción y close_expired_elections: con el cierre
+            # ya confirmado, bloquear la elección y vaciar los votos en cola
+            transaction.on_commit(lambda: close_election(obj))
+        elif 'status' in form.changed_data:
+            discard_snapshot(obj)
+
 
 # ============================================
 # ADMIN: CANDIDATE
@@ -141,3 +241,46 @@ class VoteAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         return False
+
+
+# ============================================
+# ADMIN: RESULT SNAPSHOT
+# ============================================
+
+@admin.register(ResultSnapshot)
+class ResultSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['election', 'total_votes', 'winner', 'created_at']
+    search_fields = ['election__title', 'winner']
+    ordering = ['-created_at']
+    readonly_fields = ['election', 'total_votes', 'winner', 'payload', 'etag', 'created_at']
+
+    # IMPORTANTE: Resultados finales inmutables
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+# ============================================
+# ADMIN: ELECTION ARCHIVE
+# ============================================
+
+@admin.register(ElectionArchive)
+class ElectionArchiveAdmin(admin.ModelAdmin):
+    list_display = ['election', 'votes_count', 'registry_count', 'size_bytes', 'created_at']
+    search_fields = ['election__title']
+    ordering = ['-created_at']
+    readonly_fields = [
+        'election', 'file_name', 'sha256', 'size_bytes', 'votes_count', 'registry_count', 'created_at'
+    ]
+
+    # Se crean y borran con `archive_elections` (archivo y base juntos)
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,66 @@
+from django.db.models import Count
+from django.db.models.functions import TruncHour, TruncMinute
+from django.utils import timezone
+
+from .models import User, Vote, VoteRegistry
+
+# ============================================
+# VELOCIDAD DE VOTACIÓN Y PARTICIPACIÓN
+#
+# Los votos se agrupan por minuto u hora en la base de datos
+# (date_trunc en PostgreSQL) en una sola consulta.
+#
+# Cursor `since`: se retornan los intervalos que inician en `since` o
+# después, y `next_since` es el inicio del último intervalo. Ese último
+# puede estar incompleto, por eso el siguiente pedido lo vuelve a traer
+# y el cliente lo reemplaza.
+# ============================================
+
+BUCKETS = {
+    'minute': TruncMinute,
+    'hour': TruncHour,
+}
+
+
+def vote_rate(election, bucket='minute', since=None, by_candidate=False):
+    """
+    [{'start': datetime, 'votes': n}] (con candidate_id si by_candidate)
+    ordenados por inicio del intervalo.
+    """
+    trunc = BUCKETS[bucket]
+    votes = Vote.objects.filter(election=election)
+    if since is not None:
+        # El intervalo que contiene `since` también se incluye
+        votes = votes.filter(cast_at__gte=trunc_datetime(since, bucket))
+
+    fields = ['start', 'candidate_id'] if by_candidate else ['start']
+    rows = (
+        votes.annotate(start=trunc('cast_at'))
+        .values(*fields)
+        .annotate(votes=Count('id'))
+        .order_by(*fields)
+    )
+    return list(rows)
+
+
+def trunc_datetime(value, bucket):
+    """Inicio del intervalo que contiene `value` (en TIME_ZONE, como Trunc)"""
+    value = timezone.localtime(value).replace(second=0, microsecond=0)
+    if bucket == 'hour':
+        value = value.replace(minute=0)
+    return value
+
+
+def turnout(election):
+    """
+    Participación sobre los votantes habilitados (usuarios activos con
+    role 'voter'). Retorna {'voted', 'eligible', 'percentage'}.
+    """
+    voted = VoteRegistry.objects.filter(election=election, has_voted=True).count()
+    eligible = User.objects.filter(role='voter', is_active=True).count()
+
+    return {
+        'voted': voted,
+        'eligible': eligible,
+        'percentage': round(voted / eligible * 100, 2) if eligible else 0,
+    }
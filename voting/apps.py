@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class VotingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'voting'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .ingest import resume_journal
+        from .versions import check_shared_cache
+
+        check_shared_cache()
+        resume_journal()
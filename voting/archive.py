@@ -0,0 +1,274 @@
+import csv
+import hashlib
+import io
+import os
+import zipfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .ingest import flush_election, get_journal
+from .models import Election, ElectionArchive, ResultSnapshot, Vote, VoteRegistry
+from .partitions import detached_partition, drop_partitions
+
+# ============================================
+# ARCHIVO FRÍO DE ELECCIONES CERRADAS
+#
+# Cerrada una elección y congelados sus resultados, sus filas de votes y
+# vote_registry solo sirven para auditoría. archive_election() las
+# escribe en ARCHIVE_DIR/{election_id}.zip (un CSV comprimido por tabla,
+# columnas tal cual en la base), guarda su SHA-256 en election_archives
+# y las borra de las tablas vivas, todo en una transacción.
+#
+# restore_election() verifica el checksum y las vuelve a insertar.
+# /api/archive/ lee el archivo en streaming sin restaurarlo.
+#
+# Con las tablas particionadas (ver partitions.py) borrar es un DROP de
+# la partición de la elección, y también se archivan las separadas.
+# ============================================
+
+ARCHIVED_MODELS = [Vote, VoteRegistry]
+CHECKSUM_CHUNK_BYTES = 1024 * 1024
+RESTORE_BATCH_SIZE = 2000
+
+# Dataset de /api/archive/: (columnas, modelo). Igual que en exports.py,
+# turnout va sin voted_at para no poder cruzarlo con votes.cast_at.
+ARCHIVE_DATASETS = {
+    'votes': (['id', 'candidate_id', 'cast_at'], Vote),
+    'turnout': (['user_id', 'has_voted'], VoteRegistry),
+}
+
+
+class ArchiveError(Exception):
+    """La elección no se puede archivar/restaurar o el archivo no es válido."""
+
+
+def archive_dir():
+    return Path(settings.ARCHIVE_DIR)
+
+
+def archive_path(archive):
+    return archive_dir() / archive.file_name
+
+
+def member_name(model):
+    return f'{model._meta.db_table}.csv'
+
+
+def file_checksum(path):
+    """(sha256 hex, tamaño en bytes)"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHECKSUM_CHUNK_BYTES), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+# ============================================
+# ESCRITURA
+# ============================================
+
+def _source_rows(model, election_id, using):
+    """Filas de la elección en la tabla viva o en su partición separada"""
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    table = detached_partition(model._meta.db_table, election_id, using) or model._meta.db_table
+    fields = model._meta.concrete_fields
+    election_field = model._meta.get_field('election')
+
+    # Mismas conversiones que aplica el ORM (ej. fechas con zona en SQLite)
+    converters = []
+    for field in fields:
+        column = field.get_col(table)
+        converters.append((
+            column,
+            connection.ops.get_db_converters(column) + column.get_db_converters(connection)
+        ))
+
+    # Cursor del servidor en PostgreSQL (ver exports.py)
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(
+            f'SELECT {", ".join(quote(field.column) for field in fields)} FROM {quote(table)} '
+            f'WHERE {quote(election_field.column)} = %s ORDER BY {quote("id")}',
+            [election_field.get_db_prep_value(election_id, connection)]
+        )
+        while True:
+            rows = cursor.fetchmany(settings.EXPORT_CHUNK_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                values = []
+                for value, (column, column_converters) in zip(row, converters):
+                    for converter in column_converters:
+                        value = converter(value, column, connection)
+                    values.append(value)
+                yield values
+
+
+def _write_archive(path, election_id, using):
+    """Escribe el .zip y retorna {modelo: filas escritas}"""
+    counts = {}
+    with open(path, 'wb') as file:
+        with zipfile.ZipFile(file, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for model in ARCHIVED_MODELS:
+                columns = [field.column for field in model._meta.concrete_fields]
+                member = archive.open(member_name(model), 'w', force_zip64=True)
+                with io.TextIOWrapper(member, encoding='utf-8', newline='') as text:
+                    writer = csv.writer(text)
+                    writer.writerow(columns)
+                    counts[model] = 0
+                    for row in _source_rows(model, election_id, using):
+                        # NULL y '' no se distinguen en CSV: estas tablas no tienen texto
+                        writer.writerow(['' if value is None else value for value in row])
+                        counts[model] += 1
+        file.flush()
+        os.fsync(file.fileno())
+    return counts
+
+
+def _delete_rows(model, election_id, dropped, using):
+    table = model._meta.db_table
+    if table in dropped:
+        return dropped[table]
+    # Nada referencia a estas tablas: un solo DELETE
+    return model.objects.using(using).filter(election_id=election_id).delete()[0]
+
+
+def archive_election(election, using=DEFAULT_DB_ALIAS):
+    """
+    Mueve votos y registro de una elección cerrada a un archivo en
+    ARCHIVE_DIR y los borra de la base. Retorna el ElectionArchive.
+
+    Lanza ArchiveError si la elección no está cerrada con resultados
+    congelados o ya estaba archivada.
+    """
+    directory = archive_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    file_name = f'{election.pk}.zip'
+    path = directory / file_name
+    partial = directory / f'{file_name}.partial'
+
+    # Votos aceptados que sigan en el journal van a la base antes de archivar
+    flush_election(election.pk)
+
+    try:
+        with transaction.atomic(using=using):
+            # Bloquea la elección: nadie la reabre mientras se archiva
+            election = Election.objects.using(using).select_for_update().get(pk=election.pk)
+            if election.status != 'closed':
+                raise ArchiveError(f'"{election.title}" no está cerrada')
+            if not ResultSnapshot.objects.using(using).filter(election_id=election.pk).exists():
+                raise ArchiveError(f'"{election.title}" no tiene resultados congelados')
+            if ElectionArchive.objects.using(using).filter(election_id=election.pk).exists():
+                raise ArchiveError(f'"{election.title}" ya está archivada')
+            if os.path.exists(settings.VOTE_JOURNAL_PATH) and get_journal().pending_count(election.pk):
+                raise ArchiveError(f'"{election.title}" tiene votos en cola sin insertar')
+
+            counts = _write_archive(partial, election.pk, using)
+            sha256, size = file_checksum(partial)
+
+            dropped = drop_partitions(election.pk, using)
+            for model, written in counts.items():
+                deleted = _delete_rows(model, election.pk, dropped, using)
+                if deleted != written:
+                    raise ArchiveError(
+                        f'{model._meta.db_table}: {written} fila(s) archivada(s), {deleted} borrada(s)'
+                    )
+
+            record = ElectionArchive.objects.using(using).create(
+                election=election,
+                file_name=file_name,
+                sha256=sha256,
+                size_bytes=size,
+                votes_count=counts[Vote],
+                registry_count=counts[VoteRegistry]
+            )
+            os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+
+    return record
+
+
+# ============================================
+# LECTURA Y RESTAURACIÓN
+# ============================================
+
+def verify_archive(archive):
+    """Lanza ArchiveError si el archivo falta o su checksum no coincide"""
+    path = archive_path(archive)
+    if not path.exists():
+        raise ArchiveError(f'No existe {path}')
+    sha256, size = file_checksum(path)
+    if sha256 != archive.sha256 or size != archive.size_bytes:
+        raise ArchiveError(f'{path}: el checksum no coincide')
+
+
+def archived_rows(path, model):
+    """Filas archivadas del modelo: dicts por attname con valores Python"""
+    fields = {field.column: field for field in model._meta.concrete_fields}
+
+    with zipfile.ZipFile(path) as zip_file:
+        with zip_file.open(member_name(model)) as member:
+            reader = csv.reader(io.TextIOWrapper(member, encoding='utf-8', newline=''))
+            columns = [fields[column] for column in next(reader)]
+            for row in reader:
+                yield {
+                    field.attname: None if value == '' else field.to_python(value)
+                    for field, value in zip(columns, row)
+                }
+
+
+def dataset_rows(archive, dataset):
+    columns, model = ARCHIVE_DATASETS[dataset]
+    return columns, archived_rows(archive_path(archive), model)
+
+
+def restore_election(election, using=DEFAULT_DB_ALIAS):
+    """
+    Vuelve a insertar votos y registro archivados y borra el archivo.
+    Retorna {tabla: filas restauradas}.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+
+    with transaction.atomic(using=using):
+        archive = ElectionArchive.objects.using(using).select_for_update().filter(
+            election_id=election.pk
+        ).first()
+        if archive is None:
+            raise ArchiveError(f'"{election.title}" no está archivada')
+        verify_archive(archive)
+        path = archive_path(archive)
+
+        restored = {}
+        for model in ARCHIVED_MODELS:
+            # INSERT directo: bulk_create pisaría cast_at (auto_now_add)
+            fields = list(model._meta.concrete_fields)
+            sql = (
+                f'INSERT INTO {quote(model._meta.db_table)} '
+                f'({", ".join(quote(field.column) for field in fields)}) '
+                f'VALUES ({", ".join(["%s"] * len(fields))})'
+            )
+            restored[model._meta.db_table] = 0
+            batch = []
+            with connection.cursor() as cursor:
+                for row in archived_rows(path, model):
+                    batch.append([
+                        field.get_db_prep_save(row[field.attname], connection) for field in fields
+                    ])
+                    if len(batch) >= RESTORE_BATCH_SIZE:
+                        cursor.executemany(sql, batch)
+                        restored[model._meta.db_table] += len(batch)
+                        batch = []
+                if batch:
+                    cursor.executemany(sql, batch)
+                    restored[model._meta.db_table] += len(batch)
+
+        archive.delete()
+        transaction.on_commit(lambda: path.unlink(missing_ok=True), using=using)
+
+    return restored
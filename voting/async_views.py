@@ -0,0 +1,94 @@
+from functools import wraps
+from inspect import isawaitable
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from rest_framework.views import APIView
+
+# ============================================
+# VISTAS ASYNC SOBRE DRF
+#
+# Con el worker ASGI (uvicorn, ver Procfile) una vista async libera el
+# event loop mientras espera a la base de datos; una vista síncrona
+# ocupa un thread durante toda la petición. DRF 3.14 no soporta
+# handlers async, así que AsyncAPIView reimplementa dispatch():
+# autenticación/permisos y las consultas del ORM async corren en el
+# thread de la petición (sync_to_async), el resto en el event loop.
+# ============================================
+
+
+class AsyncAPIView(APIView):
+    """APIView cuyos handlers (get, post, ...) son `async def`."""
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        if cls.view_is_async:
+            # csrf_exempt (DRF) envuelve la vista en una función síncrona
+            markcoroutinefunction(view)
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            # Un token sin claims se resuelve consultando 'users'
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if isawaitable(response):  # options() y errores son síncronos
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+def async_conditional(etag_func):
+    """
+    conditional() (ver views.py) para handlers async:
+    304 Not Modified si If-None-Match coincide con `etag_func`.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        async def wrapper(view, request, *args, **kwargs):
+            etag = quote_etag(etag_func(request, *args, **kwargs))
+
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = await handler(view, request, *args, **kwargs)
+                if not response.has_header('Cache-Control'):
+                    patch_cache_control(response, no_cache=True)
+
+            if request.method in ('GET', 'HEAD'):
+                response.headers.setdefault('ETag', etag)
+            return response
+        return wrapper
+    return decorator
+
+
+async def iterate_in_thread(iterator):
+    """
+    Recorre un iterador síncrono (ej. cursor del ORM) desde ASGI sin
+    cargarlo completo: Django 4.2 consume en memoria los iteradores
+    síncronos de StreamingHttpResponse bajo ASGI.
+    """
+    iterator = iter(iterator)
+    next_chunk = sync_to_async(next)
+    done = object()
+
+    while True:
+        chunk = await next_chunk(iterator, done)
+        if chunk is done:
+            break
+        yield chunk
@@ -0,0 +1,101 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import TokenVersion, User
+
+# ============================================
+# AUTENTICACIÓN JWT SIN CONSULTA A 'users'
+#
+# Al hacer login/registro el token incluye los claims que las vistas
+# necesitan (role, is_active) y una versión de token 'tv'. Cada petición
+# reconstruye el User desde esos claims sin ir a la base de datos.
+#
+# Revocación: al desactivar un usuario, cambiar su rol o su password se
+# guarda una nueva versión (reloj en ns) en token_versions; los tokens
+# con 'tv' menor se rechazan, incluso los access tokens obtenidos con un
+# refresh anterior. Cada proceso cachea la versión TOKEN_VERSION_CACHE_TTL
+# segundos: con un cache compartido la revocación rige de inmediato, con
+# el cache local de cada proceso, a lo sumo tras ese plazo.
+# ============================================
+
+TOKEN_CLAIMS = ('role', 'is_active', 'tv')
+
+
+def token_version_key(user_id):
+    return f'voting:token-version:{user_id}'
+
+
+def get_token_version(user_id):
+    """Versión vigente (0 si nunca se revocaron tokens)"""
+    key = token_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = TokenVersion.objects.filter(user_id=user_id).values_list('version', flat=True).first() or 0
+        cache.set(key, version, settings.TOKEN_VERSION_CACHE_TTL)
+    return version
+
+
+def revoke_tokens(user_id):
+    """Invalida todos los tokens emitidos hasta ahora para el usuario."""
+    version = time.time_ns()
+    TokenVersion.objects.update_or_create(user_id=user_id, defaults={'version': version})
+    cache.set(token_version_key(user_id), version, settings.TOKEN_VERSION_CACHE_TTL)
+    return version
+
+
+def tokens_for_user(user, version=None):
+    """
+    RefreshToken con los claims de autorización (el access los copia).
+    `version`: ya conocida, ej. 0 para un usuario recién creado.
+    """
+    refresh = RefreshToken.for_user(user)
+    refresh['role'] = user.role
+    refresh['is_active'] = user.is_active
+    refresh['tv'] = get_token_version(user.id) if version is None else version
+    return refresh
+
+
+class VotingJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication para voting.User: el usuario sale de los claims.
+    Tokens emitidos antes de incluir los claims se resuelven con la BD.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token['user_id']
+        except KeyError:
+            raise InvalidToken('Token sin identificación de usuario')
+
+        if not all(claim in validated_token for claim in TOKEN_CLAIMS):
+            return self.get_user_from_db(user_id)
+
+        if validated_token['tv'] < get_token_version(user_id):
+            raise AuthenticationFailed('Token revocado', code='token_revoked')
+
+        if not validated_token['is_active']:
+            raise AuthenticationFailed('Usuario inactivo', code='user_inactive')
+
+        user = User(id=user_id, role=validated_token['role'], is_active=True)
+        # Instancia equivalente a una cargada de la BD (filtros por relación)
+        user._state.adding = False
+        user._state.db = 'default'
+        return user
+
+    def get_user_from_db(self, user_id):
+        try:
+            user = User.objects.get(id=user_id)
+        except (User.DoesNotExist, ValidationError):
+            raise AuthenticationFailed('Usuario no encontrado', code='user_not_found')
+
+        if not user.is_active:
+            raise AuthenticationFailed('Usuario inactivo', code='user_inactive')
+
+        return user
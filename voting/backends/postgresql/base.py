@@ -0,0 +1,148 @@
+import threading
+import weakref
+
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.creation import DatabaseCreation as PostgresDatabaseCreation
+from django.utils.asyncio import async_unsafe
+from psycopg import IsolationLevel
+from psycopg_pool import ConnectionPool
+
+# ============================================
+# POSTGRESQL CON POOL DE CONEXIONES (psycopg_pool)
+#
+# Django 4.2 abre una conexión por thread y, con CONN_MAX_AGE = 0, la
+# cierra al terminar cada petición. Bajo ASGI el código síncrono de
+# cada petición corre en un thread propio, así que cada petición pagaría
+# una conexión nueva (TCP + TLS + auth) contra el pooler remoto.
+#
+# Este backend toma la conexión de un ConnectionPool acotado por proceso
+# y la devuelve al cerrarla. Se configura igual que el pool nativo de
+# Django 5.1, de modo que al actualizar basta con volver al ENGINE
+# estándar:
+#
+#     'OPTIONS': {'pool': {'min_size': 1, 'max_size': 10, 'timeout': 10}}
+#
+# Sin OPTIONS['pool'] se comporta como django.db.backends.postgresql.
+#
+# STATEMENT TIMEOUT
+#
+# Con OPTIONS['statement_timeout'] (ms) cada conexión física aplica ese
+# límite, o el que fije la vista en curso con use_statement_timeout()
+# (ver voting/db.py). El SET se envía antes de la primera consulta y solo
+# si la conexión tiene otro valor: en régimen no agrega viajes. Dentro de
+# una transacción no se cambia (un rollback desharía el SET), y al
+# terminar la petición vuelve el default.
+# ============================================
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+# statement_timeout vigente en cada conexión física (sobrevive al pool)
+_statement_timeouts = weakref.WeakKeyDictionary()
+
+
+def close_pools():
+    """Cierra todos los pools del proceso (y sus conexiones)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+class DatabaseCreation(PostgresDatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Las conexiones ociosas del pool impedirían el DROP DATABASE
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    pool = None  # Pool del que salió la conexión actual
+    statement_timeout = None  # ms para la petición en curso (None = default)
+
+    @property
+    def pool_options(self):
+        # La conexión sin base (CREATE/DROP DATABASE de los tests) no se reutiliza
+        if self.alias == NO_DB_ALIAS:
+            return None
+        return self.settings_dict['OPTIONS'].get('pool')
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop('pool', None)
+        conn_params.pop('statement_timeout', None)
+        return conn_params
+
+    def get_pool(self, conn_params):
+        key = (
+            self.alias,
+            conn_params.get('dbname'),
+            conn_params.get('host'),
+            conn_params.get('port'),
+            conn_params.get('user'),
+        )
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(
+                    kwargs=conn_params,
+                    connection_class=self.Database.Connection,
+                    check=ConnectionPool.check_connection if self.settings_dict['CONN_HEALTH_CHECKS'] else None,
+                    name=self.alias,
+                    open=True,
+                    **self.pool_options
+                )
+            return pool
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        if not self.pool_options:
+            return super().get_new_connection(conn_params)
+
+        pool = self.get_pool(conn_params)
+        connection = pool.getconn()
+        self.pool = pool
+
+        # Igual que el backend estándar: nivel por defecto o el de OPTIONS
+        isolation_level = self.settings_dict['OPTIONS'].get('isolation_level')
+        if isolation_level is None:
+            self.isolation_level = IsolationLevel.READ_COMMITTED
+        else:
+            self.isolation_level = IsolationLevel(isolation_level)
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is None or self.pool is None:
+            return super()._close()
+
+        # putconn() hace rollback si quedó una transacción abierta y
+        # descarta la conexión si está rota
+        pool, self.pool = self.pool, None
+        with self.wrap_database_errors:
+            pool.putconn(self.connection)
+
+    def create_cursor(self, name=None):
+        self.apply_statement_timeout()
+        return super().create_cursor(name)
+
+    def apply_statement_timeout(self):
+        default = self.settings_dict['OPTIONS'].get('statement_timeout')
+        if default is None or not self.autocommit:
+            return
+
+        timeout = default if self.statement_timeout is None else self.statement_timeout
+        if _statement_timeouts.get(self.connection) == timeout:
+            return
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'SET statement_timeout = {int(timeout)}')
+        _statement_timeouts[self.connection] = timeout
+
+    def close_if_unusable_or_obsolete(self):
+        # Inicio y fin de cada petición: el timeout de la vista no se hereda
+        self.statement_timeout = None
+        super().close_if_unusable_or_obsolete()
@@ -0,0 +1,318 @@
+import json
+import math
+import queue
+import random
+import subprocess
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from .authentication import tokens_for_user
+from .models import User, Candidate
+from .provisioning import clear_provisioned, create_voters, provision_election
+
+# ============================================
+# BENCHMARK DE LA API
+#
+# Siembra un conjunto de datos parametrizable (N usuarios, M elecciones,
+# K votos) y ejecuta peticiones concurrentes contra los endpoints con el
+# cliente de pruebas de Django (pila completa de middleware y vistas, sin
+# red). Por escenario reporta latencia p50/p95/p99, throughput y queries
+# por petición; el resultado se guarda en JSON para comparar commits.
+#
+# Los datos sembrados se identifican por BENCHMARK_EMAIL_DOMAIN y
+# BENCHMARK_TITLE_PREFIX, y se borran antes de cada siembra.
+# ============================================
+
+BENCHMARK_EMAIL_DOMAIN = 'benchmark.local'
+BENCHMARK_TITLE_PREFIX = '[benchmark]'
+BENCHMARK_PASSWORD = 'benchmark-password'
+
+SCENARIOS = ['login', 'vote', 'results', 'history']
+
+
+class BenchmarkDataset:
+    """Ids sembrados que usan los escenarios."""
+
+    def __init__(self, users, active_elections, closed_elections, candidates, open_pairs):
+        self.users = users                          # [(id, email)]
+        self.active_elections = active_elections    # [election_id]
+        self.closed_elections = closed_elections    # [election_id]
+        self.candidates = candidates                # {election_id: [candidate_id]}
+        self.open_pairs = open_pairs                # [(user_id, election_id)] sin votar
+
+
+# ============================================
+# SIEMBRA DE DATOS (ver provisioning.py)
+# ============================================
+
+def clear_benchmark_data():
+    """Borra los datos de corridas anteriores."""
+    clear_provisioned(title_prefix=BENCHMARK_TITLE_PREFIX, email_domain=BENCHMARK_EMAIL_DOMAIN)
+
+
+def seed_dataset(users=100, elections=3, closed_elections=5, candidates=3, votes=200, seed=0):
+    """
+    Crea usuarios, elecciones activas/cerradas con candidatos y `votes` votos
+    repartidos entre pares (usuario, elección) distintos. Determinista por `seed`.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+
+    clear_benchmark_data()
+
+    user_ids = [user_id for user_id, _ in create_voters(
+        rng, users, BENCHMARK_EMAIL_DOMAIN, BENCHMARK_PASSWORD
+    )]
+    users_by_id = dict(zip(user_ids, (f'voter{i}@{BENCHMARK_EMAIL_DOMAIN}' for i in range(users))))
+
+    specs = [('active', i) for i in range(elections)] + [('closed', i) for i in range(closed_elections)]
+
+    # Los votos previos se asignan a pares (usuario, elección) distintos
+    pairs = [(user_id, index) for user_id in user_ids for index in range(len(specs))]
+    rng.shuffle(pairs)
+    voters_by_election = {}
+    for user_id, index in pairs[:votes]:
+        voters_by_election.setdefault(index, []).append(user_id)
+
+    election_objects = []
+    for index, (status, i) in enumerate(specs):
+        if status == 'active':
+            title, start_date, end_date = f'{BENCHMARK_TITLE_PREFIX} Activa {i}', None, None
+        else:
+            end_date = now - timedelta(days=i + 1)
+            title, start_date = f'{BENCHMARK_TITLE_PREFIX} Cerrada {i}', end_date - timedelta(days=7)
+
+        election_objects.append(provision_election(
+            rng,
+            title,
+            [{'name': f'Candidato {j}'} for j in range(1, candidates + 1)],
+            status=status,
+            voters=voters_by_election.get(index, []),
+            start_date=start_date,
+            end_date=end_date
+        ))
+
+    candidates_by_election = {}
+    for election_id, candidate_id in Candidate.objects.filter(
+        election__in=election_objects
+    ).values_list('election_id', 'id'):
+        candidates_by_election.setdefault(election_id, []).append(candidate_id)
+
+    active_ids = [election.id for election in election_objects if election.status == 'active']
+    active_indexes = {index for index, (status, _) in enumerate(specs) if status == 'active'}
+    return BenchmarkDataset(
+        users=list(users_by_id.items()),
+        active_elections=active_ids,
+        closed_elections=[election.id for election in election_objects if election.status == 'closed'],
+        candidates=candidates_by_election,
+        open_pairs=[
+            (user_id, election_objects[index].id)
+            for user_id, index in pairs[votes:]
+            if index in active_indexes
+        ]
+    )
+
+
+# ============================================
+# PETICIONES POR ESCENARIO
+# Cada escenario genera tuplas (method, path, data, user_id)
+# ============================================
+
+def build_requests(scenario, dataset, count, rng):
+    if scenario == 'login':
+        return [
+            ('post', '/api/login/', {'email': email, 'password': BENCHMARK_PASSWORD}, None)
+            for _, email in (rng.choice(dataset.users) for _ in range(count))
+        ]
+
+    if scenario == 'vote':
+        # Un voto válido por par (usuario, elección) aún sin votar
+        pairs = dataset.open_pairs[:count]
+        del dataset.open_pairs[:count]
+        return [
+            ('post', '/api/vote/', {
+                'election_id': str(election_id),
+                'candidate_id': str(rng.choice(dataset.candidates[election_id]))
+            }, user_id)
+            for user_id, election_id in pairs
+        ]
+
+    if scenario == 'results':
+        elections = dataset.active_elections + dataset.closed_elections
+        return [
+            ('get', f'/api/results/{rng.choice(elections)}/', None, None)
+            for _ in range(count)
+        ]
+
+    if scenario == 'history':
+        return [('get', '/api/history/', None, None) for _ in range(count)]
+
+    raise ValueError(f'Escenario desconocido: {scenario}')
+
+
+def percentile(values, pct):
+    """Percentil por rango más cercano (values ordenados)"""
+    if not values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+
+def summarize(samples, wall_seconds):
+    """samples: [(latency_seconds, status_code, queries)]"""
+    latencies = sorted(sample[0] * 1000 for sample in samples)
+    queries = [sample[2] for sample in samples]
+    errors = sum(1 for sample in samples if sample[1] >= 400)
+
+    def ms(value):
+        return round(value, 3) if value is not None else None
+
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'throughput_rps': round(len(samples) / wall_seconds, 2) if wall_seconds else None,
+        'latency_ms': {
+            'mean': ms(sum(latencies) / len(latencies)) if latencies else None,
+            'p50': ms(percentile(latencies, 50)),
+            'p95': ms(percentile(latencies, 95)),
+            'p99': ms(percentile(latencies, 99)),
+            'max': ms(latencies[-1]) if latencies else None,
+        },
+        'queries_per_request': {
+            'mean': round(sum(queries) / len(queries), 2) if queries else None,
+            'max': max(queries) if queries else None,
+        },
+    }
+
+
+# ============================================
+# EJECUCIÓN
+# ============================================
+
+def _tokens_for(user_ids):
+    return {
+        user_id: str(tokens_for_user(User(id=user_id, role='voter', is_active=True)).access_token)
+        for user_id in user_ids
+        if user_id is not None
+    }
+
+
+def _execute(client, request, tokens):
+    method, path, data, user_id = request
+    headers = {}
+    if user_id is not None:
+        headers['HTTP_AUTHORIZATION'] = f'Bearer {tokens[user_id]}'
+
+    with CaptureQueriesContext(connection) as captured:
+        started = time.perf_counter()
+        if method == 'post':
+            response = client.post(path, data, content_type='application/json', **headers)
+        else:
+            response = client.get(path, **headers)
+        elapsed = time.perf_counter() - started
+
+    return elapsed, response.status_code, len(captured)
+
+
+def run_scenario(requests, concurrency=1):
+    """
+    Ejecuta las peticiones con `concurrency` threads (cada uno con su
+    conexión a la BD). Con concurrency=1 corre en el thread actual.
+    Retorna (samples, wall_seconds).
+    """
+    tokens = _tokens_for({request[3] for request in requests})
+    samples = []
+    samples_lock = threading.Lock()
+
+    if concurrency <= 1:
+        client = Client(raise_request_exception=False)
+        started = time.perf_counter()
+        for request in requests:
+            samples.append(_execute(client, request, tokens))
+        return samples, time.perf_counter() - started
+
+    pending = queue.Queue()
+    for request in requests:
+        pending.put(request)
+
+    def worker():
+        client = Client(raise_request_exception=False)
+        try:
+            while True:
+                try:
+                    request = pending.get_nowait()
+                except queue.Empty:
+                    return
+                sample = _execute(client, request, tokens)
+                with samples_lock:
+                    samples.append(sample)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+def run_benchmark(dataset, scenarios=None, requests=100, concurrency=4, seed=0, warmup=5):
+    """Ejecuta los escenarios y retorna el reporte por escenario."""
+    rng = random.Random(seed)
+    report = {}
+
+    # El cliente de pruebas envía Host: testserver
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        for scenario in scenarios or SCENARIOS:
+            if warmup and scenario != 'vote':
+                run_scenario(build_requests(scenario, dataset, warmup, rng), concurrency=1)
+
+            samples, wall_seconds = run_scenario(
+                build_requests(scenario, dataset, requests, rng),
+                concurrency=concurrency
+            )
+            report[scenario] = summarize(samples, wall_seconds)
+
+    return report
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_reports(baseline, current):
+    """Diferencias de p50/p95 y queries por escenario: {scenario: {...}}"""
+    changes = {}
+    for scenario, stats in current['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(scenario)
+        if not before:
+            continue
+        changes[scenario] = {
+            metric: (before['latency_ms'][metric], stats['latency_ms'][metric])
+            for metric in ('p50', 'p95', 'p99')
+        }
+        changes[scenario]['queries'] = (
+            before['queries_per_request']['mean'],
+            stats['queries_per_request']['mean']
+        )
+    return changes
+
+
+def load_report(path):
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
@@ -0,0 +1,217 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from .models import Election, Vote, VoteRegistry, VoteTally
+from .tallies import increment_tally
+
+# ============================================
+# EMISIÓN DE VOTO
+#
+# La garantía de un solo voto por usuario la da el constraint
+# UNIQUE(user_id, election_id) de vote_registry: se reclama el
+# registro con un INSERT condicional y solo si se obtuvo se inserta
+# el voto anónimo y se incrementa el contador.
+#
+# El estado de la elección se vuelve a comprobar en la base al reclamar
+# (el de ElectionSerializer viene de object_cache y puede estar
+# atrasado). La fila de la elección se toma FOR KEY SHARE: un cierre en
+# curso (SELECT ... FOR UPDATE, ver snapshots.py) espera a los votos ya
+# reclamados y los posteriores ven la elección cerrada.
+# ============================================
+
+
+class AlreadyVoted(Exception):
+    """El usuario ya tiene registro de voto en la elección."""
+
+
+class ElectionNotOpen(Exception):
+    """La elección no está activa o está fuera de su periodo."""
+
+
+# Elección activa y dentro de su periodo (PostgreSQL, bloqueo compartido)
+OPEN_ELECTION_SQL = """
+    SELECT id FROM {elections}
+    WHERE id = %(election_id)s AND status = 'active'
+      AND start_date <= %(now)s AND end_date >= %(now)s
+    FOR KEY SHARE
+""".format(elections=Election._meta.db_table)
+
+
+# PostgreSQL: las tres escrituras en UNA sentencia (un round trip, atómica
+# por sí misma). Un registro previo con has_voted = FALSE también se reclama.
+CAST_VOTE_SQL = """
+WITH open_election AS ({open_election}), claim AS (
+    INSERT INTO {registry} (id, user_id, election_id, has_voted, voted_at)
+    SELECT %(registry_id)s, %(user_id)s, id, TRUE, %(now)s FROM open_election
+    ON CONFLICT (user_id, election_id) DO UPDATE
+        SET has_voted = TRUE, voted_at = EXCLUDED.voted_at
+        WHERE {registry}.has_voted = FALSE
+    RETURNING election_id
+), vote AS (
+    INSERT INTO {votes} (id, election_id, candidate_id, cast_at)
+    SELECT %(vote_id)s, election_id, %(candidate_id)s, %(now)s FROM claim
+    RETURNING election_id, candidate_id
+)
+INSERT INTO {tallies} (election_id, candidate_id, votes, updated_at)
+SELECT election_id, candidate_id, 1, %(now)s FROM vote
+ON CONFLICT (election_id, candidate_id) DO UPDATE
+    SET votes = {tallies}.votes + 1, updated_at = EXCLUDED.updated_at
+RETURNING votes
+""".format(
+    open_election=OPEN_ELECTION_SQL,
+    registry=VoteRegistry._meta.db_table,
+    votes=Vote._meta.db_table,
+    tallies=VoteTally._meta.db_table,
+)
+
+
+# Solo el reclamo del registro (modo de ingesta en cola, ver ingest.py)
+CLAIM_REGISTRY_SQL = """
+WITH open_election AS ({open_election})
+INSERT INTO {registry} (id, user_id, election_id, has_voted, voted_at)
+SELECT %(registry_id)s, %(user_id)s, id, TRUE, %(now)s FROM open_election
+ON CONFLICT (user_id, election_id) DO UPDATE
+    SET has_voted = TRUE, voted_at = EXCLUDED.voted_at
+    WHERE {registry}.has_voted = FALSE
+RETURNING id
+""".format(open_election=OPEN_ELECTION_SQL, registry=VoteRegistry._meta.db_table)
+
+
+def election_is_open(election_id, now):
+    """Estado leído de la base, sin cache"""
+    return Election.objects.filter(
+        id=election_id,
+        status='active',
+        start_date__lte=now,
+        end_date__gte=now
+    ).exists()
+
+
+def _claim_failed(election_id, now):
+    """Sentencia sin filas: distinguir elección cerrada de voto repetido"""
+    if not election_is_open(election_id, now):
+        raise ElectionNotOpen
+    raise AlreadyVoted
+
+
+def cast_vote(user_id, election_id, candidate_id):
+    """
+    Registra el voto anónimo y marca al usuario como votante.
+
+    Lanza AlreadyVoted si el usuario ya votó en la elección y
+    ElectionNotOpen si la elección ya no admite votos.
+    """
+    if connection.vendor == 'postgresql':
+        _cast_vote_single_statement(user_id, election_id, candidate_id)
+    else:
+        _cast_vote_atomic(user_id, election_id, candidate_id)
+
+
+def _cast_vote_single_statement(user_id, election_id, candidate_id):
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(CAST_VOTE_SQL, {
+            'registry_id': uuid.uuid4(),
+            'vote_id': uuid.uuid4(),
+            'user_id': user_id,
+            'election_id': election_id,
+            'candidate_id': candidate_id,
+            'now': now,
+        })
+        if cursor.fetchone() is None:
+            _claim_failed(election_id, now)
+
+
+def _cast_vote_atomic(user_id, election_id, candidate_id):
+    """Otros motores: mismas garantías con varias sentencias en una transacción."""
+    with transaction.atomic():
+        claim_registry(user_id, election_id)
+
+        Vote.objects.create(
+            election_id=election_id,
+            candidate_id=candidate_id
+            # NO incluir user (anonimato)
+        )
+        increment_tally(election_id, candidate_id)
+
+
+def claim_registry(user_id, election_id):
+    """
+    Marca al usuario como votante en la elección.
+    Lanza AlreadyVoted si ya lo estaba y ElectionNotOpen si la
+    elección ya no admite votos.
+    """
+    now = timezone.now()
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(CLAIM_REGISTRY_SQL, {
+                'registry_id': uuid.uuid4(),
+                'user_id': user_id,
+                'election_id': election_id,
+                'now': now,
+            })
+            if cursor.fetchone() is None:
+                _claim_failed(election_id, now)
+        return
+
+    with transaction.atomic():
+        if not election_is_open(election_id, now):
+            raise ElectionNotOpen
+        try:
+            with transaction.atomic():
+                VoteRegistry.objects.create(
+                    user_id=user_id,
+                    election_id=election_id,
+                    has_voted=True,
+                    voted_at=now
+                )
+        except IntegrityError:
+            claimed = VoteRegistry.objects.filter(
+                user_id=user_id,
+                election_id=election_id,
+                has_voted=False
+            ).update(has_voted=True, voted_at=now)
+            if not claimed:
+                raise AlreadyVoted
+
+
+# ============================================
+# ELECCIONES EN LAS QUE VOTÓ UN USUARIO
+#
+# Un usuario tiene pocas filas en vote_registry: se leen todas en una
+# consulta y se guardan en cache HAS_VOTED_CACHE_TTL segundos
+# (0 = sin cache). VoteView borra la entrada cuando el usuario vota.
+# ============================================
+
+def voted_elections_key(user_id):
+    return f'voting:voted-elections:{user_id}'
+
+
+def voted_elections(user_id):
+    """{election_id (str): voted_at} de las elecciones en que votó"""
+    key = voted_elections_key(user_id)
+    ttl = settings.HAS_VOTED_CACHE_TTL
+    if ttl:
+        voted = cache.get(key)
+        if voted is not None:
+            return voted
+
+    voted = {
+        str(election_id): voted_at
+        for election_id, voted_at in VoteRegistry.objects.filter(
+            user_id=user_id,
+            has_voted=True
+        ).values_list('election_id', 'voted_at')
+    }
+    if ttl:
+        cache.set(key, voted, ttl)
+    return voted
+
+
+def forget_voted_elections(user_id):
+    cache.delete(voted_elections_key(user_id))
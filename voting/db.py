@@ -0,0 +1,30 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# ============================================
+# STATEMENT TIMEOUT POR ENDPOINT
+#
+# Con voting.backends.postgresql cada consulta corre con un
+# statement_timeout: DB_STATEMENT_TIMEOUT por defecto, y el que fije la
+# vista para el resto de la petición (lecturas de resultados cortas,
+# exportaciones largas). Con otros backends no tiene efecto.
+# ============================================
+
+
+def use_statement_timeout(milliseconds, using=DEFAULT_DB_ALIAS):
+    """statement_timeout (ms) para las consultas que quedan de la petición"""
+    connection = connections[using]
+    if hasattr(connection, 'apply_statement_timeout'):
+        connection.statement_timeout = milliseconds
+
+
+class StatementTimeoutMixin:
+    """APIView con `statement_timeout` (ms) propio"""
+
+    statement_timeout = None
+
+    def initial(self, request, *args, **kwargs):
+        if self.statement_timeout is not None:
+            # También la réplica, si la vista lee de ella (ver routers.py)
+            for alias in connections:
+                use_statement_timeout(self.statement_timeout, using=alias)
+        super().initial(request, *args, **kwargs)
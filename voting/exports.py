@@ -0,0 +1,124 @@
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Vote, VoteRegistry
+from .snapshots import build_results_payload
+
+# ============================================
+# EXPORTACIÓN EN STREAMING (CSV / NDJSON)
+#
+# Cada dataset es un generador de filas; las tablas grandes se leen con
+# iterator(chunk_size=EXPORT_CHUNK_SIZE), que en PostgreSQL usa un cursor
+# del lado del servidor: la memoria no crece con la cantidad de filas.
+# Las filas se agrupan en bloques de ~EXPORT_BUFFER_BYTES antes de
+# enviarlas al cliente.
+#
+# Datasets por elección:
+# - results: conteo final por candidato (snapshot si está cerrada)
+# - votes:   votos anónimos (id, candidate_id, cast_at)
+# - turnout: quién votó, SIN hora (voted_at permitiría cruzarlo con
+#            votes.cast_at y romper el anonimato)
+# ============================================
+
+EXPORT_BUFFER_BYTES = 64 * 1024
+
+
+def results_rows(election):
+    snapshot = getattr(election, 'result_snapshot', None)
+    if election.status == 'closed' and snapshot:
+        results = snapshot.payload['results']
+    else:
+        results = build_results_payload(election)[0]['results']
+
+    for result in results:
+        yield {
+            'candidate_id': result['candidate_id'],
+            'candidate_name': result['candidate_name'],
+            'party_group': result['party_group'],
+            'votes': result['votes'],
+            'percentage': result['percentage'],
+        }
+
+
+def votes_rows(election):
+    votes = Vote.objects.filter(election=election).order_by('cast_at', 'id').values(
+        'id', 'candidate_id', 'cast_at'
+    )
+    yield from votes.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+
+def turnout_rows(election):
+    registry = VoteRegistry.objects.filter(election=election).order_by('user__email').values(
+        'user_id', 'user__email', 'user__full_name', 'has_voted'
+    )
+    for row in registry.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        yield {
+            'user_id': row['user_id'],
+            'email': row['user__email'],
+            'full_name': row['user__full_name'],
+            'has_voted': row['has_voted'],
+        }
+
+
+# Dataset: (columnas, generador de filas)
+DATASETS = {
+    'results': (['candidate_id', 'candidate_name', 'party_group', 'votes', 'percentage'], results_rows),
+    'votes': (['id', 'candidate_id', 'cast_at'], votes_rows),
+    'turnout': (['user_id', 'email', 'full_name', 'has_voted'], turnout_rows),
+}
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _buffered(make_writer, rows):
+    """Agrupa las filas serializadas en bloques de ~EXPORT_BUFFER_BYTES"""
+    buffer = io.StringIO()
+    write_row = make_writer(buffer)
+
+    for row in rows:
+        write_row(row)
+        if buffer.tell() >= EXPORT_BUFFER_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_csv(columns, rows):
+    def make_writer(buffer):
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        return lambda row: writer.writerow([row[column] for column in columns])
+
+    return _buffered(make_writer, rows)
+
+
+def export_ndjson(columns, rows):
+    def make_writer(buffer):
+        def write_row(row):
+            buffer.write(json.dumps({column: row[column] for column in columns}, cls=DjangoJSONEncoder))
+            buffer.write('\n')
+        return write_row
+
+    return _buffered(make_writer, rows)
+
+
+EXPORTERS = {
+    'csv': export_csv,
+    'ndjson': export_ndjson,
+}
+
+
+def export_dataset(election, dataset, fmt):
+    """Generador de bloques de texto con el dataset en el formato pedido"""
+    columns, rows = DATASETS[dataset]
+    return EXPORTERS[fmt](columns, rows(election))
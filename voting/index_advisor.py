@@ -0,0 +1,332 @@
+import json
+import uuid
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from .models import Candidate, Election, User, Vote, VoteRegistry, VoteTally, ResultSnapshot
+
+# ============================================
+# ASESOR DE ÍNDICES
+#
+# Las tablas de Supabase son managed = False: Django no crea sus índices.
+# Este módulo compara los índices reales (introspección) con los filtros
+# y órdenes que usan las vistas y comandos, y reporta:
+# - índices faltantes, con el costo del plan actual (EXPLAIN) y, si la
+#   extensión hypopg está disponible, el costo con el índice sugerido
+#   (índice hipotético, no se construye nada)
+# - índices redundantes: prefijo de otro índice o duplicados
+# ============================================
+
+MODELS = [User, Election, Candidate, VoteRegistry, Vote, VoteTally, ResultSnapshot]
+
+
+class QueryPattern:
+    """
+    Consulta frecuente sobre una tabla.
+
+    Un índice la cubre si empieza por las columnas de `equality` (en
+    cualquier orden) seguidas de las de `ordering` (en ese orden).
+    """
+
+    def __init__(self, name, model, equality, ordering, used_by, queryset):
+        self.name = name
+        self.model = model
+        self.equality = equality
+        self.ordering = ordering
+        self.used_by = used_by
+        self.queryset = queryset  # función(sample) -> QuerySet representativo
+
+    @property
+    def table(self):
+        return self.model._meta.db_table
+
+    @property
+    def columns(self):
+        return self.equality + self.ordering
+
+    def is_covered_by(self, index_columns):
+        equality = len(self.equality)
+        return (
+            set(index_columns[:equality]) == set(self.equality)
+            and list(index_columns[equality:len(self.columns)]) == self.ordering
+        )
+
+
+QUERY_PATTERNS = [
+    QueryPattern(
+        'usuario por email', User, ['email'], [],
+        'login, register, import_voters',
+        lambda sample: User.objects.filter(email=sample['email']).order_by().values('id'),
+    ),
+    QueryPattern(
+        'votos por candidato', Vote, ['election_id', 'candidate_id'], [],
+        'rebuild_tallies, results (sin contadores)',
+        lambda sample: Vote.objects.filter(
+            election_id=sample['election_id'], candidate_id=sample['candidate_id']
+        ).order_by().values('id'),
+    ),
+    QueryPattern(
+        'votos en el tiempo', Vote, ['election_id'], ['cast_at'],
+        'analytics, export votes',
+        lambda sample: Vote.objects.filter(
+            election_id=sample['election_id'], cast_at__gte=sample['now']
+        ).order_by('cast_at').values('id'),
+    ),
+    QueryPattern(
+        'registro del votante', VoteRegistry, ['user_id', 'election_id'], [],
+        'vote, has-voted, ballot',
+        lambda sample: VoteRegistry.objects.filter(
+            user_id=sample['user_id'], election_id=sample['election_id']
+        ).order_by().values('has_voted'),
+    ),
+    QueryPattern(
+        'participación', VoteRegistry, ['election_id'], [],
+        'analytics, export turnout',
+        lambda sample: VoteRegistry.objects.filter(
+            election_id=sample['election_id'], has_voted=True
+        ).order_by().values('id'),
+    ),
+    QueryPattern(
+        'elecciones por estado', Election, ['status'], ['end_date'],
+        'history, close_expired_elections',
+        lambda sample: Election.objects.filter(
+            status='closed'
+        ).order_by('-end_date', '-id').values('id')[:20],
+    ),
+    QueryPattern(
+        'boleta', Candidate, ['election_id'], ['display_order'],
+        'ballot, candidates, results',
+        lambda sample: Candidate.objects.filter(
+            election_id=sample['election_id']
+        ).order_by('display_order', 'name').values('id'),
+    ),
+]
+
+
+# ============================================
+# INTROSPECCIÓN
+# ============================================
+
+def get_indexes(table, using=DEFAULT_DB_ALIAS):
+    """
+    Índices B-tree de la tabla (incluye PK y UNIQUE):
+    {nombre: {'columns': [...], 'unique': bool}}
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+        special = special_indexes(cursor, table) if connection.vendor == 'postgresql' else set()
+
+    return {
+        name: {
+            'columns': constraint['columns'],
+            'unique': bool(constraint['unique'] or constraint['primary_key']),
+        }
+        for name, constraint in constraints.items()
+        # FK y CHECK no son índices; hash/GIN/GiST no sirven para estos
+        # patrones. Django reporta los B-tree como 'idx'.
+        if constraint['columns'] and None not in constraint['columns'] and name not in special
+        and (constraint['unique'] or constraint['primary_key']
+             or (constraint['index'] and constraint.get('type') in ('idx', 'btree')))
+    }
+
+
+def special_indexes(cursor, table):
+    """
+    Índices parciales (WHERE) o con operator class no estándar (ej. los
+    *_like de Django para LIKE): get_constraints no lo distingue, y no
+    son intercambiables con un índice común.
+    """
+    cursor.execute(
+        """
+        SELECT index_class.relname
+        FROM pg_index i
+        JOIN pg_class index_class ON index_class.oid = i.indexrelid
+        JOIN pg_class table_class ON table_class.oid = i.indrelid
+        WHERE table_class.relname = %s
+          AND pg_catalog.pg_table_is_visible(table_class.oid)
+          AND (
+              i.indpred IS NOT NULL
+              OR EXISTS (
+                  SELECT 1 FROM unnest(i.indclass) AS opclass_id
+                  JOIN pg_opclass opclass ON opclass.oid = opclass_id
+                  WHERE NOT opclass.opcdefault
+              )
+          )
+        """,
+        [table]
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def find_redundant(indexes):
+    """
+    [(nombre, cubierto_por)]: índices no únicos cuyas columnas son
+    prefijo de las de otro índice. De dos idénticos se reporta uno.
+    """
+    redundant = []
+    for name, index in sorted(indexes.items()):
+        if index['unique']:
+            continue
+
+        columns = index['columns']
+        for other_name, other in sorted(indexes.items()):
+            if other_name == name or other['columns'][:len(columns)] != columns:
+                continue
+            if other['columns'] == columns and not other['unique'] and other_name > name:
+                continue  # Duplicado: se conserva este y se reporta el otro
+            redundant.append((name, other_name))
+            break
+    return redundant
+
+
+# ============================================
+# COSTOS (EXPLAIN)
+# ============================================
+
+def sample_values(using=DEFAULT_DB_ALIAS):
+    """Ids reales para que EXPLAIN estime con datos de la tabla"""
+    vote = Vote.objects.using(using).values('election_id', 'candidate_id').first()
+    registry = VoteRegistry.objects.using(using).values('user_id', 'election_id').first()
+    sample = {
+        'election_id': uuid.uuid4(),
+        'candidate_id': uuid.uuid4(),
+        'user_id': uuid.uuid4(),
+        'now': timezone.now(),
+        'email': 'voter@example.com',
+    }
+    sample.update(registry or {})
+    sample.update(vote or {})
+    return sample
+
+
+def explain(queryset):
+    """(costo total estimado | None, resumen del plan)"""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        # SQLite: EXPLAIN QUERY PLAN no estima costos ("id parent notused detalle")
+        return None, ' / '.join(line.split(' ', 3)[-1] for line in queryset.explain().splitlines())
+
+    plan = json.loads(queryset.explain(format='json'))[0]['Plan']
+    return plan['Total Cost'], summarize_plan(plan)
+
+
+def summarize_plan(plan):
+    """'Limit > Index Scan on elections' """
+    nodes = []
+    while plan:
+        node = plan['Node Type']
+        if plan.get('Relation Name'):
+            node = f'{node} on {plan["Relation Name"]}'
+        nodes.append(node)
+        plan = (plan.get('Plans') or [None])[0]
+    return ' > '.join(nodes)
+
+
+def hypopg_available(using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'hypopg'")
+        return cursor.fetchone() is not None
+
+
+def explain_with_index(queryset, ddl):
+    """Costo con un índice hipotético (hypopg): no se construye ni bloquea"""
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute('SELECT * FROM hypopg_create_index(%s)', [ddl])
+        try:
+            return explain(queryset)
+        finally:
+            cursor.execute('SELECT hypopg_reset()')
+
+
+# ============================================
+# DDL Y REPORTE
+# ============================================
+
+def index_name(table, columns):
+    return f'idx_{table}_{"_".join(columns)}'[:63]
+
+
+def create_index_sql(table, columns, using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    concurrently = ' CONCURRENTLY' if connection.vendor == 'postgresql' else ''
+    return (
+        f'CREATE INDEX{concurrently} IF NOT EXISTS {quote(index_name(table, columns))} '
+        f'ON {quote(table)} ({", ".join(quote(column) for column in columns)});'
+    )
+
+
+def drop_index_sql(name, using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    concurrently = ' CONCURRENTLY' if connection.vendor == 'postgresql' else ''
+    return f'DROP INDEX{concurrently} IF EXISTS {connection.ops.quote_name(name)};'
+
+
+def advise(using=DEFAULT_DB_ALIAS, estimate=True):
+    """
+    {'missing': [...], 'redundant': [...], 'covered': [...]} con los
+    patrones de QUERY_PATTERNS contra los índices existentes.
+    """
+    existing_tables = set(connections[using].introspection.table_names())
+    indexes = {
+        model._meta.db_table: get_indexes(model._meta.db_table, using)
+        for model in MODELS
+        if model._meta.db_table in existing_tables
+    }
+
+    sample = sample_values(using) if estimate else None
+    with_hypopg = estimate and hypopg_available(using)
+    report = {'missing': [], 'redundant': [], 'covered': []}
+
+    for pattern in QUERY_PATTERNS:
+        if pattern.table not in indexes:
+            continue
+
+        entry = {
+            'pattern': pattern.name,
+            'table': pattern.table,
+            'columns': pattern.columns,
+            'used_by': pattern.used_by,
+        }
+        covering = [
+            name for name, index in indexes[pattern.table].items()
+            if pattern.is_covered_by(index['columns'])
+        ]
+        if estimate:
+            queryset = pattern.queryset(sample).using(using)
+            entry['cost'], entry['plan'] = explain(queryset)
+
+        if covering:
+            entry['index'] = covering[0]
+            report['covered'].append(entry)
+            continue
+
+        entry['sql'] = create_index_sql(pattern.table, pattern.columns, using)
+        if with_hypopg:
+            # hypopg no acepta CONCURRENTLY ni IF NOT EXISTS
+            hypothetical = (
+                f'CREATE INDEX ON {pattern.table} ({", ".join(pattern.columns)})'
+            )
+            entry['cost_with_index'], entry['plan_with_index'] = explain_with_index(queryset, hypothetical)
+        report['missing'].append(entry)
+
+    # Los índices de tablas gestionadas los mantienen las migraciones
+    unmanaged = {model._meta.db_table for model in MODELS if not model._meta.managed}
+    for table, table_indexes in indexes.items():
+        if table not in unmanaged:
+            continue
+        for name, covered_by in find_redundant(table_indexes):
+            report['redundant'].append({
+                'table': table,
+                'index': name,
+                'columns': table_indexes[name]['columns'],
+                'covered_by': covered_by,
+                'sql': drop_index_sql(name, using),
+            })
+
+    return report
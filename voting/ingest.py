@@ -0,0 +1,448 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, close_old_connections, connection, transaction
+
+from .casting import claim_registry
+from .models import ResultSnapshot, Vote
+from .tallies import increment_tally
+from .versions import bump_results_version
+
+logger = logging.getLogger(__name__)
+
+# ============================================
+# INGESTA DE VOTOS EN COLA (WRITE-BEHIND)
+#
+# Modo opcional (VOTE_INGESTION_MODE = 'queued') para picos de apertura:
+# 1. VoteView reclama el registro en vote_registry (garantía de un voto)
+# 2. Confirmado el reclamo, el voto anónimo se agrega a un journal
+#    SQLite local en modo WAL (un reclamo revertido no deja voto)
+# 3. Un thread por proceso inserta los votos en lotes cada
+#    VOTE_FLUSH_INTERVAL segundos o al juntar VOTE_FLUSH_BATCH_SIZE,
+#    con cast_at = momento en que se encoló
+#
+# El journal NO guarda user_id (anonimato). Las filas se borran solo
+# después de confirmar en la base de datos; si el proceso muere, las
+# filas reclamadas se reintentan tras VOTE_FLUSH_STALE_SECONDS y los
+# votos ya insertados se detectan por id, así el replay es idempotente.
+# Al iniciar, cada proceso retoma las filas que dejó uno anterior
+# (resume_journal, ver apps.py).
+#
+# Una fila que falla VOTE_FLUSH_MAX_ATTEMPTS veces (ej. su candidato ya
+# no existe) pasa a la tabla dead_letter y se registra en el log: no
+# bloquea al resto ni el cierre. Se reencola con
+# `flush_vote_journal --requeue-dead-letter`.
+#
+# Cerrar o archivar una elección vacía antes sus filas del journal
+# (flush_election): sus resultados congelados incluyen todo voto aceptado.
+# Un voto reclamado justo antes del cierre puede llegar al journal
+# después de vaciarlo; al insertarlo se vuelven a congelar los
+# resultados de su elección.
+# ============================================
+
+# Espera entre consultas mientras otro proceso inserta un lote
+CLAIMED_WAIT_SECONDS = 0.1
+
+# Sin conexión a la base las filas no tienen la culpa: no cuentan como intento
+TRANSIENT_ERRORS = (OperationalError, InterfaceError)
+
+
+class FlushFailed(Exception):
+    """Un lote falló por sus filas: se reintentan hasta pasar a dead_letter."""
+
+
+class VoteJournal:
+    """Journal append-only en SQLite, seguro entre threads y procesos."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS journal (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            vote_id TEXT NOT NULL UNIQUE,
+            election_id TEXT NOT NULL,
+            candidate_id TEXT NOT NULL,
+            enqueued_at REAL NOT NULL,
+            claimed_at REAL,
+            attempts INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS dead_letter (
+            seq INTEGER PRIMARY KEY,
+            vote_id TEXT NOT NULL UNIQUE,
+            election_id TEXT NOT NULL,
+            candidate_id TEXT NOT NULL,
+            enqueued_at REAL NOT NULL,
+            attempts INTEGER NOT NULL,
+            error TEXT NOT NULL,
+            failed_at REAL NOT NULL
+        );
+    """
+
+    COLUMNS = 'seq, vote_id, election_id, candidate_id, enqueued_at'
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.local = threading.local()
+
+    def connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=FULL')  # Durable al retornar
+            conn.executescript(self.SCHEMA)
+            self.upgrade(conn)
+            self.local.conn = conn
+        return conn
+
+    def upgrade(self, conn):
+        """Journal creado por una versión sin reintentos contados"""
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(journal)')}
+            if 'attempts' not in columns:
+                conn.execute('ALTER TABLE journal ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0')
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def append(self, vote_id, election_id, candidate_id):
+        self.connection().execute(
+            'INSERT INTO journal (vote_id, election_id, candidate_id, enqueued_at) '
+            'VALUES (?, ?, ?, ?)',
+            (str(vote_id), str(election_id), str(candidate_id), time.time())
+        )
+
+    def claim(self, limit, stale_after, election_id=None):
+        """
+        Reserva hasta `limit` filas libres (o con reclamo vencido),
+        opcionalmente solo de una elección. Si la más antigua ya falló
+        se reserva sola: una fila inválida no arrastra al resto del lote.
+        """
+        conn = self.connection()
+        now = time.time()
+        query = (
+            f'SELECT {self.COLUMNS}, attempts FROM journal '
+            'WHERE (claimed_at IS NULL OR claimed_at < ?)'
+        )
+        params = [now - stale_after]
+        if election_id is not None:
+            query += ' AND election_id = ?'
+            params.append(str(election_id))
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(query + ' ORDER BY seq LIMIT ?', params + [limit]).fetchall()
+            if rows and rows[0][-1]:
+                rows = rows[:1]
+            conn.executemany(
+                'UPDATE journal SET claimed_at = ? WHERE seq = ?',
+                [(now, row[0]) for row in rows]
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        return [row[:-1] for row in rows]
+
+    def release(self, seqs):
+        """Libera filas reclamadas sin contar el intento"""
+        self.connection().executemany(
+            'UPDATE journal SET claimed_at = NULL WHERE seq = ?',
+            [(seq,) for seq in seqs]
+        )
+
+    def fail(self, seqs, error, max_attempts):
+        """
+        Cuenta un intento fallido y libera las filas. Las que llegan a
+        `max_attempts` pasan a dead_letter. Retorna esas filas.
+        """
+        conn = self.connection()
+        placeholders = ', '.join('?' * len(seqs))
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'UPDATE journal SET attempts = attempts + 1, claimed_at = NULL '
+                f'WHERE seq IN ({placeholders})',
+                list(seqs)
+            )
+            dead = conn.execute(
+                f'SELECT {self.COLUMNS}, attempts FROM journal '
+                f'WHERE seq IN ({placeholders}) AND attempts >= ?',
+                list(seqs) + [max_attempts]
+            ).fetchall()
+            conn.executemany(
+                f'INSERT OR REPLACE INTO dead_letter ({self.COLUMNS}, attempts, error, failed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [row + (error, time.time()) for row in dead]
+            )
+            conn.executemany('DELETE FROM journal WHERE seq = ?', [(row[0],) for row in dead])
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        return dead
+
+    def requeue_dead_letter(self, election_id=None):
+        """Devuelve las filas de dead_letter al journal. Retorna cuántas."""
+        conn = self.connection()
+        condition, params = '', []
+        if election_id is not None:
+            condition, params = ' WHERE election_id = ?', [str(election_id)]
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                f'INSERT OR IGNORE INTO journal ({self.COLUMNS}) '
+                f'SELECT {self.COLUMNS} FROM dead_letter' + condition,
+                params
+            )
+            requeued = conn.execute('DELETE FROM dead_letter' + condition, params).rowcount
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        return requeued
+
+    def delete(self, seqs):
+        self.connection().executemany(
+            'DELETE FROM journal WHERE seq = ?',
+            [(seq,) for seq in seqs]
+        )
+
+    def count(self, table, election_id=None):
+        if election_id is None:
+            return self.connection().execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        return self.connection().execute(
+            f'SELECT COUNT(*) FROM {table} WHERE election_id = ?', (str(election_id),)
+        ).fetchone()[0]
+
+    def pending_count(self, election_id=None):
+        return self.count('journal', election_id)
+
+    def dead_letter_count(self, election_id=None):
+        return self.count('dead_letter', election_id)
+
+
+_journals = {}
+
+
+def get_journal():
+    """Journal configurado (una instancia por ruta y proceso)"""
+    path = str(settings.VOTE_JOURNAL_PATH)
+    journal = _journals.get(path)
+    if journal is None:
+        journal = _journals[path] = VoteJournal(path)
+    return journal
+
+
+def _insert_votes(votes):
+    """INSERT directo: bulk_create pisaría cast_at (auto_now_add)"""
+    fields = [Vote._meta.get_field(name) for name in ('id', 'election', 'candidate', 'cast_at')]
+    quote = connection.ops.quote_name
+    sql = (
+        f'INSERT INTO {quote(Vote._meta.db_table)} '
+        f'({", ".join(quote(field.column) for field in fields)}) '
+        f'VALUES ({", ".join(["%s"] * len(fields))})'
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [
+            [field.get_db_prep_save(getattr(vote, field.attname), connection) for field in fields]
+            for vote in votes
+        ])
+
+
+def flush_batch(journal, batch_size=None, stale_after=None, election_id=None):
+    """
+    Inserta en la base de datos un lote del journal (opcionalmente solo
+    de una elección). Retorna cuántas filas del journal se procesaron.
+    """
+    batch_size = batch_size or settings.VOTE_FLUSH_BATCH_SIZE
+    if stale_after is None:
+        stale_after = settings.VOTE_FLUSH_STALE_SECONDS
+
+    rows = journal.claim(batch_size, stale_after, election_id)
+    if not rows:
+        return 0
+
+    votes = {
+        uuid.UUID(vote_id): Vote(
+            id=uuid.UUID(vote_id),
+            election_id=uuid.UUID(election_id),
+            candidate_id=uuid.UUID(candidate_id),
+            cast_at=datetime.fromtimestamp(enqueued_at, tz=dt_timezone.utc)
+        )
+        for _, vote_id, election_id, candidate_id, enqueued_at in rows
+    }
+
+    seqs = [row[0] for row in rows]
+    try:
+        with transaction.atomic():
+            # Replay: ignorar votos que ya se insertaron antes de un fallo
+            existing = set(Vote.objects.filter(id__in=list(votes)).values_list('id', flat=True))
+            new_votes = [vote for vote_id, vote in votes.items() if vote_id not in existing]
+
+            if new_votes:
+                _insert_votes(new_votes)
+
+            counts = Counter((vote.election_id, vote.candidate_id) for vote in new_votes)
+            for (election_id, candidate_id), amount in counts.items():
+                increment_tally(election_id, candidate_id, amount)
+
+            elections = {election_id for election_id, _ in counts}
+            transaction.on_commit(lambda: _votes_flushed(elections))
+    except TRANSIENT_ERRORS:
+        journal.release(seqs)
+        raise
+    except Exception as exc:
+        dead = journal.fail(seqs, repr(exc), settings.VOTE_FLUSH_MAX_ATTEMPTS)
+        if dead:
+            logger.error(
+                'Votos movidos a dead_letter tras %d intentos (%r): %s',
+                settings.VOTE_FLUSH_MAX_ATTEMPTS, exc,
+                ', '.join(f'{vote_id} (elección {election_id})' for _, vote_id, election_id, *_ in dead)
+            )
+        raise FlushFailed(f'Lote de {len(rows)} voto(s) falló: {exc!r}') from exc
+
+    journal.delete(seqs)
+    return len(rows)
+
+
+def _votes_flushed(elections):
+    for election_id in elections:
+        bump_results_version(election_id)
+
+    # Votos reclamados antes del cierre que llegaron tras congelar los
+    # resultados (ver enqueue_vote): volver a congelarlos
+    from .snapshots import refreeze_results
+
+    late = ResultSnapshot.objects.filter(
+        election_id__in=elections, election__status='closed'
+    ).select_related('election')
+    for snapshot in late:
+        logger.warning('Votos tardíos en la elección cerrada %s: se recongelan sus resultados', snapshot.election_id)
+        refreeze_results(snapshot.election)
+
+
+def flush_all(journal, stale_after=None):
+    """
+    Vacía el journal completo (las filas que fallan se reintentan hasta
+    pasar a dead_letter). Retorna filas procesadas.
+    """
+    total = 0
+    while True:
+        try:
+            flushed = flush_batch(journal, stale_after=stale_after)
+        except FlushFailed:
+            logger.exception('Error insertando votos en cola')
+            continue
+        if not flushed:
+            return total
+        total += flushed
+
+
+def flush_election(election_id, stale_after=None):
+    """
+    Inserta los votos de la elección que sigan en el journal. Las filas
+    que otro proceso tenga reclamadas se esperan hasta que las confirme
+    (o hasta que venza su reclamo y se reintenten aquí). Las que fallan
+    se reintentan hasta que pasan a dead_letter.
+    Llamar fuera de una transacción. Retorna filas procesadas.
+    """
+    if not os.path.exists(settings.VOTE_JOURNAL_PATH):
+        return 0
+
+    journal = get_journal()
+    total = 0
+    while journal.pending_count(election_id):
+        try:
+            flushed = flush_batch(journal, stale_after=stale_after, election_id=election_id)
+        except FlushFailed:
+            logger.exception('Error insertando votos en cola de la elección %s', election_id)
+            flushed = 0
+        if not flushed:
+            time.sleep(CLAIMED_WAIT_SECONDS)
+        total += flushed
+    return total
+
+
+# ============================================
+# THREAD DE VACIADO (uno por proceso)
+# ============================================
+
+class Flusher(threading.Thread):
+
+    def __init__(self):
+        super().__init__(name='vote-journal-flusher', daemon=True)
+        self.journal = get_journal()
+        self.wake = threading.Event()
+        self.pid = os.getpid()
+        self.appended = 0
+
+    def notify(self):
+        """Despertar antes del intervalo si ya hay un lote completo."""
+        self.appended += 1
+        if self.appended >= settings.VOTE_FLUSH_BATCH_SIZE:
+            self.appended = 0
+            self.wake.set()
+
+    def run(self):
+        while True:
+            self.wake.wait(settings.VOTE_FLUSH_INTERVAL)
+            self.wake.clear()
+            close_old_connections()
+            try:
+                flush_all(self.journal)
+            except Exception:
+                logger.exception('Error vaciando journal de votos')
+
+
+_flusher = None
+_flusher_lock = threading.Lock()
+
+
+def ensure_flusher():
+    """Inicia el thread de vaciado del proceso actual (también tras fork)."""
+    global _flusher
+    with _flusher_lock:
+        if _flusher is None or _flusher.pid != os.getpid() or not _flusher.is_alive():
+            _flusher = Flusher()
+            _flusher.start()
+        return _flusher
+
+
+def resume_journal():
+    """
+    Al iniciar el proceso (modo 'queued'): si el journal tiene votos que
+    dejó un proceso anterior, iniciar el thread de vaciado sin esperar
+    al primer voto nuevo.
+    """
+    if settings.VOTE_INGESTION_MODE != 'queued' or not os.path.exists(settings.VOTE_JOURNAL_PATH):
+        return
+    if get_journal().pending_count():
+        ensure_flusher()
+
+
+def enqueue_vote(user_id, election_id, candidate_id):
+    """
+    Reclama el registro de votación y encola el voto anónimo.
+    Lanza AlreadyVoted si el usuario ya votó y ElectionNotOpen si la
+    elección ya no admite votos.
+    """
+    def append():
+        get_journal().append(uuid.uuid4(), election_id, candidate_id)
+        ensure_flusher().notify()
+
+    with transaction.atomic():
+        claim_registry(user_id, election_id)
+        # Solo un reclamo confirmado llega al journal
+        transaction.on_commit(append)
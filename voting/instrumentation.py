@@ -0,0 +1,219 @@
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connection
+from django.urls import URLPattern, URLResolver
+
+# ============================================
+# PRESUPUESTOS DE QUERIES Y LATENCIA POR ENDPOINT
+#
+# EndpointProfiler envuelve (solo mientras está activo) cada vista de
+# voting/urls.py y registra por petición: queries SQL, tiempo en la BD,
+# tiempo de la vista y tiempo de serialización (render de la respuesta).
+# Los tests comparan cada registro con ENDPOINT_BUDGETS, de modo que
+# un N+1 nuevo o un endpoint sin presupuesto hace fallar el build.
+# ============================================
+
+# Por nombre de URL: máximo de queries y de milisegundos (vista + render).
+# Los límites de queries NO dependen de la cantidad de filas; pueden ser
+# un dict por motor cuando la ruta difiere (ver casting.py).
+# El JWT no consulta 'users' (ver authentication.py) y la versión de
+# tokens la deja en cache el login; se considera el peor caso con el
+# cache de elecciones/candidatos vacío.
+ENDPOINT_BUDGETS = {
+    'register': {'queries': 2, 'ms': 2000},         # Hash de password incluido
+    'login': {'queries': 2, 'ms': 2000},            # Hash de password y versión de tokens
+    'profile': {'queries': 1, 'ms': 200},
+    'token_refresh': {'queries': 0, 'ms': 200},
+    'vote': {'queries': {'postgresql': 3, 'default': 13}, 'ms': 300},
+    'has-voted': {'queries': 2, 'ms': 200},
+    'has-voted-bulk': {'queries': 2, 'ms': 200},    # 0 con ambos caches calientes
+    'ballot': {'queries': 2, 'ms': 200},            # 1 con el cache de objetos caliente
+    'results': {'queries': 2, 'ms': 300},
+    'history': {'queries': 3, 'ms': 300},
+    'metrics': {'queries': 0, 'ms': 200},
+    'analytics': {'queries': 4, 'ms': 300},
+    'export': {'queries': 1, 'ms': 200},            # Las filas se leen al enviar el stream
+    'archive': {'queries': 1, 'ms': 200},           # Lee el archivo al enviar el stream
+    'election-list': {'queries': 1, 'ms': 200},
+    'election-detail': {'queries': 1, 'ms': 200},
+    'candidate-list': {'queries': 1, 'ms': 200},
+    'candidate-detail': {'queries': 1, 'ms': 200},
+    'api-root': {'queries': 0, 'ms': 200},
+
+    # Stream SSE: no se envuelve, su costo es por conexión
+    'results-stream': None,
+}
+
+
+def iter_patterns(patterns=None):
+    """Todos los URLPatterns de voting/urls.py (incluye el router)"""
+    if patterns is None:
+        from .urls import urlpatterns as patterns
+
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_patterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern
+
+
+def query_budget(budget):
+    """Máximo de queries para el motor actual"""
+    queries = budget['queries']
+    if isinstance(queries, dict):
+        return queries.get(connection.vendor, queries['default'])
+    return queries
+
+
+class QueryRecorder:
+    """execute_wrapper que cuenta queries y tiempo en la BD del thread actual"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.context = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_ms += (time.perf_counter() - started) * 1000
+
+    def start(self):
+        self.context = connection.execute_wrapper(self)
+        self.context.__enter__()
+
+    def stop(self):
+        self.context.__exit__(None, None, None)
+
+
+class EndpointProfiler:
+    """
+    Uso (tests):
+        with EndpointProfiler() as profiler:
+            self.client.get('/api/history/')
+        profiler.violations()
+    """
+
+    def __init__(self, budgets=None):
+        self.budgets = ENDPOINT_BUDGETS if budgets is None else budgets
+        self.samples = []
+        self.originals = []
+
+    def __enter__(self):
+        for pattern in iter_patterns():
+            if self.budgets.get(pattern.name, True) is None:
+                continue
+            self.originals.append((pattern, pattern.callback))
+            if iscoroutinefunction(pattern.callback):
+                pattern.callback = self.wrap_async(pattern.name, pattern.callback)
+            else:
+                pattern.callback = self.wrap(pattern.name, pattern.callback)
+        return self
+
+    def __exit__(self, *exc_info):
+        for pattern, callback in self.originals:
+            pattern.callback = callback
+        self.originals = []
+
+    def wrap(self, name, view):
+        @wraps(view)
+        def profiled_view(request, *args, **kwargs):
+            recorder = QueryRecorder()
+            recorder.start()
+            try:
+                started = time.perf_counter()
+                response = view(request, *args, **kwargs)
+                view_ms = (time.perf_counter() - started) * 1000
+
+                # DRF serializa al renderizar; adelantarlo aquí para medirlo
+                started = time.perf_counter()
+                if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+                    response.render()
+                render_ms = (time.perf_counter() - started) * 1000
+            finally:
+                recorder.stop()
+
+            self.add_sample(name, request, response, recorder, view_ms, render_ms)
+            return response
+
+        return profiled_view
+
+    def wrap_async(self, name, view):
+        """
+        Vistas async: el ORM corre en el thread de la petición
+        (sync_to_async), así que el registro de queries se instala ahí.
+        """
+        @wraps(view)
+        async def profiled_view(request, *args, **kwargs):
+            recorder = QueryRecorder()
+            await sync_to_async(recorder.start)()
+            try:
+                started = time.perf_counter()
+                response = await view(request, *args, **kwargs)
+                view_ms = (time.perf_counter() - started) * 1000
+
+                started = time.perf_counter()
+                if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+                    await sync_to_async(response.render)()
+                render_ms = (time.perf_counter() - started) * 1000
+            finally:
+                await sync_to_async(recorder.stop)()
+
+            self.add_sample(name, request, response, recorder, view_ms, render_ms)
+            return response
+
+        markcoroutinefunction(profiled_view)
+        return profiled_view
+
+    def add_sample(self, name, request, response, recorder, view_ms, render_ms):
+        self.samples.append({
+            'name': name,
+            'path': request.path,
+            'queries': recorder.queries,
+            'db_ms': recorder.db_ms,
+            'view_ms': view_ms,
+            'render_ms': render_ms,
+            'status': response.status_code,
+        })
+
+    def violations(self):
+        """Mensajes por cada petición que excedió su presupuesto"""
+        messages = []
+        for sample in self.samples:
+            if sample['name'] not in self.budgets:
+                messages.append(f'{sample["name"]}: sin presupuesto declarado')
+                continue
+
+            budget = self.budgets[sample['name']]
+            if budget is None:
+                continue
+
+            max_queries = query_budget(budget)
+            if sample['queries'] > max_queries:
+                messages.append(
+                    f'{sample["path"]}: {sample["queries"]} queries '
+                    f'(presupuesto {max_queries})'
+                )
+            elapsed = sample['view_ms'] + sample['render_ms']
+            if elapsed > budget['ms']:
+                messages.append(
+                    f'{sample["path"]}: {elapsed:.1f} ms (presupuesto {budget["ms"]} ms)'
+                )
+        return messages
+
+    def report(self):
+        """Máximos por endpoint: {name: {queries, db_ms, view_ms, render_ms}}"""
+        summary = {}
+        for sample in self.samples:
+            entry = summary.setdefault(sample['name'], {
+                'requests': 0, 'queries': 0, 'db_ms': 0.0, 'view_ms': 0.0, 'render_ms': 0.0
+            })
+            entry['requests'] += 1
+            for key in ('queries', 'db_ms', 'view_ms', 'render_ms'):
+                entry[key] = max(entry[key], sample[key])
+        return summary
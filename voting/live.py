@@ -0,0 +1,207 @@
+import asyncio
+import json
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from .models import VoteTally
+from .object_cache import get_election
+from .versions import results_version_key
+
+logger = logging.getLogger(__name__)
+
+# ============================================
+# RESULTADOS EN VIVO (SERVER-SENT EVENTS)
+#
+# VoteView incrementa una "versión de resultados" por elección en el
+# cache al confirmar cada voto (ver versions.py). En cada proceso ASGI
+# existe un único ResultsHub por elección con suscriptores: revisa esa
+# versión como máximo LIVE_RESULTS_MAX_UPDATES_PER_SECOND veces por
+# segundo y solo cuando cambió lee los contadores y reparte el delta.
+#
+# Un stream dura minutos y request_finished solo llega al cerrarlo: ni
+# la vista ni el hub retienen la conexión a la base (con el pool de
+# voting.backends.postgresql cada espectador ocuparía una).
+# ============================================
+
+KEEPALIVE_SECONDS = 15
+RETRY_AFTER_SECONDS = 15  # Al superar LIVE_RESULTS_MAX_SUBSCRIBERS
+
+
+def release_connections():
+    """Devuelve al pool las conexiones del thread actual."""
+    for connection in connections.all(initialized_only=True):
+        # Dentro de una transacción (tests) cerrar la invalidaría
+        if not connection.in_atomic_block:
+            connection.close()
+
+
+def election_exists(election_id):
+    """Desde el cache de objetos, sin retener la conexión si hubo que consultar"""
+    try:
+        return get_election(election_id) is not None
+    finally:
+        release_connections()
+
+
+def read_tally_counts(election_id):
+    """Contadores actuales: {candidate_id: votos}"""
+    try:
+        return {
+            str(candidate_id): votes
+            for candidate_id, votes in VoteTally.objects.filter(
+                election_id=election_id
+            ).values_list('candidate_id', 'votes')
+        }
+    finally:
+        release_connections()
+
+
+class Subscriber:
+    """Cambios pendientes de un cliente, fusionados hasta que los lea."""
+
+    def __init__(self, counts):
+        self.pending = dict(counts)
+        self.failed = False
+        self.event = asyncio.Event()
+        self.event.set()  # El primer mensaje es el estado completo
+
+    def push(self, delta):
+        self.pending.update(delta)
+        self.event.set()
+
+    def fail(self):
+        """El hub dejó de leer: cerrar el stream (EventSource reconecta)."""
+        self.failed = True
+        self.event.set()
+
+    def take(self):
+        delta, self.pending = self.pending, {}
+        self.event.clear()
+        return delta
+
+
+class ResultsHub:
+    """Un único lector de contadores por elección y proceso."""
+
+    def __init__(self, election_id):
+        self.election_id = election_id
+        self.subscribers = set()
+        self.counts = {}
+        self.version = None
+        self.task = None
+
+    async def run(self):
+        interval = 1 / settings.LIVE_RESULTS_MAX_UPDATES_PER_SECOND
+        key = results_version_key(self.election_id)
+
+        try:
+            while self.subscribers:
+                version = await cache.aget(key)
+                if version != self.version:
+                    self.version = version
+                    counts = await sync_to_async(read_tally_counts)(self.election_id)
+                    delta = {
+                        candidate_id: votes
+                        for candidate_id, votes in counts.items()
+                        if self.counts.get(candidate_id) != votes
+                    }
+                    self.counts = counts
+                    if delta:
+                        for subscriber in self.subscribers:
+                            subscriber.push(delta)
+
+                await asyncio.sleep(interval)
+        except Exception:
+            logger.exception('Error leyendo resultados en vivo de %s', self.election_id)
+            for subscriber in self.subscribers:
+                subscriber.fail()
+        finally:
+            if _hubs.get(self.election_id) is self:
+                del _hubs[self.election_id]
+
+    async def subscribe(self):
+        if not self.running:
+            version = await cache.aget(results_version_key(self.election_id))
+            counts = await sync_to_async(read_tally_counts)(self.election_id)
+            if not self.running:
+                self.version, self.counts = version, counts
+
+        subscriber = Subscriber(self.counts)
+        self.subscribers.add(subscriber)
+
+        if not self.running:
+            _hubs[self.election_id] = self
+            self.task = asyncio.ensure_future(self.run())
+
+        return subscriber
+
+    @property
+    def running(self):
+        return self.task is not None and not self.task.done()
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.discard(subscriber)
+
+
+_hubs = {}
+
+
+def subscriber_count():
+    """Streams abiertos en este proceso (todas las elecciones)"""
+    return sum(len(hub.subscribers) for hub in list(_hubs.values()))
+
+
+def streams_full():
+    limit = settings.LIVE_RESULTS_MAX_SUBSCRIBERS
+    return bool(limit) and subscriber_count() >= limit
+
+
+def get_hub(election_id):
+    election_id = str(election_id)
+    hub = _hubs.get(election_id)
+    if hub is None:
+        hub = _hubs[election_id] = ResultsHub(election_id)
+    return hub
+
+
+def format_event(event, data):
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+async def stream_results(election_id):
+    """
+    Genera eventos SSE:
+    - 'snapshot': todos los contadores al conectarse
+    - 'tally': solo los candidatos cuyo conteo cambió
+
+    Ambos incluyen total_votes. La conexión se cierra tras
+    LIVE_RESULTS_MAX_STREAM_SECONDS; EventSource reconecta solo.
+    """
+    hub = get_hub(election_id)
+    subscriber = await hub.subscribe()
+    deadline = time.monotonic() + settings.LIVE_RESULTS_MAX_STREAM_SECONDS
+    event = 'snapshot'
+
+    try:
+        while time.monotonic() < deadline:
+            try:
+                await asyncio.wait_for(subscriber.event.wait(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+
+            if subscriber.failed:
+                break
+
+            yield format_event(event, {
+                'total_votes': sum(hub.counts.values()),
+                'votes': subscriber.take(),
+            })
+            event = 'tally'
+    finally:
+        hub.unsubscribe(subscriber)
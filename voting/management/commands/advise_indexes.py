@@ -0,0 +1,79 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from voting.index_advisor import advise
+
+
+class Command(BaseCommand):
+    """
+    Compara los índices de las tablas con las consultas de la API y
+    reporta índices faltantes (con costo estimado por EXPLAIN) y
+    redundantes. No modifica la base de datos.
+
+    Uso:
+        python manage.py advise_indexes
+        python manage.py advise_indexes --sql > indexes.sql   # solo DDL
+        python manage.py advise_indexes --json
+        python manage.py advise_indexes --no-explain          # sin EXPLAIN
+
+    El DDL usa CREATE/DROP INDEX CONCURRENTLY: ejecutarlo fuera de una
+    transacción (psql o el SQL editor de Supabase, sentencia por sentencia)
+    y por la conexión directa, no por el pooler en modo transacción.
+    """
+
+    help = 'Reporta índices faltantes o redundantes según las consultas de la API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Alias de la base de datos')
+        parser.add_argument('--sql', action='store_true', help='Imprimir solo el DDL sugerido')
+        parser.add_argument('--json', action='store_true', help='Reporte completo en JSON')
+        parser.add_argument(
+            '--no-explain',
+            action='store_true',
+            help='No estimar costos con EXPLAIN'
+        )
+
+    def handle(self, *args, **options):
+        report = advise(using=options['database'], estimate=not options['no_explain'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2, default=str))
+        elif options['sql']:
+            for entry in report['missing'] + report['redundant']:
+                self.stdout.write(entry['sql'])
+        else:
+            self.print_report(report)
+
+    def print_report(self, report):
+        for entry in report['covered']:
+            self.stdout.write(
+                f'✅ {entry["table"]}({", ".join(entry["columns"])}) '
+                f'[{entry["pattern"]}] cubierto por {entry["index"]}'
+            )
+
+        for entry in report['missing']:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  {entry["table"]}({", ".join(entry["columns"])}) '
+                f'[{entry["pattern"]}] sin índice - usado por {entry["used_by"]}'
+            ))
+            if 'plan' in entry:
+                self.stdout.write(f'    plan actual: {entry["plan"]} (costo {entry["cost"]})')
+            if 'cost_with_index' in entry:
+                self.stdout.write(
+                    f'    con índice:  {entry["plan_with_index"]} (costo {entry["cost_with_index"]})'
+                )
+            self.stdout.write(f'    {entry["sql"]}')
+
+        for entry in report['redundant']:
+            self.stdout.write(self.style.WARNING(
+                f'🗑️  {entry["table"]}.{entry["index"]} ({", ".join(entry["columns"])}) '
+                f'redundante con {entry["covered_by"]}'
+            ))
+            self.stdout.write(f'    {entry["sql"]}')
+
+        self.stdout.write(
+            f'{len(report["missing"])} índice(s) faltante(s), '
+            f'{len(report["redundant"])} redundante(s)'
+        )
@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from voting.archive import ArchiveError, archive_election, restore_election, verify_archive
+from voting.models import Election, ElectionArchive
+
+
+class Command(BaseCommand):
+    """
+    Mueve los votos y el registro de elecciones cerradas a archivos
+    comprimidos en ARCHIVE_DIR (ver voting/archive.py).
+
+    Uso:
+        python manage.py archive_elections --election <uuid>
+        python manage.py archive_elections --older-than 90   # cerradas hace más de 90 días
+        python manage.py archive_elections --verify          # checksums de todos los archivos
+        python manage.py archive_elections --restore <uuid>
+
+    Solo se archivan elecciones cerradas con resultados congelados.
+    """
+
+    help = 'Archiva en disco los votos de elecciones cerradas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--election', help='UUID de una elección específica')
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            metavar='DAYS',
+            help='Archivar las elecciones cerradas que terminaron hace más de DAYS días'
+        )
+        parser.add_argument('--verify', action='store_true', help='Verificar los archivos existentes')
+        parser.add_argument('--restore', metavar='ELECTION_ID', help='Restaurar una elección archivada')
+
+    def handle(self, *args, **options):
+        if options['verify']:
+            return self.verify()
+        if options['restore']:
+            return self.restore(options['restore'])
+
+        if options['election']:
+            elections = Election.objects.filter(id=options['election'])
+            if not elections.exists():
+                raise CommandError(f'Elección {options["election"]} no encontrada')
+        elif options['older_than'] is not None:
+            elections = Election.objects.filter(
+                status='closed',
+                end_date__lt=timezone.now() - timedelta(days=options['older_than']),
+                result_snapshot__isnull=False,
+                archive__isnull=True
+            )
+        else:
+            raise CommandError('Indicar --election, --older-than, --verify o --restore')
+
+        archived = 0
+        for election in elections:
+            try:
+                archive = archive_election(election)
+            except ArchiveError as exc:
+                raise CommandError(str(exc))
+            archived += 1
+            self.stdout.write(
+                f'🗄️  {election.title}: {archive.votes_count} votos, '
+                f'{archive.registry_count} registros, {archive.size_bytes} bytes'
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'✅ {archived} elección(es) archivada(s)'))
+
+    def verify(self):
+        failed = 0
+        for archive in ElectionArchive.objects.select_related('election'):
+            try:
+                verify_archive(archive)
+            except ArchiveError as exc:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f'⚠️  {archive.election.title}: {exc}'))
+            else:
+                self.stdout.write(f'✅ {archive.election.title}: {archive.sha256}')
+
+        if failed:
+            raise CommandError(f'{failed} archivo(s) con errores')
+
+    def restore(self, election_id):
+        election = Election.objects.filter(id=election_id).first()
+        if election is None:
+            raise CommandError(f'Elección {election_id} no encontrada')
+
+        try:
+            restored = restore_election(election)
+        except ArchiveError as exc:
+            raise CommandError(str(exc))
+
+        rows = ', '.join(f'{count} en {table}' for table, count in restored.items())
+        self.stdout.write(self.style.SUCCESS(f'✅ {election.title} restaurada: {rows}'))
@@ -0,0 +1,152 @@
+import json
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from voting.benchmark import (
+    SCENARIOS, seed_dataset, clear_benchmark_data, run_benchmark,
+    git_revision, compare_reports, load_report
+)
+from voting.provisioning import is_local_database
+
+
+class Command(BaseCommand):
+    """
+    Benchmark reproducible de la API contra una base de datos LOCAL.
+
+    Uso:
+        python manage.py benchmark
+        python manage.py benchmark --users 2000 --elections 5 --votes 5000 --concurrency 8
+        python manage.py benchmark --scenarios results,history --requests 500
+        python manage.py benchmark --output after.json --compare before.json
+
+    Con SQLite (DB_ENGINE=django.db.backends.sqlite3) usar --create-schema
+    para crear las tablas de Supabase en una base vacía.
+    """
+
+    help = 'Siembra datos y mide latencia, throughput y queries por endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200, help='Usuarios a sembrar')
+        parser.add_argument('--elections', type=int, default=3, help='Elecciones activas')
+        parser.add_argument('--closed-elections', type=int, default=10, help='Elecciones cerradas (historial)')
+        parser.add_argument('--candidates', type=int, default=4, help='Candidatos por elección')
+        parser.add_argument('--votes', type=int, default=500, help='Votos previos a sembrar')
+        parser.add_argument('--requests', type=int, default=200, help='Peticiones por escenario')
+        parser.add_argument('--concurrency', type=int, default=4, help='Threads concurrentes')
+        parser.add_argument(
+            '--scenarios',
+            default=','.join(SCENARIOS),
+            help=f'Escenarios separados por coma ({", ".join(SCENARIOS)})'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Semilla (datos y peticiones)')
+        parser.add_argument('--output', default='benchmark.json', help='Archivo JSON de resultados')
+        parser.add_argument('--compare', help='JSON de una corrida anterior para comparar')
+        parser.add_argument(
+            '--create-schema',
+            action='store_true',
+            help='Crear tablas faltantes (base local vacía)'
+        )
+        parser.add_argument(
+            '--keep-data',
+            action='store_true',
+            help='No borrar los datos sembrados al terminar'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Permitir una base de datos que no es local'
+        )
+
+    def handle(self, *args, **options):
+        scenarios = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f'Escenarios desconocidos: {", ".join(sorted(unknown))}')
+
+        if not options['force'] and not is_local_database():
+            raise CommandError(
+                'El benchmark escribe datos: usar una base local o --force '
+                f'(HOST={connection.settings_dict.get("HOST")})'
+            )
+
+        if options['create_schema']:
+            self.create_schema()
+
+        params = {
+            key: options[key]
+            for key in ('users', 'elections', 'closed_elections', 'candidates',
+                        'votes', 'requests', 'concurrency', 'seed')
+        }
+
+        self.stdout.write('🔧 Sembrando datos...')
+        dataset = seed_dataset(
+            users=options['users'],
+            elections=options['elections'],
+            closed_elections=options['closed_elections'],
+            candidates=options['candidates'],
+            votes=options['votes'],
+            seed=options['seed']
+        )
+
+        try:
+            self.stdout.write('⏱️  Ejecutando escenarios...')
+            results = run_benchmark(
+                dataset,
+                scenarios=scenarios,
+                requests=options['requests'],
+                concurrency=options['concurrency'],
+                seed=options['seed']
+            )
+        finally:
+            if not options['keep_data']:
+                clear_benchmark_data()
+
+        report = {
+            'created_at': timezone.now().isoformat(),
+            'revision': git_revision(),
+            'database': connection.vendor,
+            'params': params,
+            'scenarios': results,
+        }
+
+        with open(options['output'], 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+
+        self.print_report(results)
+        if options['compare']:
+            self.print_comparison(compare_reports(load_report(options['compare']), report))
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Resultados guardados en {options["output"]}'))
+
+    def create_schema(self):
+        """Tablas no gestionadas (Supabase) y luego migraciones de voting"""
+        existing = set(connection.introspection.table_names())
+        with connection.schema_editor() as editor:
+            for model in apps.get_app_config('voting').get_models():
+                if not model._meta.managed and model._meta.db_table not in existing:
+                    editor.create_model(model)
+        call_command('migrate', 'voting', verbosity=0)
+
+    def print_report(self, results):
+        self.stdout.write(
+            f'{"escenario":<10} {"req":>6} {"err":>5} {"req/s":>9} '
+            f'{"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"queries":>8}'
+        )
+        for scenario, stats in results.items():
+            latency = stats['latency_ms']
+            self.stdout.write(
+                f'{scenario:<10} {stats["requests"]:>6} {stats["errors"]:>5} '
+                f'{stats["throughput_rps"] or 0:>9} {latency["p50"] or 0:>9} '
+                f'{latency["p95"] or 0:>9} {latency["p99"] or 0:>9} '
+                f'{stats["queries_per_request"]["mean"] or 0:>8}'
+            )
+
+    def print_comparison(self, changes):
+        self.stdout.write('\nComparación (antes → ahora):')
+        for scenario, metrics in changes.items():
+            parts = [f'{metric} {before} → {after}' for metric, (before, after) in metrics.items()]
+            self.stdout.write(f'{scenario:<10} ' + ', '.join(parts))
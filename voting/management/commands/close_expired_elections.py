@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from voting.models import Election
+from voting.snapshots import close_election
+
+
+class Command(BaseCommand):
+    """
+    Cierra elecciones activas cuyo periodo terminó y congela sus resultados.
+    Pensado para ejecutarse periódicamente (cron / scheduler).
+
+    Uso:
+        python manage.py close_expired_elections
+    """
+
+    help = 'Cierra elecciones vencidas y guarda sus resultados finales'
+
+    def handle(self, *args, **options):
+        expired = Election.objects.filter(status='active', end_date__lt=timezone.now())
+
+        closed = 0
+        for election in expired:
+            snapshot = close_election(election)
+            closed += 1
+            self.stdout.write(
+                f'🔒 {election.title}: {snapshot.total_votes} votos, ganador: {snapshot.winner}'
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'✅ {closed} elección(es) cerrada(s)'))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from voting.ingest import flush_all, get_journal
+
+
+class Command(BaseCommand):
+    """
+    Inserta en la base de datos los votos pendientes del journal local.
+    Cada proceso web lo retoma solo al iniciar (ver apps.py); sirve para
+    vaciarlo sin servicio corriendo o para reencolar el dead letter.
+
+    Uso:
+        python manage.py flush_vote_journal
+        python manage.py flush_vote_journal --force                 # reintentar también filas reclamadas
+        python manage.py flush_vote_journal --requeue-dead-letter   # reintentar filas que agotaron sus intentos
+    """
+
+    help = 'Vacía el journal de votos en cola (recuperación tras caída)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Reintentar filas reclamadas por otro proceso aunque no hayan vencido'
+        )
+        parser.add_argument(
+            '--requeue-dead-letter',
+            action='store_true',
+            help='Devolver al journal las filas en dead_letter antes de vaciarlo'
+        )
+
+    def handle(self, *args, **options):
+        journal = get_journal()
+        stale_after = 0 if options['force'] else None
+
+        if options['requeue_dead_letter']:
+            requeued = journal.requeue_dead_letter()
+            self.stdout.write(f'🔁 {requeued} fila(s) devuelta(s) desde dead_letter')
+
+        flushed = flush_all(journal, stale_after=stale_after)
+        pending = journal.pending_count()
+        dead = journal.dead_letter_count()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {flushed} voto(s) insertado(s), {pending} pendiente(s)'
+        ))
+        if dead:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  {dead} voto(s) en dead_letter (ver el log; --requeue-dead-letter para reintentar)'
+            ))
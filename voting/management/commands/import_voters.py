@@ -0,0 +1,69 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from voting.imports import import_voters
+
+
+class Command(BaseCommand):
+    """
+    Importa votantes desde un CSV (email, full_name, password, role).
+
+    Uso:
+        python manage.py import_voters votantes.csv
+        python manage.py import_voters votantes.csv --errors errores.csv
+        python manage.py import_voters votantes.csv --dry-run
+    """
+
+    help = 'Importa usuarios votantes desde un archivo CSV en streaming'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Archivo CSV (UTF-8)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Filas por lote')
+        parser.add_argument('--workers', type=int, default=4, help='Procesos para hashing (0 = sin pool)')
+        parser.add_argument('--errors', help='CSV donde guardar las filas con error')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validar y contar sin crear usuarios'
+        )
+
+    def handle(self, *args, **options):
+        errors_file = open(options['errors'], 'w', newline='', encoding='utf-8') if options['errors'] else None
+        errors_writer = csv.writer(errors_file) if errors_file else None
+        if errors_writer:
+            errors_writer.writerow(['line', 'email', 'error'])
+
+        def on_error(line, email, message):
+            if errors_writer:
+                errors_writer.writerow([line, email, message])
+            else:
+                self.stderr.write(f'Línea {line} ({email}): {message}')
+
+        def on_progress(result):
+            self.stdout.write(
+                f'{result.rows} filas · {result.created} creados · '
+                f'{result.existing} existentes · {result.duplicates} duplicados · '
+                f'{result.errors} errores'
+            )
+
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as lines:
+                result = import_voters(
+                    lines,
+                    batch_size=options['batch_size'],
+                    workers=options['workers'],
+                    dry_run=options['dry_run'],
+                    on_error=on_error,
+                    on_progress=on_progress
+                )
+        except (OSError, ValueError) as error:
+            raise CommandError(str(error))
+        finally:
+            if errors_file:
+                errors_file.close()
+
+        verb = 'se crearían' if options['dry_run'] else 'creados'
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {result.created} usuario(s) {verb}, {result.errors} fila(s) con error'
+        ))
@@ -0,0 +1,95 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from voting.models import Election
+from voting.partitions import (
+    PARTITIONED_MODELS, conversion_sql, detach_partitions, is_partitioned, list_partitions,
+)
+
+
+class Command(BaseCommand):
+    """
+    Particiona votes y vote_registry por elección (PostgreSQL).
+
+    Uso:
+        python manage.py partition_votes                  # estado
+        python manage.py partition_votes --sql > p.sql    # solo DDL
+        python manage.py partition_votes --apply
+        python manage.py partition_votes --detach <election_id>
+
+    --apply copia las tablas a su versión particionada en una sola
+    transacción que las bloquea mientras dura: ejecutarlo con la
+    votación detenida y por la conexión directa. Constraints e índices se
+    conservan (la PK y los UNIQUE pasan a incluir election_id); permisos
+    y políticas RLS no, hay que volver a crearlos.
+    """
+
+    help = 'Particiona las tablas de votos por elección'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Alias de la base de datos')
+        parser.add_argument('--sql', action='store_true', help='Imprimir el DDL de la conversión')
+        parser.add_argument('--apply', action='store_true', help='Ejecutar la conversión')
+        parser.add_argument(
+            '--detach',
+            metavar='ELECTION_ID',
+            help='Separar las particiones de una elección cerrada'
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if connections[using].vendor != 'postgresql':
+            raise CommandError('El particionamiento requiere PostgreSQL')
+
+        if options['detach']:
+            self.detach(options['detach'], using)
+        elif options['sql'] or options['apply']:
+            self.convert(using, apply=options['apply'])
+        else:
+            self.print_status(using)
+
+    def convert(self, using, apply):
+        try:
+            statements = conversion_sql(using)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        if len(statements) == 1:
+            self.stdout.write(self.style.SUCCESS('✅ Las tablas ya están particionadas'))
+            return
+
+        if not apply:
+            for statement in statements:
+                self.stdout.write(f'{statement};')
+            return
+
+        with transaction.atomic(using=using), connections[using].cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+        self.stdout.write(self.style.SUCCESS('✅ votes y vote_registry particionadas por elección'))
+        self.stdout.write(self.style.WARNING(
+            '⚠️  Revisar permisos y políticas RLS de las tablas nuevas'
+        ))
+
+    def detach(self, election_id, using):
+        election = Election.objects.using(using).filter(id=election_id).first()
+        if election is None:
+            raise CommandError(f'Elección no encontrada: {election_id}')
+        if election.status != 'closed':
+            raise CommandError(f'"{election.title}" no está cerrada')
+
+        for partition in detach_partitions(election.id, using):
+            self.stdout.write(self.style.SUCCESS(f'🔒 {partition} separada'))
+
+    def print_status(self, using):
+        for model in PARTITIONED_MODELS:
+            table = model._meta.db_table
+            if not is_partitioned(table, using):
+                self.stdout.write(self.style.WARNING(f'⚠️  {table} no está particionada'))
+                continue
+
+            partitions = list_partitions(table, using)
+            self.stdout.write(f'✅ {table}: {len(partitions)} partición(es)')
+            for partition, bound in partitions:
+                self.stdout.write(f'    {partition} {bound}')
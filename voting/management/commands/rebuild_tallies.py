@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from voting.models import Election
+from voting.tallies import rebuild_tallies
+
+
+class Command(BaseCommand):
+    """
+    Reconstruye/reconcilia los contadores 'vote_tallies' desde 'votes'.
+
+    Uso:
+        python manage.py rebuild_tallies
+        python manage.py rebuild_tallies --election <uuid>
+        python manage.py rebuild_tallies --check   # solo reporta diferencias
+    """
+
+    help = 'Reconstruye los contadores de votos por candidato desde la tabla votes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--election', help='UUID de una elección específica')
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Solo reportar diferencias, sin modificar contadores'
+        )
+
+    def handle(self, *args, **options):
+        # Las archivadas ya no tienen votos en la tabla (ver archive.py)
+        elections = Election.objects.filter(archive__isnull=True)
+        if options['election']:
+            elections = Election.objects.filter(id=options['election'])
+            if not elections.exists():
+                raise CommandError(f'Elección {options["election"]} no encontrada')
+            if elections.filter(archive__isnull=False).exists():
+                raise CommandError(f'Elección {options["election"]} archivada: sus votos no están en la tabla')
+
+        dry_run = options['check']
+        total_differences = 0
+
+        for election in elections:
+            differences = rebuild_tallies(election, dry_run=dry_run)
+            total_differences += len(differences)
+
+            for candidate_id, counted, real in differences:
+                self.stdout.write(
+                    f'{election.title}: candidato {candidate_id} contador={counted} real={real}'
+                )
+
+        if dry_run:
+            self.stdout.write(f'{total_differences} contador(es) con diferencias')
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ {total_differences} contador(es) corregido(s)'
+            ))
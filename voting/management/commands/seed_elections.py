@@ -0,0 +1,77 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from voting.models import Election
+from voting.provisioning import (
+    SEED_TITLE_PREFIX, clear_provisioned, is_local_database, seed_elections
+)
+
+
+class Command(BaseCommand):
+    """
+    Crea elecciones de ejemplo con votos sintéticos (reemplaza create_test_data.py).
+    Usa la base de datos de settings; misma --seed, mismos datos.
+    Si ya hay datos sembrados hay que pasar --reset (los ids chocarían).
+
+    Uso:
+        python manage.py seed_elections
+        python manage.py seed_elections --active 2 --closed 10 --votes 100000
+        python manage.py seed_elections --reset --seed 42
+        python manage.py seed_elections --clear        # solo borrar
+    """
+
+    help = 'Crea elecciones, candidatos y votos sintéticos de forma determinista'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--active', type=int, default=1, help='Elecciones activas')
+        parser.add_argument('--closed', type=int, default=1, help='Elecciones cerradas')
+        parser.add_argument('--candidates', type=int, default=3, help='Candidatos por elección')
+        parser.add_argument('--votes', type=int, default=135, help='Votos por elección')
+        parser.add_argument('--seed', type=int, default=0, help='Semilla')
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help=f'Borrar antes las elecciones "{SEED_TITLE_PREFIX} ..." existentes'
+        )
+        parser.add_argument('--clear', action='store_true', help='Solo borrar los datos sembrados')
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Permitir una base de datos que no es local (staging)'
+        )
+
+    def handle(self, *args, **options):
+        if not options['force'] and not is_local_database():
+            raise CommandError(
+                'Se escribirán datos: usar una base local o --force '
+                f'(HOST={connection.settings_dict.get("HOST")})'
+            )
+
+        if options['reset'] or options['clear']:
+            clear_provisioned(title_prefix=SEED_TITLE_PREFIX)
+            if options['clear']:
+                self.stdout.write(self.style.SUCCESS('✅ Datos sembrados eliminados'))
+                return
+        elif Election.objects.filter(title__startswith=SEED_TITLE_PREFIX).exists():
+            # Misma --seed, mismos ids: fallaría a mitad de la siembra
+            raise CommandError(
+                f'Ya hay elecciones "{SEED_TITLE_PREFIX} ...": usar --reset para '
+                'reemplazarlas o --clear para borrarlas'
+            )
+
+        self.stdout.write('🔧 Creando datos de prueba...')
+        elections = seed_elections(
+            seed=options['seed'],
+            active=options['active'],
+            closed=options['closed'],
+            candidates=options['candidates'],
+            votes=options['votes']
+        )
+
+        for election in elections:
+            self.stdout.write(f'✅ {election.title} ({election.status}): {election.id}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n📊 {len(elections)} elección(es), {options["candidates"]} candidatos y '
+            f'{options["votes"]} votos por elección'
+        ))
@@ -0,0 +1,107 @@
+# Generated by Django 4.2.16 on 2026-10-18 08:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Candidate',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('photo_url', models.URLField(blank=True, max_length=500, null=True)),
+                ('party_group', models.CharField(blank=True, max_length=255, null=True)),
+                ('display_order', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'candidates',
+                'ordering': ['display_order', 'name'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Election',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('start_date', models.DateTimeField()),
+                ('end_date', models.DateTimeField()),
+                ('status', models.CharField(choices=[('draft', 'Borrador'), ('active', 'Activa'), ('closed', 'Cerrada')], default='draft', max_length=10)),
+                ('results_public', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'elections',
+                'ordering': ['-created_at'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('email', models.EmailField(max_length=255, unique=True)),
+                ('password', models.CharField(max_length=255)),
+                ('full_name', models.CharField(max_length=255)),
+                ('role', models.CharField(choices=[('voter', 'Votante'), ('admin', 'Administrador')], default='voter', max_length=10)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'users',
+                'ordering': ['-created_at'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Vote',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('cast_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'votes',
+                'ordering': ['-cast_at'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='VoteRegistry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('has_voted', models.BooleanField(default=False)),
+                ('voted_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'vote_registry',
+                'ordering': ['-voted_at'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='VoteTally',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('votes', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('candidate', models.ForeignKey(db_column='candidate_id', on_delete=django.db.models.deletion.CASCADE, related_name='tallies', to='voting.candidate')),
+                ('election', models.ForeignKey(db_column='election_id', on_delete=django.db.models.deletion.CASCADE, related_name='tallies', to='voting.election')),
+            ],
+            options={
+                'db_table': 'vote_tallies',
+                'unique_together': {('election', 'candidate')},
+            },
+        ),
+    ]
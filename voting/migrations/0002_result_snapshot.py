@@ -0,0 +1,29 @@
+# Generated by Django 4.2.16 on 2026-10-18 08:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voting', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultSnapshot',
+            fields=[
+                ('election', models.OneToOneField(db_column='election_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='result_snapshot', serialize=False, to='voting.election')),
+                ('total_votes', models.PositiveIntegerField()),
+                ('winner', models.CharField(blank=True, max_length=255, null=True)),
+                ('payload', models.JSONField()),
+                ('etag', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'result_snapshots',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voting', '0002_result_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ElectionArchive',
+            fields=[
+                ('election', models.OneToOneField(db_column='election_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archive', serialize=False, to='voting.election')),
+                ('file_name', models.CharField(max_length=255)),
+                ('sha256', models.CharField(max_length=64)),
+                ('size_bytes', models.BigIntegerField()),
+                ('votes_count', models.PositiveIntegerField()),
+                ('registry_count', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'election_archives',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voting', '0003_election_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenVersion',
+            fields=[
+                ('user_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'token_versions',
+            },
+        ),
+    ]
@@ -38,6 +38,11 @@ class User(models.Model):
     def __str__(self):
         return f"{self.email} ({self.role})"
 
+    def save(self, *args, **kwargs):
+        """Email en minúsculas: login e importación lo buscan por igualdad (índice UNIQUE)"""
+        self.email = self.email.lower()
+        super().save(*args, **kwargs)
+
     def set_password(self, raw_password):
         """Hashea y guarda password"""
         self.password = make_password(raw_password)
@@ -51,6 +56,15 @@ class User(models.Model):
         """Verifica si usuario es administrador"""
         return self.role == 'admin'
 
+    @property
+    def is_authenticated(self):
+        """Requerido por DRF (IsAuthenticated)"""
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
+
 
 # ============================================
 # MODELO: ELECTION
@@ -210,3 +224,139 @@ class Vote(models.Model):
 
     def __str__(self):
         return f"Voto para {self.candidate.name} en {self.election.title}"
+
+
+# ============================================
+# MODELO: VOTE TALLY
+# Tabla 'vote_tallies' gestionada por Django
+# Contadores materializados de votos por candidato
+# ============================================
+
+class VoteTally(models.Model):
+    """
+    Contador materializado de votos por candidato.
+
+    Se incrementa dentro de la misma transacción que crea el Vote,
+    de modo que los resultados se leen en O(#candidatos) sin
+    agregar toda la tabla 'votes'. Se reconstruye con
+    `python manage.py rebuild_tallies`.
+    """
+
+    election = models.ForeignKey(
+        Election,
+        on_delete=models.CASCADE,
+        related_name='tallies',
+        db_column='election_id'
+    )
+    candidate = models.ForeignKey(
+        Candidate,
+        on_delete=models.CASCADE,
+        related_name='tallies',
+        db_column='candidate_id'
+    )
+    votes = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'vote_tallies'
+        unique_together = [['election', 'candidate']]  # Un contador por candidato
+
+    def __str__(self):
+        return f"{self.candidate.name} - {self.votes} votos"
+
+
+# ============================================
+# MODELO: RESULT SNAPSHOT
+# Tabla 'result_snapshots' gestionada por Django
+# Resultados finales congelados al cerrar una elección
+# ============================================
+
+class ResultSnapshot(models.Model):
+    """
+    Resultados finales inmutables de una elección cerrada.
+
+    `payload` guarda la respuesta completa de /api/results/{id}/ y
+    `etag` su hash, para servir elecciones cerradas sin recalcular.
+    """
+
+    election = models.OneToOneField(
+        Election,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='result_snapshot',
+        db_column='election_id'
+    )
+    total_votes = models.PositiveIntegerField()
+    winner = models.CharField(max_length=255, blank=True, null=True)
+    payload = models.JSONField()
+    etag = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'result_snapshots'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Resultados finales de {self.election.title}"
+
+
+# ============================================
+# MODELO: ELECTION ARCHIVE
+# Tabla 'election_archives' gestionada por Django
+# Votos y registro de una elección cerrada movidos a disco
+# ============================================
+
+class ElectionArchive(models.Model):
+    """
+    Archivo frío de una elección cerrada (ver archive.py).
+
+    Sus filas de 'votes' y 'vote_registry' se movieron a un archivo
+    comprimido en ARCHIVE_DIR; `sha256` permite verificarlo antes de
+    restaurarlo. Los resultados se siguen sirviendo del snapshot.
+    """
+
+    election = models.OneToOneField(
+        Election,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='archive',
+        db_column='election_id'
+    )
+    file_name = models.CharField(max_length=255)  # Relativo a ARCHIVE_DIR
+    sha256 = models.CharField(max_length=64)
+    size_bytes = models.BigIntegerField()
+    votes_count = models.PositiveIntegerField()
+    registry_count = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'election_archives'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Archivo de {self.election.title}"
+
+
+# ============================================
+# MODELO: TOKEN VERSION
+# Tabla 'token_versions' gestionada por Django
+# Revocación de JWT por usuario (ver authentication.py)
+# ============================================
+
+class TokenVersion(models.Model):
+    """
+    Versión vigente de los tokens de un usuario.
+
+    Los tokens con claim 'tv' menor están revocados. Sin FK a 'users':
+    la revocación debe sobrevivir al borrado del usuario.
+    """
+
+    user_id = models.UUIDField(primary_key=True)
+    version = models.BigIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'token_versions'
+
+    def __str__(self):
+        return f"Tokens de {self.user_id}: versión {self.version}"
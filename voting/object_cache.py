@@ -0,0 +1,253 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import Http404
+
+from .models import Candidate, Election
+from .pagination import CANDIDATE_ORDERING
+from .routers import primary_reads
+from .versions import get_catalog_version
+
+# ============================================
+# CACHE-ASIDE DE ELECCIONES Y CANDIDATOS
+#
+# Dos niveles:
+# 1. LRU local del proceso (OBJECT_CACHE_MAX_ENTRIES entradas,
+#    vigencia OBJECT_CACHE_LOCAL_TTL segundos)
+# 2. Cache compartido opcional de Django (OBJECT_CACHE_SHARED_ALIAS);
+#    las llaves incluyen la versión del catálogo, así que editar una
+#    elección/candidato invalida todo el nivel compartido de una vez.
+#
+# Las señales de Election/Candidate (admin y acciones) vacían el LRU
+# local al confirmar; otros procesos lo ven al vencer su TTL.
+# ============================================
+
+
+class LRUCache:
+    """LRU con vigencia por entrada, seguro entre threads."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False, None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return False, None
+
+            self.entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class ObjectCache:
+    """Cache-aside de dos niveles con contadores de aciertos/fallos."""
+
+    def __init__(self):
+        self.local = LRUCache(
+            settings.OBJECT_CACHE_MAX_ENTRIES,
+            settings.OBJECT_CACHE_LOCAL_TTL
+        )
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.reset_stats()
+
+    @property
+    def shared(self):
+        alias = settings.OBJECT_CACHE_SHARED_ALIAS
+        return caches[alias] if alias else None
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def get_or_load(self, key, loader):
+        found, value = self.local.get(key)
+        if found:
+            self.count('local_hits')
+            return value
+
+        shared = self.shared
+        if shared is not None:
+            shared_key = f'voting:objects:{get_catalog_version()}:{key}'
+            value = shared.get(shared_key)
+            if value is not None:
+                self.count('shared_hits')
+                self.local.set(key, value)
+                return value
+
+        self.count('misses')
+        # La réplica podría ir atrasada y el valor quedaría cacheado
+        with primary_reads():
+            value = loader()
+        self.local.set(key, value)
+        if shared is not None:
+            shared.set(shared_key, value, settings.OBJECT_CACHE_SHARED_TTL)
+        return value
+
+    def invalidate(self):
+        """Vaciar el nivel local (el compartido cambia de versión)."""
+        self.local.clear()
+        self.count('invalidations')
+
+    def reset_stats(self):
+        with self.lock:
+            self.counters = dict.fromkeys(
+                ['local_hits', 'shared_hits', 'misses', 'invalidations'], 0
+            )
+
+    def stats(self):
+        with self.lock:
+            counters = dict(self.counters)
+        lookups = counters['local_hits'] + counters['shared_hits'] + counters['misses']
+        hits = lookups - counters['misses']
+        counters['hit_ratio'] = round(hits / lookups, 4) if lookups else None
+        counters['local_entries'] = len(self.local.entries)
+        return counters
+
+
+object_cache = ObjectCache()
+
+
+# ============================================
+# LECTURAS CACHEADAS
+# Los valores "no existe" se guardan como False para no
+# consultar la BD en cada petición con un id inválido.
+# ============================================
+
+def _first_or_false(queryset):
+    return queryset.first() or False
+
+
+def _normalize_id(value):
+    """UUID canónico como string, o None si no es válido"""
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return None
+
+
+def get_election(election_id):
+    """Election o None"""
+    election_id = _normalize_id(election_id)
+    if election_id is None:
+        return None
+
+    return object_cache.get_or_load(
+        f'election:{election_id}',
+        lambda: _first_or_false(Election.objects.filter(id=election_id))
+    ) or None
+
+
+def get_candidate(candidate_id):
+    """Candidate (con su elección) o None"""
+    candidate_id = _normalize_id(candidate_id)
+    if candidate_id is None:
+        return None
+
+    return object_cache.get_or_load(
+        f'candidate:{candidate_id}',
+        lambda: _first_or_false(
+            Candidate.objects.select_related('election').filter(id=candidate_id)
+        )
+    ) or None
+
+
+def get_election_or_404(election_id):
+    election = get_election(election_id)
+    if election is None:
+        raise Http404
+    return election
+
+
+def get_candidate_or_404(candidate_id):
+    candidate = get_candidate(candidate_id)
+    if candidate is None:
+        raise Http404
+    return candidate
+
+
+def active_election_ids():
+    """ids (str) de las elecciones activas"""
+    return object_cache.get_or_load(
+        'elections:active',
+        lambda: [
+            str(election_id)
+            for election_id in Election.objects.filter(status='active').values_list('id', flat=True)
+        ]
+    )
+
+
+# ============================================
+# LISTADOS
+# Querysets sin cache: la paginación por llave (ver pagination.py) lee
+# de la base solo la página pedida, y el ETag del catálogo evita
+# repetirla a quien ya la tiene.
+# ============================================
+
+def list_elections(status=None):
+    """Elecciones, opcionalmente por status"""
+    queryset = Election.objects.all()
+    if status:
+        queryset = queryset.filter(status=status)
+    return queryset
+
+
+def list_candidates(election_id=None):
+    """
+    Candidatos con su elección (election_title sin consultas extra),
+    opcionalmente de una elección.
+    """
+    queryset = Candidate.objects.select_related('election')
+    if election_id:
+        election_id = _normalize_id(election_id)
+        if election_id is None:
+            return queryset.none()
+        queryset = queryset.filter(election_id=election_id)
+    return queryset
+
+
+def get_ballot(election_id):
+    """
+    (elección, candidatos) para la página de votación, o None.
+    Una sola consulta: los candidatos traen su elección; solo una
+    elección sin candidatos necesita consultarse aparte.
+    """
+    election_id = _normalize_id(election_id)
+    if election_id is None:
+        return None
+
+    def load():
+        candidates = list(
+            Candidate.objects.select_related('election')
+            .filter(election_id=election_id)
+            .order_by(*CANDIDATE_ORDERING)
+        )
+        election = candidates[0].election if candidates else _first_or_false(
+            Election.objects.filter(id=election_id)
+        )
+        return (election, candidates) if election else False
+
+    return object_cache.get_or_load(f'ballot:{election_id}', load) or None
@@ -0,0 +1,132 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+# ============================================
+# PAGINACIÓN POR LLAVE (KEYSET)
+#
+# El cursor guarda la llave (campos de `ordering`) del último (o
+# primer) elemento de la página y la siguiente se pide a la base con
+# WHERE (llave) > (cursor) ORDER BY llave LIMIT page_size + 1: usa el
+# índice de la llave, el costo no depende de la profundidad, y un
+# elemento nuevo no desplaza las páginas siguientes como con OFFSET.
+#
+# A diferencia de CursorPagination (ver HistoryPagination) se compara
+# la llave completa: los empates del primer campo (ej. display_order)
+# no se resuelven con OFFSET.
+# ============================================
+
+# Más recientes primero / orden de la boleta. Todos los campos en el
+# mismo sentido y el último único.
+ELECTION_ORDERING = ('-created_at', '-id')
+CANDIDATE_ORDERING = ('display_order', 'name', 'id')
+
+
+def _reversed(ordering):
+    return [name[1:] if name.startswith('-') else f'-{name}' for name in ordering]
+
+
+class KeysetPagination(BasePagination):
+    """
+    Respuesta con el mismo formato que CursorPagination:
+    {"next": url | null, "previous": url | null, "results": [...]}
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    ordering = ()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.fields = [queryset.model._meta.get_field(name.lstrip('-')) for name in self.ordering]
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor['r']
+
+        ordering = _reversed(self.ordering) if reverse else self.ordering
+        if cursor is not None:
+            queryset = self.after(queryset, cursor['k'], descending=ordering[0].startswith('-'))
+
+        # Un elemento extra indica si hay más páginas en ese sentido
+        items = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        more = len(items) > self.page_size
+        items = items[:self.page_size]
+
+        if reverse:
+            # Página anterior: los page_size elementos antes de la llave
+            items.reverse()
+            self.has_next = True
+            self.has_previous = more
+        else:
+            self.has_next = more
+            self.has_previous = cursor is not None
+
+        self.page = items
+        return items
+
+    def after(self, queryset, values, descending):
+        """Elementos posteriores a la llave: comparación de filas (a, b) > (x, y)"""
+        connection = connections[queryset.db]
+        quote = connection.ops.quote_name
+        table = quote(queryset.model._meta.db_table)
+        columns = ', '.join(f'{table}.{quote(field.column)}' for field in self.fields)
+        params = [field.get_db_prep_value(value, connection) for field, value in zip(self.fields, values)]
+        operator = '<' if descending else '>'
+        return queryset.extra(
+            where=[f'({columns}) {operator} ({", ".join(["%s"] * len(params))})'],
+            params=params
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            values = cursor['k']
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError
+            return {
+                'k': [field.to_python(value) for field, value in zip(self.fields, values)],
+                'r': bool(cursor['r'])
+            }
+        except (binascii.Error, ValueError, TypeError, KeyError, ValidationError):
+            raise NotFound('Cursor inválido')
+
+    def encode_cursor(self, item, reverse):
+        values = [field.value_to_string(item) for field in self.fields]
+        cursor = json.dumps({'k': values, 'r': reverse}, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(cursor.encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data
+        })
+
+
+class ElectionPagination(KeysetPagination):
+    ordering = ELECTION_ORDERING
+
+
+class CandidatePagination(KeysetPagination):
+    ordering = CANDIDATE_ORDERING
@@ -0,0 +1,320 @@
+import uuid
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .models import Election, Vote, VoteRegistry
+
+# ============================================
+# PARTICIONES POR ELECCIÓN (PostgreSQL)
+#
+# votes y vote_registry pueden convertirse en tablas particionadas por
+# LIST (election_id) con `partition_votes --apply`: cada elección tiene
+# su partición ({tabla}_p_{uuid hex}) y lo que no tenga va a
+# {tabla}_default. Las consultas de una elección (resultados,
+# reconstrucción de contadores, exportación) solo recorren su partición.
+#
+# Al activar una elección se crea (o vuelve a adjuntar) su partición,
+# moviendo las filas que hubieran caído en la default. Con
+# VOTES_DETACH_ON_CLOSE la partición se separa al cerrarla: sus votos
+# dejan de estar en la tabla viva y archivarlos (ver archive.py) termina
+# en un DROP TABLE en vez de un DELETE masivo.
+#
+# Mientras las tablas no estén particionadas todo esto no hace nada.
+# ============================================
+
+PARTITIONED_MODELS = [Vote, VoteRegistry]
+PARTITION_KEY = 'election_id'
+
+
+def partition_name(table, election_id):
+    return f'{table}_p_{uuid.UUID(str(election_id)).hex}'
+
+
+def default_partition_name(table):
+    return f'{table}_default'
+
+
+def is_partitioned(table, using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT 1 FROM pg_partitioned_table pt
+            JOIN pg_class c ON c.oid = pt.partrelid
+            WHERE c.relname = %s AND pg_catalog.pg_table_is_visible(c.oid)
+            """,
+            [table]
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(table, using=DEFAULT_DB_ALIAS):
+    """[(partición, límites)] adjuntas a la tabla"""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+            FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            WHERE parent.relname = %s AND pg_catalog.pg_table_is_visible(parent.oid)
+            ORDER BY child.relname
+            """,
+            [table]
+        )
+        return cursor.fetchall()
+
+
+def _is_attached(cursor, partition):
+    cursor.execute(
+        """
+        SELECT 1 FROM pg_inherits i
+        JOIN pg_class child ON child.oid = i.inhrelid
+        WHERE child.relname = %s AND pg_catalog.pg_table_is_visible(child.oid)
+        """,
+        [partition]
+    )
+    return cursor.fetchone() is not None
+
+
+# ============================================
+# CICLO DE VIDA DE LA ELECCIÓN
+# ============================================
+
+def attach_partitions(election_id, using=DEFAULT_DB_ALIAS):
+    """
+    Crea o vuelve a adjuntar las particiones de la elección. Las filas
+    de la elección que estén en la partición default se mueven a la
+    suya (ej. elecciones creadas antes de particionar).
+    Retorna las particiones adjuntadas.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    attached = []
+
+    for model in PARTITIONED_MODELS:
+        table = model._meta.db_table
+        if not is_partitioned(table, using):
+            continue
+
+        partition = partition_name(table, election_id)
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            if _is_attached(cursor, partition):
+                continue
+
+            # Las FK diferidas pendientes impiden modificar la tabla
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            # Sin inserciones concurrentes hasta adjuntar (solo dura el movimiento)
+            cursor.execute(f'LOCK TABLE {quote(table)} IN SHARE ROW EXCLUSIVE MODE')
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {quote(partition)} '
+                f'(LIKE {quote(table)} INCLUDING DEFAULTS)'
+            )
+            cursor.execute(
+                f'WITH moved AS ('
+                f'DELETE FROM {quote(default_partition_name(table))} '
+                f'WHERE {PARTITION_KEY} = %s RETURNING *'
+                f') INSERT INTO {quote(partition)} SELECT * FROM moved',
+                [election_id]
+            )
+            cursor.execute(
+                f'ALTER TABLE {quote(table)} ATTACH PARTITION {quote(partition)} '
+                f"FOR VALUES IN ('{uuid.UUID(str(election_id))}')"
+            )
+        attached.append(partition)
+
+    return attached
+
+
+def detach_partitions(election_id, using=DEFAULT_DB_ALIAS):
+    """
+    Separa las particiones de la elección: quedan como tablas sueltas
+    con sus filas, fuera de votes/vote_registry.
+    Retorna las particiones separadas.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    detached = []
+
+    for model in PARTITIONED_MODELS:
+        table = model._meta.db_table
+        if not is_partitioned(table, using):
+            continue
+
+        partition = partition_name(table, election_id)
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            if not _is_attached(cursor, partition):
+                continue
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            cursor.execute(f'ALTER TABLE {quote(table)} DETACH PARTITION {quote(partition)}')
+        detached.append(partition)
+
+    return detached
+
+
+def _table_exists(cursor, table):
+    cursor.execute(
+        "SELECT 1 FROM pg_class WHERE relname = %s AND relkind = 'r' "
+        "AND pg_catalog.pg_table_is_visible(oid)",
+        [table]
+    )
+    return cursor.fetchone() is not None
+
+
+def detached_partition(table, election_id, using=DEFAULT_DB_ALIAS):
+    """Nombre de la partición separada de la elección, o None"""
+    if not is_partitioned(table, using):
+        return None
+
+    partition = partition_name(table, election_id)
+    with connections[using].cursor() as cursor:
+        if _table_exists(cursor, partition) and not _is_attached(cursor, partition):
+            return partition
+    return None
+
+
+def drop_partitions(election_id, using=DEFAULT_DB_ALIAS):
+    """
+    Borra las particiones de la elección (adjuntas o separadas) con sus
+    filas. Retorna {tabla: filas borradas} de las que existían.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    dropped = {}
+
+    for model in PARTITIONED_MODELS:
+        table = model._meta.db_table
+        if not is_partitioned(table, using):
+            continue
+
+        partition = partition_name(table, election_id)
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            if not _table_exists(cursor, partition):
+                continue
+            cursor.execute(f'SELECT count(*) FROM {quote(partition)}')
+            dropped[table] = cursor.fetchone()[0]
+            if _is_attached(cursor, partition):
+                cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+                cursor.execute(f'ALTER TABLE {quote(table)} DETACH PARTITION {quote(partition)}')
+            cursor.execute(f'DROP TABLE {quote(partition)}')
+
+    return dropped
+
+
+# ============================================
+# CONVERSIÓN DE LAS TABLAS EXISTENTES
+# ============================================
+
+def _table_definitions(cursor, table):
+    """(constraints [(nombre, tipo, definición)], índices sueltos [definición])"""
+    cursor.execute(
+        """
+        SELECT con.conname, con.contype, pg_get_constraintdef(con.oid)
+        FROM pg_constraint con
+        JOIN pg_class c ON c.oid = con.conrelid
+        WHERE c.relname = %s AND pg_catalog.pg_table_is_visible(c.oid)
+        ORDER BY con.contype DESC, con.conname
+        """,
+        [table]
+    )
+    constraints = cursor.fetchall()
+
+    cursor.execute(
+        """
+        SELECT pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indrelid
+        WHERE c.relname = %s AND pg_catalog.pg_table_is_visible(c.oid)
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint con WHERE con.conindid = i.indexrelid)
+        ORDER BY 1
+        """,
+        [table]
+    )
+    indexes = [row[0] for row in cursor.fetchall()]
+    return constraints, indexes
+
+
+def _referencing_constraints(cursor, table):
+    cursor.execute(
+        """
+        SELECT con.conname, src.relname
+        FROM pg_constraint con
+        JOIN pg_class src ON src.oid = con.conrelid
+        JOIN pg_class dst ON dst.oid = con.confrelid
+        WHERE con.contype = 'f' AND dst.relname = %s
+          AND pg_catalog.pg_table_is_visible(dst.oid)
+        """,
+        [table]
+    )
+    return cursor.fetchall()
+
+
+def _with_partition_key(definition):
+    """PRIMARY KEY/UNIQUE (cols) -> incluye election_id (requisito de PostgreSQL)"""
+    head, _, rest = definition.partition('(')
+    columns, _, tail = rest.partition(')')
+    names = [name.strip() for name in columns.split(',')]
+    if PARTITION_KEY in names:
+        return definition
+    return f'{head}({columns}, {PARTITION_KEY}){tail}'
+
+
+def conversion_sql(using=DEFAULT_DB_ALIAS):
+    """
+    Sentencias para convertir votes y vote_registry en tablas
+    particionadas con una partición por elección existente, conservando
+    datos, constraints e índices. Todo en una transacción.
+
+    Lanza ValueError si no se puede convertir.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        raise ValueError('El particionamiento requiere PostgreSQL')
+
+    quote = connection.ops.quote_name
+    election_ids = list(Election.objects.using(using).order_by('created_at').values_list('id', flat=True))
+    statements = ['SET CONSTRAINTS ALL IMMEDIATE']
+
+    with connection.cursor() as cursor:
+        for model in PARTITIONED_MODELS:
+            table = model._meta.db_table
+            if is_partitioned(table, using):
+                continue
+
+            referencing = _referencing_constraints(cursor, table)
+            if referencing:
+                names = ', '.join(f'{source}.{name}' for name, source in referencing)
+                raise ValueError(f'{table} es referenciada por otras tablas ({names})')
+
+            constraints, indexes = _table_definitions(cursor, table)
+            new_table = f'{table}_partitioned'
+
+            statements.append(
+                f'CREATE TABLE {quote(new_table)} (LIKE {quote(table)} INCLUDING DEFAULTS) '
+                f'PARTITION BY LIST ({PARTITION_KEY})'
+            )
+            statements.append(
+                f'CREATE TABLE {quote(default_partition_name(table))} '
+                f'PARTITION OF {quote(new_table)} DEFAULT'
+            )
+            for election_id in election_ids:
+                statements.append(
+                    f'CREATE TABLE {quote(partition_name(table, election_id))} '
+                    f"PARTITION OF {quote(new_table)} FOR VALUES IN ('{election_id}')"
+                )
+            statements.append(f'INSERT INTO {quote(new_table)} SELECT * FROM {quote(table)}')
+            statements.append(f'DROP TABLE {quote(table)}')
+            statements.append(f'ALTER TABLE {quote(new_table)} RENAME TO {quote(table)}')
+
+            # Los nombres quedaron libres al borrar la tabla original
+            for name, kind, definition in constraints:
+                if kind in ('p', 'u'):
+                    definition = _with_partition_key(definition)
+                statements.append(
+                    f'ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}'
+                )
+            statements.extend(indexes)
+
+    return statements
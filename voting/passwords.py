@@ -0,0 +1,188 @@
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import hashers
+
+# ============================================
+# HASHING DE PASSWORDS FUERA DEL WORKER
+#
+# Al abrir una elección miles de votantes hacen login a la vez y el CPU
+# se satura calculando PBKDF2 dentro de los workers de gunicorn. Aquí el
+# hash se calcula en un pool de procesos acotado:
+# - PASSWORD_HASH_WORKERS procesos por worker (0 = en el mismo thread)
+# - como máximo PASSWORD_HASH_MAX_PENDING hashes en curso o en cola
+#   (0 = sin límite); si está lleno se lanza HashingBusy y la vista
+#   responde 429. Un hash que excede PASSWORD_HASH_TIMEOUT sigue
+#   ocupando su lugar hasta que termina
+# - si el hash guardado usa otro hasher/parámetros que los configurados
+#   (PASSWORD_HASHERS), al hacer login se recalcula ("rehash")
+# ============================================
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 con iteraciones configurables (PASSWORD_HASH_ITERATIONS)."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS or hashers.PBKDF2PasswordHasher.iterations
+
+
+class HashingBusy(Exception):
+    """El pool de hashing está lleno; reintentar más tarde."""
+
+
+def _init_worker():
+    # Con 'spawn' el proceso hijo no hereda la configuración de Django
+    if not apps.ready:
+        django.setup()
+
+
+def _verify(password, encoded):
+    """En el proceso del pool: (válido, hash nuevo o None, ms)"""
+    started = time.perf_counter()
+    rehashed = []
+    valid = hashers.check_password(
+        password,
+        encoded,
+        setter=lambda raw: rehashed.append(hashers.make_password(raw))
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    return valid, (rehashed[0] if rehashed else None), elapsed
+
+
+def _make(password):
+    started = time.perf_counter()
+    encoded = hashers.make_password(password)
+    return encoded, (time.perf_counter() - started) * 1000
+
+
+class HashingPool:
+    """Pool acotado con contadores para /api/metrics/."""
+
+    def __init__(self, workers, max_pending):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.slots = threading.BoundedSemaphore(max_pending) if max_pending else None
+        self.executor = None
+        self.lock = threading.Lock()
+        self.counters = dict.fromkeys(
+            ['hashes', 'rejected', 'rehashed', 'pending', 'hash_ms_total', 'hash_ms_max',
+             'wait_ms_total'], 0
+        )
+
+    def get_executor(self):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_worker
+                )
+            return self.executor
+
+    def release(self, *args):
+        self.count(pending=-1)
+        if self.slots is not None:
+            self.slots.release()
+
+    def run(self, func, *args):
+        """Ejecuta func(*args) -> (..., ms) en el pool; lanza HashingBusy si está lleno."""
+        if self.slots is not None and not self.slots.acquire(blocking=False):
+            self.count(rejected=1)
+            raise HashingBusy
+
+        started = time.perf_counter()
+        self.count(pending=1)
+        if self.workers:
+            try:
+                future = self.get_executor().submit(func, *args)
+            except Exception:
+                self.release()
+                raise
+            # El lugar se libera cuando el proceso termina el hash, aunque
+            # la petición haya dejado de esperarlo
+            future.add_done_callback(self.release)
+            try:
+                result = future.result(timeout=settings.PASSWORD_HASH_TIMEOUT)
+            except FuturesTimeout:
+                future.cancel()  # Si aún no empezó
+                self.count(rejected=1)
+                raise HashingBusy
+        else:
+            try:
+                result = func(*args)
+            finally:
+                self.release()
+
+        *value, hash_ms = result
+        total_ms = (time.perf_counter() - started) * 1000
+        with self.lock:
+            self.counters['hashes'] += 1
+            self.counters['hash_ms_total'] += hash_ms
+            self.counters['hash_ms_max'] = max(self.counters['hash_ms_max'], hash_ms)
+            self.counters['wait_ms_total'] += max(total_ms - hash_ms, 0)
+        return value[0] if len(value) == 1 else tuple(value)
+
+    def count(self, **deltas):
+        with self.lock:
+            for name, delta in deltas.items():
+                self.counters[name] += delta
+
+    def stats(self):
+        with self.lock:
+            counters = dict(self.counters)
+        hashes = counters.pop('hashes')
+        hash_total = counters.pop('hash_ms_total')
+        wait_total = counters.pop('wait_ms_total')
+        return {
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'hashes': hashes,
+            'rejected': counters['rejected'],
+            'rehashed': counters['rehashed'],
+            'pending': counters['pending'],
+            'hash_ms_mean': round(hash_total / hashes, 2) if hashes else None,
+            'hash_ms_max': round(counters['hash_ms_max'], 2),
+            'queue_wait_ms_mean': round(wait_total / hashes, 2) if hashes else None,
+        }
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool():
+    """Pool del proceso; se recrea si cambia la configuración."""
+    global _pool
+    with _pool_lock:
+        config = (settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+        if _pool is None or (_pool.workers, _pool.max_pending) != config:
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = HashingPool(*config)
+        return _pool
+
+
+def verify_password(password, encoded):
+    """
+    (válido, hash nuevo o None). El hash nuevo se debe guardar: el
+    guardado usa un hasher o parámetros distintos a los configurados.
+    """
+    pool = get_hashing_pool()
+    valid, rehashed = pool.run(_verify, password, encoded)
+    if rehashed:
+        pool.count(rehashed=1)
+    return valid, rehashed
+
+
+def hash_password(password):
+    return get_hashing_pool().run(_make, password)
@@ -0,0 +1,17 @@
+from rest_framework.permissions import BasePermission
+
+# ============================================
+# PERMISOS
+# ============================================
+
+
+class IsAdminRole(BasePermission):
+    """Permite acceso solo a usuarios autenticados con role 'admin'."""
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(
+            user and
+            getattr(user, 'is_authenticated', False) and
+            getattr(user, 'is_admin', False)
+        )
@@ -0,0 +1,286 @@
+import random
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import User, Election, Candidate, Vote, VoteRegistry, VoteTally, ResultSnapshot
+from .snapshots import snapshot_results
+from .versions import bump_catalog_version
+
+# ============================================
+# APROVISIONAMIENTO MASIVO DE DATOS
+#
+# Crea usuarios, elecciones, candidatos y distribuciones sintéticas de
+# votos a gran escala (COPY en PostgreSQL, executemany en otros motores).
+# Todo sale de un random.Random: la misma semilla genera los mismos ids
+# y votos, así staging y benchmark tienen datos reproducibles.
+#
+# Los contadores (vote_tallies) se escriben con los conteos ya
+# calculados, y las elecciones cerradas quedan con su snapshot.
+# ============================================
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def seeded_uuid(rng):
+    """UUID4 determinista a partir del generador"""
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def is_local_database():
+    if connection.vendor == 'sqlite':
+        return True
+    host = connection.settings_dict.get('HOST') or ''
+    return host in ('', 'localhost', '127.0.0.1', '::1') or host.startswith('/')
+
+
+def bulk_insert(model, fields, rows, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Inserta tuplas (en el orden de `fields`, nombres de atributo) sin
+    cargar todo en memoria. PostgreSQL: COPY; otros: executemany por lotes.
+    Los valores se insertan tal cual (auto_now_add no los reemplaza).
+    """
+    model_fields = [model._meta.get_field(field) for field in fields]
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in model_fields)
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            with cursor.cursor.copy(f'COPY {table} ({columns}) FROM STDIN') as copy:
+                for row in rows:
+                    copy.write_row(row)
+            return
+
+        sql = f'INSERT INTO {table} ({columns}) VALUES ({", ".join(["%s"] * len(fields))})'
+        batch = []
+        for row in rows:
+            batch.append([
+                field.get_db_prep_value(value, connection)
+                for field, value in zip(model_fields, row)
+            ])
+            if len(batch) >= batch_size:
+                cursor.executemany(sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+
+
+# ============================================
+# USUARIOS
+# ============================================
+
+def create_voters(rng, count, email_domain, password, full_name='Votante'):
+    """
+    Crea `count` votantes voter{i}@{email_domain}. Un solo hash para
+    todos: PBKDF2 por usuario tardaría más que el resto de la siembra.
+    Retorna [(id, email)].
+    """
+    encoded = make_password(password)
+    now = timezone.now()
+    voters = [(seeded_uuid(rng), f'voter{i}@{email_domain.lower()}') for i in range(count)]
+
+    bulk_insert(
+        User,
+        ['id', 'email', 'password', 'full_name', 'role', 'is_active', 'created_at'],
+        ((user_id, email, encoded, f'{full_name} {i}', 'voter', True, now)
+         for i, (user_id, email) in enumerate(voters))
+    )
+    return voters
+
+
+# ============================================
+# ELECCIONES
+# ============================================
+
+def provision_election(rng, title, candidates, status='active', votes=0, voters=(),
+                       weights=None, start_date=None, end_date=None, description=None):
+    """
+    Crea una elección con sus candidatos y `votes` votos anónimos
+    repartidos según `weights` (uno por candidato; None = uniforme).
+
+    `voters`: ids de usuarios marcados como votantes en vote_registry
+    (si hay más votantes que `votes`, se emite un voto por votante).
+
+    candidates: lista de dicts con name y opcionalmente description,
+    party_group y photo_url.
+    """
+    now = timezone.now()
+    start_date = start_date or now - timedelta(days=1)
+    end_date = end_date or now + timedelta(days=7)
+    votes = max(votes, len(voters))
+
+    with transaction.atomic():
+        election = Election.objects.create(
+            id=seeded_uuid(rng),
+            title=title,
+            description=description,
+            start_date=start_date,
+            end_date=end_date,
+            status=status,
+            results_public=True
+        )
+
+        candidate_objects = Candidate.objects.bulk_create([
+            Candidate(
+                id=seeded_uuid(rng),
+                election=election,
+                name=data['name'],
+                description=data.get('description'),
+                party_group=data.get('party_group'),
+                photo_url=data.get('photo_url'),
+                display_order=order
+            )
+            for order, data in enumerate(candidates, start=1)
+        ])
+        candidate_ids = [candidate.id for candidate in candidate_objects]
+
+        if voters:
+            bulk_insert(
+                VoteRegistry,
+                ['id', 'user_id', 'election_id', 'has_voted', 'voted_at'],
+                ((seeded_uuid(rng), user_id, election.id, True, now) for user_id in voters)
+            )
+
+        counts = insert_votes(rng, election, candidate_ids, votes, weights)
+
+        VoteTally.objects.bulk_create([
+            VoteTally(election=election, candidate_id=candidate_id, votes=counts.get(candidate_id, 0))
+            for candidate_id in candidate_ids
+        ])
+
+        if status == 'closed':
+            snapshot_results(election)
+
+    transaction.on_commit(bump_catalog_version)
+    return election
+
+
+def insert_votes(rng, election, candidate_ids, count, weights=None,
+                 batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Inserta `count` votos con cast_at uniforme en el periodo de la
+    elección (hasta ahora). Retorna {candidate_id: votos}.
+    """
+    if not count or not candidate_ids:
+        return Counter()
+
+    start = election.start_date
+    span = (min(election.end_date, timezone.now()) - start).total_seconds()
+    counts = Counter()
+
+    def rows():
+        remaining = count
+        while remaining:
+            size = min(batch_size, remaining)
+            remaining -= size
+            for candidate_id in rng.choices(candidate_ids, weights=weights, k=size):
+                counts[candidate_id] += 1
+                yield (
+                    seeded_uuid(rng),
+                    election.id,
+                    candidate_id,
+                    start + timedelta(seconds=rng.random() * span)
+                )
+
+    bulk_insert(Vote, ['id', 'election_id', 'candidate_id', 'cast_at'], rows(), batch_size)
+    return counts
+
+
+def clear_provisioned(title_prefix=None, email_domain=None):
+    """Elimina elecciones por prefijo de título y usuarios por dominio."""
+    if title_prefix:
+        elections = Election.objects.filter(title__startswith=title_prefix)
+        VoteRegistry.objects.filter(election__in=elections).delete()
+        Vote.objects.filter(election__in=elections).delete()
+        VoteTally.objects.filter(election__in=elections).delete()
+        ResultSnapshot.objects.filter(election__in=elections).delete()
+        Candidate.objects.filter(election__in=elections).delete()
+        elections.delete()
+
+    if email_domain:
+        users = User.objects.filter(email__endswith=f'@{email_domain}')
+        VoteRegistry.objects.filter(user__in=users).delete()
+        users.delete()
+
+    transaction.on_commit(bump_catalog_version)
+
+
+# ============================================
+# DATOS DE EJEMPLO (antes create_test_data.py)
+# ============================================
+
+SAMPLE_CANDIDATES = [
+    {
+        'name': 'Ana García Martínez',
+        'description': 'Estudiante de 4to año con experiencia en liderazgo estudiantil. Propuestas: mejora de instalaciones, eventos deportivos y culturales.',
+        'party_group': 'Movimiento Estudiantil Progresista',
+    },
+    {
+        'name': 'Carlos Rodríguez López',
+        'description': 'Representante de clase con enfoque en tecnología educativa. Propuestas: digitalización de procesos, aulas virtuales, becas tecnológicas.',
+        'party_group': 'Futuro Digital',
+    },
+    {
+        'name': 'María Fernández Ruiz',
+        'description': 'Delegada de año con experiencia en gestión comunitaria. Propuestas: espacios de estudio, tutorías gratuitas, bienestar estudiantil.',
+        'party_group': 'Unidos por la Educación',
+    },
+    {'name': 'Pedro Sánchez', 'party_group': 'Independiente'},
+    {'name': 'Laura González', 'party_group': 'Independiente'},
+    {'name': 'Miguel Torres', 'party_group': 'Independiente'},
+]
+
+SEED_TITLE_PREFIX = '[seed]'
+
+
+def sample_candidates(rng, count):
+    """`count` candidatos de ejemplo (se numeran si faltan nombres)"""
+    candidates = []
+    for i in range(count):
+        base = SAMPLE_CANDIDATES[i % len(SAMPLE_CANDIDATES)]
+        suffix = f' {i // len(SAMPLE_CANDIDATES) + 1}' if i >= len(SAMPLE_CANDIDATES) else ''
+        candidates.append({**base, 'name': base['name'] + suffix})
+    rng.shuffle(candidates)
+    return candidates
+
+
+def seed_elections(seed=0, active=1, closed=1, candidates=3, votes=135,
+                   title_prefix=SEED_TITLE_PREFIX):
+    """
+    Elecciones activas y cerradas con votos sintéticos (pesos aleatorios
+    por candidato). Retorna la lista de elecciones creadas.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    elections = []
+
+    for i in range(active):
+        elections.append(provision_election(
+            rng,
+            f'{title_prefix} Elección de Representante Estudiantil {i + 1}',
+            sample_candidates(rng, candidates),
+            status='active',
+            votes=votes,
+            weights=[rng.random() + 0.1 for _ in range(candidates)],
+            description='Votación para elegir al representante estudiantil del curso académico'
+        ))
+
+    for i in range(closed):
+        end_date = now - timedelta(days=7 * (i + 1))
+        elections.append(provision_election(
+            rng,
+            f'{title_prefix} Elección de Delegado de Curso {i + 1}',
+            sample_candidates(rng, candidates),
+            status='closed',
+            votes=votes,
+            weights=[rng.random() + 0.1 for _ in range(candidates)],
+            start_date=end_date - timedelta(days=7),
+            end_date=end_date,
+            description='Votación finalizada para elección de delegado del curso'
+        ))
+
+    return elections
@@ -0,0 +1,150 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# ============================================
+# RÉPLICA DE LECTURA
+#
+# Con DB_REPLICA_HOST (ver settings) existe el alias 'replica'. Las
+# vistas con ReplicaReadMixin (resultados, historial y listados del
+# catálogo) leen de ella; todo lo demás, y toda escritura, va a
+# 'default'. El cache de objetos (detalle de elección o candidato) se
+# llena leyendo del primario para no guardar datos atrasados.
+#
+# La réplica puede ir atrasada. Para que nadie vea su propio voto
+# "perdido", tras votar el usuario lee del primario durante
+# REPLICA_PIN_SECONDS. Con el mismo plazo se marcan las elecciones con
+# resultados recién cambiados (ver ResultsView), y tras un cambio del
+# catálogo sus listados vuelven a leer del primario.
+# ============================================
+
+REPLICA_ALIAS = 'replica'
+
+# Alias de lectura de la petición en curso (None = enrutamiento normal)
+_read_alias = ContextVar('voting_read_alias', default=None)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def user_pin_key(user_id):
+    return f'voting:primary-pin:user:{user_id}'
+
+
+def results_pin_key(election_id):
+    return f'voting:primary-pin:results:{election_id}'
+
+
+CATALOG_PIN_KEY = 'voting:primary-pin:catalog'
+
+
+def pin_user_to_primary(user_id):
+    """Las lecturas del usuario van al primario por REPLICA_PIN_SECONDS"""
+    if replica_configured():
+        cache.set(user_pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def pin_results(election_id):
+    """Marca que la réplica puede no tener aún los últimos votos"""
+    if replica_configured():
+        cache.set(results_pin_key(election_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def results_pinned(election_id):
+    return bool(cache.get(results_pin_key(election_id)))
+
+
+def pin_catalog():
+    """Marca que la réplica puede no tener aún el último catálogo"""
+    if replica_configured():
+        cache.set(CATALOG_PIN_KEY, True, settings.REPLICA_PIN_SECONDS)
+
+
+def catalog_pinned():
+    return bool(cache.get(CATALOG_PIN_KEY))
+
+
+def reading_from_replica():
+    return _read_alias.get() == REPLICA_ALIAS
+
+
+def route_reads(user, pinned=False):
+    """Enviar las lecturas de la petición a la réplica si corresponde"""
+    pinned = pinned or (user.is_authenticated and cache.get(user_pin_key(user.id)))
+    if replica_configured() and not pinned:
+        _read_alias.set(REPLICA_ALIAS)
+    else:
+        _read_alias.set(None)
+
+
+def reset_reads():
+    _read_alias.set(None)
+
+
+@contextmanager
+def primary_reads():
+    """Lecturas del bloque en el primario (ej. al llenar caches)"""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias and connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Dentro de una transacción se leen sus propios cambios
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplica y primario tienen los mismos datos
+        return True
+
+
+class ReplicaReadMixin:
+    """APIView (síncrona o async) cuyas lecturas pueden ir a la réplica"""
+
+    def primary_pinned(self):
+        """True para que la petición lea del primario"""
+        return False
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        route_reads(request.user, self.primary_pinned())
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self.async_dispatch(request, *args, **kwargs)
+
+        # También si la vista falla: el thread atiende otras peticiones
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            reset_reads()
+
+    async def async_dispatch(self, request, *args, **kwargs):
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        finally:
+            reset_reads()
+
+
+class CatalogReadMixin(ReplicaReadMixin):
+    """
+    Listados del catálogo: de la réplica, salvo durante
+    REPLICA_PIN_SECONDS tras un cambio. Así el ETag de versión nunca
+    queda asociado a una página atrasada.
+    """
+
+    def primary_pinned(self):
+        return catalog_pinned()
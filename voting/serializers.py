@@ -1,6 +1,36 @@
 from rest_framework import serializers
 from .models import User, Election, Candidate, VoteRegistry, Vote
-from django.contrib.auth.hashers import make_password
+from .object_cache import get_election, get_candidate
+from .passwords import hash_password
+
+# ============================================
+# CAMPOS A PEDIDO (?fields=)
+# ============================================
+
+class SparseFieldsMixin:
+    """
+    ?fields=id,title limita la respuesta a esos campos.
+    Solo aplica cuando el serializer recibe la petición en el contexto.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get('request')
+        fields = getattr(request, 'query_params', {}).get('fields')
+        if not fields:
+            return
+
+        requested = {name.strip() for name in fields.split(',') if name.strip()}
+        unknown = requested - set(self.fields)
+        if unknown:
+            raise serializers.ValidationError({
+                'fields': f'Campos desconocidos: {", ".join(sorted(unknown))}'
+            })
+
+        for name in set(self.fields) - requested:
+            self.fields.pop(name)
+
 
 # ============================================
 # SERIALIZER: USER
@@ -34,10 +64,11 @@ class RegisterSerializer(serializers.Serializer):
     full_name = serializers.CharField(required=True, max_length=255)
 
     def validate_email(self, value):
-        """Validar que email no exista"""
+        """Validar que email no exista (se guardan en minúsculas)"""
+        value = value.lower()
         if User.objects.filter(email=value).exists():
             raise serializers.ValidationError("Este email ya está registrado")
-        return value.lower()
+        return value
 
     def validate(self, data):
         """Validar que passwords coincidan"""
@@ -46,12 +77,12 @@ class RegisterSerializer(serializers.Serializer):
         return data
 
     def create(self, validated_data):
-        """Crear usuario con password hasheado"""
+        """Crear usuario con password hasheado (puede lanzar HashingBusy)"""
         validated_data.pop('password_confirm')
         user = User.objects.create(
             email=validated_data['email'],
             full_name=validated_data['full_name'],
-            password=make_password(validated_data['password']),
+            password=hash_password(validated_data['password']),
             role='voter',  # Por defecto es votante
             is_active=True
         )
@@ -70,12 +101,15 @@ class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField(required=True)
     password = serializers.CharField(write_only=True, required=True)
 
+    def validate_email(self, value):
+        return value.lower()
+
 
 # ============================================
 # SERIALIZER: ELECTION
 # ============================================
 
-class ElectionSerializer(serializers.ModelSerializer):
+class ElectionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer para modelo Election.
     """
@@ -95,7 +129,7 @@ class ElectionSerializer(serializers.ModelSerializer):
 # SERIALIZER: CANDIDATE
 # ============================================
 
-class CandidateSerializer(serializers.ModelSerializer):
+class CandidateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer para modelo Candidate.
     """
@@ -156,19 +190,17 @@ class CastVoteSerializer(serializers.Serializer):
     candidate_id = serializers.UUIDField(required=True)
 
     def validate(self, data):
-        """Validar que elección y candidato existan"""
-        try:
-            election = Election.objects.get(id=data['election_id'])
-        except Election.DoesNotExist:
+        """Validar que elección y candidato existan (desde cache)"""
+        election = get_election(data['election_id'])
+        if election is None:
             raise serializers.ValidationError({"election_id": "Elección no encontrada"})
 
-        try:
-            candidate = Candidate.objects.get(id=data['candidate_id'])
-        except Candidate.DoesNotExist:
+        candidate = get_candidate(data['candidate_id'])
+        if candidate is None:
             raise serializers.ValidationError({"candidate_id": "Candidato no encontrado"})
 
         # Validar que candidato pertenezca a la elección
-        if candidate.election != election:
+        if candidate.election_id != election.id:
             raise serializers.ValidationError({"candidate_id": "El candidato no pertenece a esta elección"})
 
         data['election'] = election
@@ -0,0 +1,80 @@
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import revoke_tokens
+from .models import Candidate, Election, User
+from .object_cache import object_cache
+from .partitions import attach_partitions, detach_partitions
+from .versions import bump_catalog_version
+
+logger = logging.getLogger(__name__)
+
+# ============================================
+# SEÑALES: CAMBIOS EN EL CATÁLOGO
+# Elecciones y candidatos solo cambian desde el admin
+# ============================================
+
+
+@receiver(post_save, sender=Election)
+@receiver(post_delete, sender=Election)
+@receiver(post_save, sender=Candidate)
+@receiver(post_delete, sender=Candidate)
+def catalog_changed(sender, **kwargs):
+    """Invalida cache de objetos y ETags de elecciones, candidatos y resultados"""
+    # Vaciar ya y de nuevo al confirmar, por si otra petición recargó
+    # el valor anterior mientras la transacción seguía abierta
+    object_cache.invalidate()
+    transaction.on_commit(invalidate_catalog)
+
+
+def invalidate_catalog():
+    bump_catalog_version()
+    object_cache.invalidate()
+
+
+# ============================================
+# SEÑALES: CAMBIOS EN USUARIOS
+# Los tokens llevan role/is_active: revocarlos si cambian
+# ============================================
+
+REVOKING_FIELDS = {'role', 'is_active', 'password'}
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is None or REVOKING_FIELDS & set(update_fields):
+        transaction.on_commit(lambda: revoke_tokens(instance.id))
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: revoke_tokens(instance.id))
+
+
+# ============================================
+# SEÑALES: PARTICIONES DE VOTOS
+# Sin tablas particionadas (ver partitions.py) no hacen nada
+# ============================================
+
+
+@receiver(post_save, sender=Election)
+def election_partitions(sender, instance, **kwargs):
+    if instance.status == 'active':
+        transaction.on_commit(lambda: update_partitions(attach_partitions, instance.id))
+    elif instance.status == 'closed' and settings.VOTES_DETACH_ON_CLOSE:
+        transaction.on_commit(lambda: update_partitions(detach_partitions, instance.id))
+
+
+def update_partitions(operation, election_id):
+    # La elección ya se guardó: si falla, los votos van a la partición
+    # default y se mueven en la próxima activación
+    try:
+        operation(election_id)
+    except Exception:
+        logger.exception('Error actualizando particiones de la elección %s', election_id)
@@ -0,0 +1,94 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .ingest import flush_election
+from .models import Election, ResultSnapshot, VoteTally
+from .serializers import ElectionSerializer
+from .tallies import build_results, candidates_with_votes
+
+# ============================================
+# RESULTADOS FINALES CONGELADOS
+# ============================================
+
+
+def build_results_payload(election):
+    """
+    Respuesta de /api/results/{id}/ calculada desde los contadores.
+    Retorna (payload, ganador).
+    """
+    candidates = list(candidates_with_votes(election))
+    total_votes, results, winner = build_results(candidates)
+
+    payload = {
+        'election': ElectionSerializer(election).data,
+        'total_votes': total_votes,
+        'results': results
+    }
+    return payload, winner
+
+
+def compute_etag(payload):
+    """Hash estable del contenido (claves ordenadas)"""
+    content = json.dumps(payload, cls=DjangoJSONEncoder, sort_keys=True)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def snapshot_results(election):
+    """
+    Congela los resultados de una elección cerrada.
+
+    Idempotente: si ya existe snapshot se retorna sin modificarlo.
+    Antes inserta los votos de la elección que sigan en el journal de
+    ingesta y bloquea los contadores para esperar votos aún en curso.
+    """
+    flush_election(election.pk)
+
+    with transaction.atomic():
+        list(VoteTally.objects.select_for_update().filter(election=election))
+
+        existing = ResultSnapshot.objects.filter(election=election).first()
+        if existing:
+            return existing
+
+        payload, winner = build_results_payload(election)
+        payload = json.loads(json.dumps(payload, cls=DjangoJSONEncoder))
+
+        return ResultSnapshot.objects.create(
+            election=election,
+            total_votes=payload['total_votes'],
+            winner=winner,
+            payload=payload,
+            etag=compute_etag(payload)
+        )
+
+
+def close_election(election):
+    """Cierra la elección y congela sus resultados finales."""
+    with transaction.atomic():
+        # Espera los votos que ya tomaron la elección (FOR KEY SHARE en
+        # casting.py); los siguientes la verán cerrada
+        list(Election.objects.select_for_update().filter(pk=election.pk).values_list('pk', flat=True))
+        election.status = 'closed'
+        election.save(update_fields=['status'])
+
+    # Confirmado el cierre ya no se reclaman votos: congelar tras vaciar
+    # el journal (uno reclamado justo antes que llegue después recongela)
+    return snapshot_results(election)
+
+
+def refreeze_results(election):
+    """
+    Vuelve a congelar los resultados de una elección cerrada tras
+    insertar votos aceptados antes del cierre que llegaron tarde al
+    journal (ver ingest.py). Llamar fuera de una transacción.
+    """
+    discard_snapshot(election)
+    return snapshot_results(election)
+
+
+def discard_snapshot(election):
+    """Elimina el snapshot si la elección se reabre (ya no es final)."""
+    ResultSnapshot.objects.filter(election=election).delete()
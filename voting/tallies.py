@@ -0,0 +1,139 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Candidate, ElectionArchive, Vote, VoteTally
+from .versions import bump_results_version
+
+# ============================================
+# CONTADORES MATERIALIZADOS DE VOTOS
+# ============================================
+
+
+def increment_tally(election_id, candidate_id, amount=1):
+    """
+    Suma `amount` votos al contador (election, candidate).
+
+    Debe llamarse dentro de la misma transacción que crea el Vote
+    para que contador y tabla 'votes' nunca diverjan.
+    """
+    tallies = VoteTally.objects.filter(election_id=election_id, candidate_id=candidate_id)
+    now = timezone.now()
+
+    if tallies.update(votes=F('votes') + amount, updated_at=now):
+        return
+
+    # Primer voto del candidato: crear contador (savepoint por si
+    # otra transacción lo creó en paralelo)
+    try:
+        with transaction.atomic():
+            VoteTally.objects.create(
+                election_id=election_id,
+                candidate_id=candidate_id,
+                votes=amount
+            )
+    except IntegrityError:
+        tallies.update(votes=F('votes') + amount, updated_at=now)
+
+
+def annotate_votes(candidates):
+    """Anota `vote_count` desde los contadores en la misma consulta."""
+    return candidates.annotate(
+        vote_count=Coalesce(Sum('tallies__votes'), Value(0))
+    )
+
+
+def candidates_with_votes(election):
+    """
+    Candidatos de la elección anotados con `vote_count` desde los contadores.
+    Una sola consulta de O(#candidatos) filas.
+    """
+    return annotate_votes(Candidate.objects.filter(election=election))
+
+
+def build_results(candidates):
+    """
+    Calcula resultados a partir de candidatos anotados con `vote_count`
+    (en orden de display_order).
+
+    Retorna (total_votes, results ordenados por votos, nombre del ganador).
+    """
+    total_votes = sum(candidate.vote_count for candidate in candidates)
+
+    results = []
+    winner = None
+    max_votes = 0
+
+    for candidate in candidates:
+        votes = candidate.vote_count
+        percentage = (votes / total_votes * 100) if total_votes > 0 else 0
+
+        results.append({
+            'candidate_id': str(candidate.id),
+            'candidate_name': candidate.name,
+            'candidate_photo': candidate.photo_url,
+            'party_group': candidate.party_group,
+            'votes': votes,
+            'percentage': round(percentage, 2)
+        })
+
+        if votes > max_votes:
+            max_votes = votes
+            winner = candidate.name
+
+    # Ordenar por votos descendente
+    results.sort(key=lambda x: x['votes'], reverse=True)
+
+    return total_votes, results, winner
+
+
+def count_votes(election):
+    """Conteo real desde 'votes': {candidate_id: votos}"""
+    vote_counts = Vote.objects.filter(election=election).values('candidate').annotate(
+        count=Count('id')
+    )
+    return {item['candidate']: item['count'] for item in vote_counts}
+
+
+def rebuild_tallies(election, dry_run=False):
+    """
+    Reconcilia los contadores de una elección contra la tabla 'votes'.
+
+    Bloquea los contadores existentes mientras cuenta, de modo que los
+    votos en curso esperan y se suman después sobre el valor corregido.
+
+    Retorna lista de diferencias: [(candidate_id, contador, real), ...]
+
+    Las elecciones archivadas se omiten: sus votos ya no están en
+    'votes' y los contadores quedarían en cero.
+    """
+    if ElectionArchive.objects.filter(election_id=election.pk).exists():
+        return []
+
+    with transaction.atomic():
+        current = {
+            tally.candidate_id: tally.votes
+            for tally in VoteTally.objects.select_for_update().filter(election=election)
+        }
+        actual = count_votes(election)
+
+        differences = []
+        for candidate in Candidate.objects.filter(election=election):
+            counted = current.get(candidate.id, 0)
+            real = actual.get(candidate.id, 0)
+            if counted == real:
+                continue
+
+            differences.append((candidate.id, counted, real))
+            if not dry_run:
+                VoteTally.objects.update_or_create(
+                    election=election,
+                    candidate=candidate,
+                    defaults={'votes': real}
+                )
+
+        if differences and not dry_run:
+            transaction.on_commit(lambda: bump_results_version(election.id))
+
+        return differences
@@ -1,11 +1,12 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.utils import timezone
 from datetime import timedelta
 import uuid
 
-from .models import User, Election, Candidate, VoteRegistry, Vote
+from .models import User, Election, Candidate, VoteRegistry, Vote, VoteTally
+from .tallies import rebuild_tallies
 
 # ============================================
 # TESTS: AUTENTICACIÓN
@@ -75,12 +76,264 @@ class AuthenticationTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('tokens', response.data)
 
+    def test_email_is_case_insensitive(self):
+        """Test: El email se guarda en minúsculas; registro y login no distinguen mayúsculas"""
+        data = {
+            'email': 'Mixed@Test.com',
+            'password': 'password123',
+            'password_confirm': 'password123',
+            'full_name': 'Mixed'
+        }
+        response = self.client.post(self.register_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(User.objects.filter(email='mixed@test.com').exists())
+
+        response = self.client.post(self.register_url, {**data, 'email': 'MIXED@test.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.login_url, {
+            'email': 'MIXED@TEST.COM',
+            'password': 'password123'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def test_profile_requires_authentication(self):
         """Test: Perfil requiere autenticación"""
         response = self.client.get(self.profile_url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+# ============================================
+# TESTS: JWT SIN CONSULTA DE USUARIO
+# ============================================
+
+class StatelessAuthenticationTests(APITestCase):
+    """Tests para autenticación por claims y revocación de tokens"""
+
+    def setUp(self):
+        from .authentication import tokens_for_user
+
+        self.user = User.objects.create(email='claims@test.com', password='x', full_name='Claims')
+        self.election = Election.objects.create(
+            title='Claims Election',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            status='active'
+        )
+        refresh = tokens_for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_authenticated_request_skips_users_table(self):
+        """Test: La petición autenticada no consulta la tabla users"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(f'/api/has-voted/{self.election.id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('"users"' in query['sql'] for query in captured))
+
+    def test_deactivating_user_revokes_tokens(self):
+        """Test: Desactivar al usuario invalida sus tokens emitidos"""
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        response = self.client.get(f'/api/has-voted/{self.election.id}/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_survives_cache_loss(self):
+        """Test: La revocación se lee de la BD sin cache (reinicio u otro worker)"""
+        from django.core.cache import cache
+
+        self.user.role = 'admin'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        cache.clear()
+
+        response = self.client.get(f'/api/has-voted/{self.election.id}/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+# ============================================
+# TESTS: HASHING DE PASSWORDS
+# ============================================
+
+class PasswordHashingTests(APITestCase):
+    """Tests para pool de hashing, backpressure y rehash"""
+
+    def setUp(self):
+        from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+        # Hash con parámetros distintos a los configurados
+        self.old_hash = PBKDF2PasswordHasher().encode('LoginPass123!', 'oldsalt1234', iterations=1000)
+        self.user = User.objects.create(
+            email='hashing@test.com',
+            password=self.old_hash,
+            full_name='Hashing'
+        )
+
+    @override_settings(PASSWORD_HASH_WORKERS=0, PASSWORD_HASH_ITERATIONS=2000)
+    def test_login_rehashes_to_configured_hasher(self):
+        """Test: Login recalcula el hash con los parámetros configurados"""
+        from .passwords import get_hashing_pool
+
+        response = self.client.post('/api/login/', {
+            'email': 'hashing@test.com',
+            'password': 'LoginPass123!'
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertNotEqual(self.user.password, self.old_hash)
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+        self.assertTrue(self.user.check_password('LoginPass123!'))
+        self.assertEqual(get_hashing_pool().stats()['rehashed'], 1)
+
+    @override_settings(PASSWORD_HASH_WORKERS=0, PASSWORD_HASH_MAX_PENDING=1, PASSWORD_HASH_RETRY_AFTER=3)
+    def test_full_pool_returns_429_with_retry_after(self):
+        """Test: Pool lleno responde 429 con Retry-After"""
+        from .passwords import get_hashing_pool
+
+        # Otro hash ocupa el único lugar
+        slots = get_hashing_pool().slots
+        slots.acquire()
+        self.addCleanup(slots.release)
+
+        response = self.client.post('/api/login/', {
+            'email': 'hashing@test.com',
+            'password': 'LoginPass123!'
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '3')
+
+    @override_settings(PASSWORD_HASH_WORKERS=0, PASSWORD_HASH_MAX_PENDING=0)
+    def test_zero_max_pending_is_unbounded(self):
+        """Test: PASSWORD_HASH_MAX_PENDING=0 no rechaza logins"""
+        response = self.client.post('/api/login/', {
+            'email': 'hashing@test.com',
+            'password': 'LoginPass123!'
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_timed_out_hash_keeps_its_slot_until_done(self):
+        """Test: Tras el timeout el lugar se libera cuando termina el hash"""
+        from concurrent.futures import Future
+        from unittest import mock
+        from .passwords import HashingBusy, HashingPool
+
+        pool = HashingPool(workers=1, max_pending=1)
+        future = Future()
+        executor = mock.Mock(submit=mock.Mock(return_value=future))
+
+        with mock.patch.object(pool, 'get_executor', return_value=executor), \
+                override_settings(PASSWORD_HASH_TIMEOUT=0.01):
+            future.set_running_or_notify_cancel()  # Ya empezó: no se cancela
+            with self.assertRaises(HashingBusy):
+                pool.run(len, 'x')
+            self.assertEqual(pool.stats()['pending'], 1)
+            self.assertFalse(pool.slots.acquire(blocking=False))
+
+            future.set_result((True, 5.0))
+            self.assertEqual(pool.stats()['pending'], 0)
+            self.assertTrue(pool.slots.acquire(blocking=False))
+
+
+# ============================================
+# TESTS: IMPORTACIÓN DE VOTANTES
+# ============================================
+
+class VoterImportTests(TestCase):
+    """Tests para importación masiva de votantes desde CSV"""
+
+    CSV = (
+        'email,full_name,password,role\n'
+        'Ana@Test.com,Ana,secret123,\n'
+        'ana@test.com,Ana Repetida,secret123,\n'
+        'existing@test.com,Existente,secret123,voter\n'
+        'not-an-email,Inválido,secret123,\n'
+        'luis@test.com,Luis,,\n'
+    )
+
+    def setUp(self):
+        User.objects.create(email='existing@test.com', password='x', full_name='Existente')
+
+    def test_import_streams_rows_and_reports_errors(self):
+        """Test: Crea nuevos, omite duplicados/existentes y reporta errores"""
+        import io
+        from .imports import import_voters
+
+        errors = []
+        result = import_voters(
+            io.StringIO(self.CSV),
+            batch_size=2,
+            workers=0,
+            on_error=lambda line, email, message: errors.append((line, email))
+        )
+
+        self.assertEqual(result.as_dict(), {
+            'rows': 5, 'created': 2, 'existing': 1, 'duplicates': 1, 'errors': 1
+        })
+        self.assertEqual(errors, [(5, 'not-an-email')])
+        self.assertTrue(User.objects.get(email='ana@test.com').check_password('secret123'))
+        # Sin password: no puede hacer login hasta que se defina uno
+        self.assertFalse(User.objects.get(email='luis@test.com').password.startswith('pbkdf2'))
+
+    @override_settings(PASSWORD_HASH_WORKERS=0)
+    def test_admin_upload_imports_file(self):
+        """Test: Carga de CSV desde el admin"""
+        from django.contrib.auth.models import User as AdminUser
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        admin_user = AdminUser.objects.create_superuser('admin', 'admin@test.com', 'x')
+        self.client.force_login(admin_user)
+
+        response = self.client.post('/admin/voting/user/import-csv/', {
+            'file': SimpleUploadedFile('voters.csv', self.CSV.encode(), content_type='text/csv')
+        })
+
+        self.assertRedirects(response, '/admin/voting/user/', fetch_redirect_response=False)
+        self.assertTrue(User.objects.filter(email='luis@test.com').exists())
+        self.assertEqual(self.client.get('/admin/voting/user/import-csv/').status_code, 200)
+
+    def test_existing_email_with_other_case_is_not_imported(self):
+        """Test: Un email ya registrado con otras mayúsculas cuenta como existente (sin LOWER en la query)"""
+        import io
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .imports import import_voters
+
+        User.objects.create(email='Mixed@Case.com', password='x', full_name='Mixto')
+        with CaptureQueriesContext(connection) as queries:
+            result = import_voters(
+                io.StringIO('email,full_name\nMIXED@case.com,Mixto\n'),
+                workers=0
+            )
+
+        self.assertEqual(result.existing, 1)
+        self.assertEqual(result.created, 0)
+        self.assertEqual(
+            list(User.objects.filter(full_name='Mixto').values_list('email', flat=True)),
+            ['mixed@case.com']
+        )
+        self.assertFalse(any('LOWER' in query['sql'].upper() for query in queries))
+
+    def test_hashing_processes_set_up_django(self):
+        """Test: El pool de la importación inicializa Django (spawn/forkserver)"""
+        import io
+        from unittest import mock
+        from .imports import import_voters
+        from .passwords import _init_worker
+
+        with mock.patch('voting.imports.ProcessPoolExecutor') as executor_class:
+            import_voters(io.StringIO('email,full_name\n'), workers=2)
+
+        executor_class.assert_called_once_with(max_workers=2, initializer=_init_worker)
+
+
 # ============================================
 # TESTS: VOTACIÓN
 # ============================================
@@ -168,6 +421,9 @@ class VotingTests(APITestCase):
         Vote.objects.create(election=self.election, candidate=self.candidate1)
         Vote.objects.create(election=self.election, candidate=self.candidate2)
 
+        # Votos creados directamente: reconciliar contadores
+        rebuild_tallies(self.election)
+
         # Obtener resultados
         response = self.client.get(f'/api/results/{self.election.id}/')
 
@@ -179,6 +435,1703 @@ class VotingTests(APITestCase):
         self.assertEqual(results['Candidate 1'], 2)
         self.assertEqual(results['Candidate 2'], 1)
 
+    def test_ballot_reflects_vote(self):
+        """Test: La papeleta trae elección, candidatos y si ya votó"""
+        url = f'/api/ballot/{self.election.id}/'
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['election']['title'], 'Test Election')
+        self.assertEqual([c['name'] for c in response.data['candidates']], ['Candidate 1', 'Candidate 2'])
+        self.assertFalse(response.data['has_voted'])
+
+        self.client.post('/api/vote/', {
+            'election_id': str(self.election.id),
+            'candidate_id': str(self.candidate1.id)
+        }, format='json')
+
+        response = self.client.get(url)
+        self.assertTrue(response.data['has_voted'])
+        self.assertIsNotNone(response.data['voted_at'])
+
+    def test_ballot_is_shared_between_users(self):
+        """Test: Con el cache caliente solo se consulta el estado del usuario"""
+        from .authentication import tokens_for_user
+
+        url = f'/api/ballot/{self.election.id}/'
+        self.client.get(url)
+
+        other = User.objects.create(email='other@test.com', password='x', full_name='Other')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(other).access_token}')
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data['candidates']), 2)
+
+        response = self.client.get(f'/api/ballot/{uuid.uuid4()}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_has_voted_bulk(self):
+        """Test: Estado de voto en varias elecciones en una petición"""
+        other = Election.objects.create(
+            title='Other Election',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=7),
+            status='draft'
+        )
+        VoteRegistry.objects.create(user=self.user, election=other, has_voted=True, voted_at=timezone.now())
+
+        response = self.client.get('/api/has-voted/', {'elections': f'{self.election.id},{other.id}'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['elections'][str(self.election.id)]['has_voted'])
+        self.assertTrue(response.data['elections'][str(other.id)]['has_voted'])
+
+        # Sin parámetro: solo elecciones activas
+        response = self.client.get('/api/has-voted/')
+        self.assertEqual(list(response.data['elections']), [str(self.election.id)])
+
+        response = self.client.get('/api/has-voted/', {'elections': 'no-uuid'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_has_voted_bulk_cache_is_cleared_on_vote(self):
+        """Test: El cache por usuario se invalida al votar"""
+        from .authentication import tokens_for_user
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(self.user).access_token}')
+        params = {'elections': str(self.election.id)}
+        self.client.get('/api/has-voted/', params)
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/has-voted/', params)
+        self.assertFalse(response.data['elections'][str(self.election.id)]['has_voted'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/vote/', {
+                'election_id': str(self.election.id),
+                'candidate_id': str(self.candidate1.id)
+            }, format='json')
+
+        response = self.client.get('/api/has-voted/', params)
+        self.assertTrue(response.data['elections'][str(self.election.id)]['has_voted'])
+
+
+# ============================================
+# TESTS: CONTADORES DE VOTOS
+# ============================================
+
+class VoteTallyTests(APITestCase):
+    """Tests para contadores materializados de votos"""
+
+    def setUp(self):
+        self.user = User.objects.create(
+            email='tally@test.com',
+            password='hashed',
+            full_name='Tally Test'
+        )
+        self.election = Election.objects.create(
+            title='Tally Election',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            status='active'
+        )
+        self.candidate1 = Candidate.objects.create(election=self.election, name='A', display_order=1)
+        self.candidate2 = Candidate.objects.create(election=self.election, name='B', display_order=2)
+
+        from rest_framework_simplejwt.tokens import RefreshToken
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_vote_increments_tally(self):
+        """Test: Votar incrementa el contador del candidato"""
+        data = {
+            'election_id': str(self.election.id),
+            'candidate_id': str(self.candidate1.id)
+        }
+        response = self.client.post('/api/vote/', data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        tally = VoteTally.objects.get(election=self.election, candidate=self.candidate1)
+        self.assertEqual(tally.votes, 1)
+
+    def test_rebuild_tallies_command_reconciles_counters(self):
+        """Test: rebuild_tallies corrige contadores desincronizados"""
+        from io import StringIO
+        from django.core.management import call_command
+
+        Vote.objects.create(election=self.election, candidate=self.candidate1)
+        Vote.objects.create(election=self.election, candidate=self.candidate2)
+        VoteTally.objects.create(election=self.election, candidate=self.candidate1, votes=5)
+
+        call_command('rebuild_tallies', '--check', stdout=StringIO())
+        self.assertEqual(VoteTally.objects.get(candidate=self.candidate1).votes, 5)
+
+        call_command('rebuild_tallies', stdout=StringIO())
+        self.assertEqual(VoteTally.objects.get(candidate=self.candidate1).votes, 1)
+        self.assertEqual(VoteTally.objects.get(candidate=self.candidate2).votes, 1)
+
+
+# ============================================
+# TESTS: EMISIÓN DE VOTO
+# ============================================
+
+class CastVoteTests(TestCase):
+    """Tests para reclamo atómico del registro de votación"""
+
+    def setUp(self):
+        self.user = User.objects.create(email='cast@test.com', password='x', full_name='Cast')
+        self.election = Election.objects.create(
+            title='Cast Election',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            status='active'
+        )
+        self.candidate = Candidate.objects.create(election=self.election, name='A', display_order=1)
+
+    def test_duplicate_vote_is_rejected_without_side_effects(self):
+        """Test: Segundo voto no crea voto ni incrementa contador"""
+        from .casting import cast_vote, AlreadyVoted
+
+        cast_vote(self.user.id, self.election.id, self.candidate.id)
+        with self.assertRaises(AlreadyVoted):
+            cast_vote(self.user.id, self.election.id, self.candidate.id)
+
+        self.assertEqual(Vote.objects.filter(election=self.election).count(), 1)
+        self.assertEqual(VoteTally.objects.get(candidate=self.candidate).votes, 1)
+        self.assertTrue(VoteRegistry.objects.get(user=self.user, election=self.election).has_voted)
+
+    def test_existing_unvoted_registry_is_claimed(self):
+        """Test: Registro previo con has_voted=False permite votar"""
+        from .casting import cast_vote
+
+        VoteRegistry.objects.create(user=self.user, election=self.election, has_voted=False)
+        cast_vote(self.user.id, self.election.id, self.candidate.id)
+
+        registry = VoteRegistry.objects.get(user=self.user, election=self.election)
+        self.assertTrue(registry.has_voted)
+        self.assertIsNotNone(registry.voted_at)
+        self.assertEqual(VoteTally.objects.get(candidate=self.candidate).votes, 1)
+
+    def test_closed_election_is_rejected_without_side_effects(self):
+        """Test: El reclamo comprueba el estado en la base"""
+        from .casting import cast_vote, claim_registry, ElectionNotOpen
+
+        Election.objects.filter(pk=self.election.pk).update(status='closed')
+        with self.assertRaises(ElectionNotOpen):
+            cast_vote(self.user.id, self.election.id, self.candidate.id)
+        with self.assertRaises(ElectionNotOpen):
+            claim_registry(self.user.id, self.election.id)
+
+        self.assertFalse(VoteRegistry.objects.filter(election=self.election).exists())
+        self.assertFalse(Vote.objects.filter(election=self.election).exists())
+
+    def test_stale_cached_status_does_not_accept_vote(self):
+        """Test: Elección cerrada con cache atrasado responde 400"""
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from .object_cache import get_election
+
+        self.assertEqual(get_election(self.election.id).status, 'active')
+        # update() no dispara señales: el cache sigue diciendo 'active'
+        Election.objects.filter(pk=self.election.pk).update(status='closed')
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        response = client.post('/api/vote/', {
+            'election_id': str(self.election.id),
+            'candidate_id': str(self.candidate.id)
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ya no está abierta', response.data['error'])
+        self.assertFalse(VoteRegistry.objects.filter(election=self.election).exists())
+
+
+# ============================================
+# TESTS: INGESTA DE VOTOS EN COLA
+# ============================================
+
+class QueuedIngestionTests(APITestCase):
+    """Tests para el modo de ingesta con journal (write-behind)"""
+
+    def setUp(self):
+        import tempfile
+        from django.test import override_settings
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        settings_override = override_settings(
+            VOTE_INGESTION_MODE='queued',
+            VOTE_JOURNAL_PATH=f'{self.tmpdir.name}/journal.sqlite3'
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        from unittest import mock
+        patcher = mock.patch('voting.ingest.ensure_flusher')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create(email='queued@test.com', password='x', full_name='Queued')
+        self.election = Election.objects.create(
+            title='Queued Election',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            status='active'
+        )
+        self.candidate = Candidate.objects.create(election=self.election, name='A', display_order=1)
+
+        from rest_framework_simplejwt.tokens import RefreshToken
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_queued_vote_is_flushed_in_batch(self):
+        """Test: Voto en cola responde 202 y se inserta al vaciar el journal"""
+        from .ingest import flush_batch, get_journal
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/vote/', {
+                'election_id': str(self.election.id),
+                'candidate_id': str(self.candidate.id)
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertTrue(VoteRegistry.objects.get(user=self.user, election=self.election).has_voted)
+        self.assertEqual(Vote.objects.count(), 0)
+
+        flush_batch(get_journal())
+
+        self.assertEqual(Vote.objects.filter(election=self.election).count(), 1)
+        self.assertEqual(VoteTally.objects.get(candidate=self.candidate).votes, 1)
+        self.assertEqual(get_journal().pending_count(), 0)
+
+    def test_replayed_journal_row_is_not_counted_twice(self):
+        """Test: Reintento de una fila ya insertada es idempotente"""
+        from .ingest import flush_batch, get_journal
+
+        journal = get_journal()
+        vote_id = uuid.uuid4()
+        journal.append(vote_id, self.election.id, self.candidate.id)
+        flush_batch(journal)
+
+        # Simula caída entre el commit y el borrado del journal
+        journal.append(vote_id, self.election.id, self.candidate.id)
+        flush_batch(journal)
+
+        self.assertEqual(Vote.objects.filter(election=self.election).count(), 1)
+        self.assertEqual(VoteTally.objects.get(candidate=self.candidate).votes, 1)
+
+    def test_flushed_vote_keeps_enqueue_time(self):
+        """Test: cast_at es el momento en que se encoló, no el del lote"""
+        from .ingest import flush_batch, get_journal
+
+        journal = get_journal()
+        vote_id = uuid.uuid4()
+        journal.append(vote_id, self.election.id, self.candidate.id)
+        enqueued_at = timezone.now() - timedelta(minutes=5)
+        journal.connection().execute(
+            'UPDATE journal SET enqueued_at = ? WHERE vote_id = ?',
+            (enqueued_at.timestamp(), str(vote_id))
+        )
+        flush_batch(journal)
+
+        cast_at = Vote.objects.get(id=vote_id).cast_at
+        self.assertLess(abs((cast_at - enqueued_at).total_seconds()), 0.001)
+
+    def test_close_includes_votes_still_in_journal(self):
+        """Test: Cerrar la elección inserta sus votos en cola antes de congelar"""
+        from .ingest import get_journal
+        from .snapshots import close_election
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/vote/', {
+                'election_id': str(self.election.id),
+                'candidate_id': str(self.candidate.id)
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        snapshot = close_election(self.election)
+
+        self.assertEqual(snapshot.total_votes, 1)
+        self.assertEqual(get_journal().pending_count(self.election.id), 0)
+        self.assertEqual(Vote.objects.filter(election=self.election).count(), 1)
+
+    def test_vote_reaches_journal_after_commit(self):
+        """Test: El voto entra al journal al confirmar el reclamo; uno tardío tras el cierre recongela"""
+        from .ingest import flush_batch, get_journal
+        from .snapshots import close_election
+
+        journal = get_journal()
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post('/api/vote/', {
+                'election_id': str(self.election.id),
+                'candidate_id': str(self.candidate.id)
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(journal.pending_count(), 0)
+
+        # El reclamo confirmó antes del cierre, el voto llega después
+        snapshot = close_election(self.election)
+        self.assertEqual(snapshot.total_votes, 0)
+        for callback in callbacks:
+            callback()
+        with self.captureOnCommitCallbacks(execute=True):
+            flush_batch(journal)
+
+        self.election.refresh_from_db()
+        self.assertEqual(self.election.result_snapshot.total_votes, 1)
+
+    def test_failing_row_goes_to_dead_letter(self):
+        """Test: Una fila que falla siempre pasa a dead_letter sin frenar al resto"""
+        from unittest import mock
+        from django.db import IntegrityError
+        from django.test import override_settings
+        from io import StringIO
+        from django.core.management import call_command
+        from . import ingest
+
+        journal = ingest.get_journal()
+        bad_id, good_id = uuid.uuid4(), uuid.uuid4()
+        journal.append(bad_id, self.election.id, self.candidate.id)
+        journal.append(good_id, self.election.id, self.candidate.id)
+
+        insert_votes = ingest._insert_votes
+
+        def failing_insert(votes):
+            if any(vote.id == bad_id for vote in votes):
+                raise IntegrityError('candidate_id inválido')
+            insert_votes(votes)
+
+        with override_settings(VOTE_FLUSH_MAX_ATTEMPTS=2), \
+                mock.patch.object(ingest, '_insert_votes', failing_insert), \
+                self.assertLogs('voting.ingest', 'ERROR') as logs:
+            ingest.flush_election(self.election.id)
+
+        self.assertTrue(Vote.objects.filter(id=good_id).exists())
+        self.assertEqual(journal.pending_count(), 0)
+        self.assertEqual(journal.dead_letter_count(self.election.id), 1)
+        self.assertTrue(any(str(bad_id) in line for line in logs.output))
+
+        call_command('flush_vote_journal', '--requeue-dead-letter', stdout=StringIO())
+        self.assertTrue(Vote.objects.filter(id=bad_id).exists())
+        self.assertEqual(journal.dead_letter_count(), 0)
+
+    def test_startup_resumes_pending_journal(self):
+        """Test: Al iniciar, un journal con votos pendientes arranca el vaciado"""
+        from . import ingest
+
+        ingest.resume_journal()  # Sin journal no hay nada que retomar
+        ingest.ensure_flusher.assert_not_called()
+
+        ingest.get_journal().append(uuid.uuid4(), self.election.id, self.candidate.id)
+        ingest.resume_journal()
+        ingest.ensure_flusher.assert_called_once()
+
+
+# ============================================
+# TESTS: RESULTADOS EN VIVO
+# ============================================
+
+class LiveResultsTests(APITestCase):
+    """Tests para stream de resultados en vivo"""
+
+    def setUp(self):
+        self.user = User.objects.create(
+            email='live@test.com',
+            password='hashed',
+            full_name='Live Test'
+        )
+        self.election = Election.objects.create(
+            title='Live Election',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            status='active'
+        )
+        self.candidate = Candidate.objects.create(election=self.election, name='A', display_order=1)
+
+        from rest_framework_simplejwt.tokens import RefreshToken
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_vote_commit_bumps_results_version(self):
+        """Test: Confirmar un voto cambia la versión de resultados"""
+        from .versions import get_results_version
+
+        before = get_results_version(self.election.id)
+        data = {
+            'election_id': str(self.election.id),
+            'candidate_id': str(self.candidate.id)
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/vote/', data, format='json')
+
+        self.assertNotEqual(get_results_version(self.election.id), before)
+
+    def test_stream_sends_snapshot_then_delta(self):
+        """Test: El stream envía estado completo y luego solo cambios"""
+        import json
+        from asgiref.sync import async_to_sync, sync_to_async
+        from .live import stream_results
+        from .versions import bump_results_version
+        from .tallies import increment_tally
+
+        other = Candidate.objects.create(election=self.election, name='B', display_order=2)
+        increment_tally(self.election.id, other.id)
+
+        def add_vote():
+            increment_tally(self.election.id, self.candidate.id)
+            bump_results_version(self.election.id)
+
+        async def read_two_events():
+            stream = stream_results(self.election.id)
+            try:
+                first = await stream.__anext__()
+                await sync_to_async(add_vote)()
+                second = await stream.__anext__()
+            finally:
+                await stream.aclose()
+            return first, second
+
+        first, second = async_to_sync(read_two_events)()
+
+        self.assertTrue(first.startswith('event: snapshot'))
+        self.assertEqual(json.loads(first.split('data: ')[1])['votes'], {str(other.id): 1})
+        self.assertTrue(second.startswith('event: tally'))
+        self.assertEqual(json.loads(second.split('data: ')[1]), {
+            'total_votes': 2,
+            'votes': {str(self.candidate.id): 1}
+        })
+
+    def test_stream_does_not_hold_db_connection(self):
+        """Test: La vista y el hub devuelven la conexión tras cada lectura"""
+        from unittest import mock
+        from asgiref.sync import async_to_sync
+        from .live import get_hub
+
+        with mock.patch('voting.live.release_connections') as release:
+            # Cliente WSGI: 501 después de comprobar la elección
+            response = self.client.get(f'/api/results/{self.election.id}/stream/')
+            self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+            self.assertEqual(release.call_count, 1)
+
+            async def subscribe():
+                hub = get_hub(self.election.id)
+                subscriber = await hub.subscribe()
+                hub.unsubscribe(subscriber)
+                await hub.task
+
+            async_to_sync(subscribe)()
+            self.assertEqual(release.call_count, 2)
+
+    def test_hub_error_closes_streams(self):
+        """Test: Si el hub falla, se registra y los streams terminan"""
+        from unittest import mock
+        from asgiref.sync import async_to_sync, sync_to_async
+        from .live import stream_results
+        from .versions import bump_results_version
+
+        async def read_until_closed():
+            stream = stream_results(self.election.id)
+            events = [await stream.__anext__()]
+            await sync_to_async(bump_results_version)(self.election.id)
+            async for event in stream:
+                events.append(event)
+            return events
+
+        counts = mock.Mock(side_effect=[{}, RuntimeError('base caída')])
+        with mock.patch('voting.live.read_tally_counts', counts), \
+                self.assertLogs('voting.live', level='ERROR'):
+            events = async_to_sync(read_until_closed)()
+
+        self.assertEqual(len(events), 1)
+        self.assertTrue(events[0].startswith('event: snapshot'))
+
+    @override_settings(LIVE_RESULTS_MAX_SUBSCRIBERS=1)
+    def test_subscriber_limit_returns_503(self):
+        """Test: Con el límite de streams alcanzado responde 503 con Retry-After"""
+        from .live import Subscriber, get_hub
+
+        hub = get_hub(self.election.id)
+        subscriber = Subscriber({})
+        hub.subscribers.add(subscriber)
+        self.addCleanup(hub.unsubscribe, subscriber)
+
+        response = self.client.get(f'/api/results/{self.election.id}/stream/')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn('Retry-After', response)
+
+        hub.unsubscribe(subscriber)
+        response = self.client.get(f'/api/results/{self.election.id}/stream/')
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+
+# ============================================
+# TESTS: HISTORIAL
+# ============================================
+
+class HistoryTests(APITestCase):
+    """Tests para historial de elecciones cerradas"""
+
+    def create_closed_election(self, title, days_ago, votes):
+        election = Election.objects.create(
+            title=title,
+            start_date=timezone.now() - timedelta(days=days_ago + 7),
+            end_date=timezone.now() - timedelta(days=days_ago),
+            status='closed'
+        )
+        for order, count in enumerate(votes):
+            candidate = Candidate.objects.create(
+                election=election, name=f'{title} C{order}', display_order=order
+            )
+            VoteTally.objects.create(election=election, candidate=candidate, votes=count)
+        return election
+
+    def test_history_query_count_is_constant(self):
+        """Test: Historial usa las mismas consultas con 1 o muchas elecciones"""
+        self.create_closed_election('E0', 1, [3, 5])
+        with self.assertNumQueries(2):
+            self.client.get('/api/history/')
+
+        for i in range(1, 6):
+            self.create_closed_election(f'E{i}', i + 1, [1, 2, 3])
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/history/')
+
+        first = response.data['results'][0]
+        self.assertEqual(first['election']['title'], 'E0')
+        self.assertEqual(first['total_votes'], 8)
+        self.assertEqual(first['winner'], 'E0 C1')
+
+    def test_history_is_cursor_paginated(self):
+        """Test: Historial pagina por cursor en orden de fecha de cierre"""
+        for i in range(25):
+            self.create_closed_election(f'E{i}', i + 1, [1])
+
+        response = self.client.get('/api/history/')
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(response.data['next'])
+        titles = [item['election']['title'] for item in response.data['results']]
+        self.assertEqual(titles, [f'E{i}' for i in range(20, 25)])
+        self.assertIsNone(response.data['next'])
+
+
+# ============================================
+# TESTS: EXPORTACIÓN
+# ============================================
+
+class ExportTests(APITestCase):
+    """Tests para la descarga en streaming de resultados y auditoría"""
+
+    def setUp(self):
+        from .authentication import tokens_for_user
+        from .casting import cast_vote
+
+        self.election = Election.objects.create(
+            title='Export',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            status='active'
+        )
+        self.candidate = Candidate.objects.create(election=self.election, name='A', display_order=1)
+        self.voter = User.objects.create(email='export-voter@test.com', password='x', full_name='Voter')
+        self.admin = User.objects.create(email='export-admin@test.com', password='x', full_name='Admin', role='admin')
+        cast_vote(self.voter.id, self.election.id, self.candidate.id)
+
+        self.voter_token = tokens_for_user(self.voter).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(self.admin).access_token}')
+
+    def read(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_votes_csv(self):
+        """Test: Exporta los votos anónimos en CSV (solo admin)"""
+        import csv
+
+        rows = list(csv.reader(self.read(f'/api/export/{self.election.id}/votes.csv').splitlines()))
+        vote = Vote.objects.get(election=self.election)
+        self.assertEqual(rows[0], ['id', 'candidate_id', 'cast_at'])
+        self.assertEqual(rows[1][:2], [str(vote.id), str(self.candidate.id)])
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.voter_token}')
+        response = self.client.get(f'/api/export/{self.election.id}/votes.csv')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_turnout_and_results_ndjson(self):
+        """Test: Participación sin hora de voto y resultados en NDJSON"""
+        import json
+
+        def read_lines(url):
+            return [json.loads(line) for line in self.read(url).splitlines()]
+
+        turnout = read_lines(f'/api/export/{self.election.id}/turnout.ndjson')
+        self.assertEqual(turnout, [{
+            'user_id': str(self.voter.id),
+            'email': 'export-voter@test.com',
+            'full_name': 'Voter',
+            'has_voted': True
+        }])
+
+        results = read_lines(f'/api/export/{self.election.id}/results.ndjson')
+        self.assertEqual([(row['candidate_name'], row['votes']) for row in results], [('A', 1)])
+
+        response = self.client.get(f'/api/export/{self.election.id}/ballots.xml')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+# ============================================
+# TESTS: VELOCIDAD DE VOTACIÓN
+# ============================================
+
+class AnalyticsTests(APITestCase):
+    """Tests para votos por intervalo y participación"""
+
+    def setUp(self):
+        from .authentication import tokens_for_user
+
+        self.election = Election.objects.create(
+            title='Analytics',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            status='active'
+        )
+        self.a = Candidate.objects.create(election=self.election, name='A', display_order=1)
+        self.b = Candidate.objects.create(election=self.election, name='B', display_order=2)
+
+        self.start = timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=2)
+        for minutes, candidate in [(1, self.a), (1, self.b), (2, self.a), (61, self.a)]:
+            vote = Vote.objects.create(election=self.election, candidate=candidate)
+            Vote.objects.filter(id=vote.id).update(cast_at=self.start + timedelta(minutes=minutes, seconds=30))
+
+        voters = [
+            User.objects.create(email=f'analytics{i}@test.com', password='x', full_name='Voter')
+            for i in range(4)
+        ]
+        VoteRegistry.objects.create(user=voters[0], election=self.election, has_voted=True)
+        admin = User.objects.create(email='analytics-admin@test.com', password='x', full_name='Admin', role='admin')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(admin).access_token}')
+
+    def test_votes_per_bucket_and_turnout(self):
+        """Test: Votos por minuto, por hora y participación"""
+        url = f'/api/analytics/{self.election.id}/'
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([bucket['votes'] for bucket in response.data['buckets']], [2, 1, 1])
+        self.assertEqual(response.data['turnout'], {'voted': 1, 'eligible': 4, 'percentage': 25.0})
+
+        response = self.client.get(url, {'bucket': 'hour', 'by': 'candidate'})
+        self.assertEqual(
+            [(bucket['start'], bucket['candidate_id'], bucket['votes']) for bucket in response.data['buckets']],
+            sorted([
+                (self.start, self.a.id, 2),
+                (self.start, self.b.id, 1),
+                (self.start + timedelta(hours=1), self.a.id, 1)
+            ], key=lambda row: (row[0], str(row[1])))
+        )
+
+    def test_since_cursor(self):
+        """Test: Con since solo llegan los intervalos nuevos"""
+        url = f'/api/analytics/{self.election.id}/'
+        since = (self.start + timedelta(minutes=2, seconds=10)).isoformat()
+
+        response = self.client.get(url, {'since': since})
+        self.assertEqual(
+            [bucket['start'] for bucket in response.data['buckets']],
+            [self.start + timedelta(minutes=2), self.start + timedelta(minutes=61)]
+        )
+        self.assertEqual(response.data['next_since'], self.start + timedelta(minutes=61))
+
+        response = self.client.get(url, {'since': 'ayer'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# ============================================
+# TESTS: RESULTADOS FINALES CONGELADOS
+# ============================================
+
+class ResultSnapshotTests(APITestCase):
+    """Tests para snapshot de resultados al cerrar elecciones"""
+
+    def setUp(self):
+        self.election = Election.objects.create(
+            title='Snapshot Election',
+            start_date=timezone.now() - timedelta(days=7),
+            end_date=timezone.now() - timedelta(hours=1),
+            status='active'
+        )
+        self.candidate1 = Candidate.objects.create(election=self.election, name='A', display_order=1)
+        self.candidate2 = Candidate.objects.create(election=self.election, name='B', display_order=2)
+        VoteTally.objects.create(election=self.election, candidate=self.candidate1, votes=1)
+        VoteTally.objects.create(election=self.election, candidate=self.candidate2, votes=3)
+
+    def test_closed_results_are_frozen_with_etag(self):
+        """Test: Resultados de elección cerrada salen del snapshot con ETag"""
+        from .snapshots import close_election
+
+        snapshot = close_election(self.election)
+        self.assertEqual(snapshot.total_votes, 4)
+        self.assertEqual(snapshot.winner, 'B')
+
+        # Cambios posteriores en contadores no alteran resultados finales
+        VoteTally.objects.filter(candidate=self.candidate1).update(votes=10)
+
+        response = self.client.get(f'/api/results/{self.election.id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_votes'], 4)
+        self.assertIn('max-age', response['Cache-Control'])
+
+        response = self.client.get(
+            f'/api/results/{self.election.id}/',
+            HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_close_expired_elections_command(self):
+        """Test: Comando cierra elecciones vencidas y guarda snapshot"""
+        from io import StringIO
+        from django.core.management import call_command
+        from .models import ResultSnapshot
+
+        call_command('close_expired_elections', stdout=StringIO())
+
+        self.election.refresh_from_db()
+        self.assertEqual(self.election.status, 'closed')
+        self.assertTrue(ResultSnapshot.objects.filter(election=self.election).exists())
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/history/')
+        self.assertEqual(response.data['results'][0]['winner'], 'B')
+
+    def test_admin_form_close_uses_close_election_after_commit(self):
+        """Test: Cerrar desde el formulario congela vía close_election al confirmar"""
+        from unittest import mock
+        from django.contrib.auth.models import User as AdminUser
+        from .models import ResultSnapshot
+        from .snapshots import close_election
+
+        self.client.force_login(AdminUser.objects.create_superuser('admin', 'admin@test.com', 'x'))
+        local = timezone.localtime
+        data = {
+            'title': self.election.title,
+            'description': '',
+            'status': 'closed',
+            'start_date_0': local(self.election.start_date).strftime('%Y-%m-%d'),
+            'start_date_1': local(self.election.start_date).strftime('%H:%M:%S'),
+            'end_date_0': local(self.election.end_date).strftime('%Y-%m-%d'),
+            'end_date_1': local(self.election.end_date).strftime('%H:%M:%S'),
+            'results_public': 'on',
+        }
+
+        with mock.patch('voting.admin.close_election', wraps=close_election) as close:
+            with self.captureOnCommitCallbacks() as callbacks:
+                response = self.client.post(f'/admin/voting/election/{self.election.id}/change/', data)
+            self.assertEqual(response.status_code, 302)
+            # Nada se congela antes de confirmar el formulario
+            close.assert_not_called()
+            self.assertFalse(ResultSnapshot.objects.filter(election=self.election).exists())
+
+            for callback in callbacks:
+                callback()
+            close.assert_called_once()
+
+        self.assertEqual(ResultSnapshot.objects.get(election=self.election).total_votes, 4)
+
+
+# ============================================
+# TESTS: PETICIONES CONDICIONALES (ETag)
+# ============================================
+
+class ConditionalRequestTests(APITestCase):
+    """Tests para ETag / If-None-Match"""
+
+    def setUp(self):
+        self.election = Election.objects.create(
+            title='ETag Election',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            status='active'
+        )
+        self.candidate = Candidate.objects.create(election=self.election, name='A', display_order=1)
+
+    def test_results_not_modified_without_queries(self):
+        """Test: Resultados sin cambios responden 304 sin consultar la BD"""
+        from .versions import bump_results_version
+
+        url = f'/api/results/{self.election.id}/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Un voto nuevo cambia la versión
+        bump_results_version(self.election.id)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_catalog_edit_invalidates_etag(self):
+        """Test: Editar una elección invalida el ETag de listados"""
+        for url in ['/api/elections/', '/api/candidates/']:
+            response = self.client.get(url)
+            etag = response['ETag']
+
+            with self.assertNumQueries(0):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.election.title = f'Editada {url}'
+                self.election.save()
+
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+# ============================================
+# TESTS: CACHE COMPARTIDO ENTRE WORKERS
+# ============================================
+
+class SharedCacheTests(TestCase):
+    """Tests para la verificación de cache compartido al iniciar"""
+
+    @override_settings(WEB_CONCURRENCY=2)
+    def test_local_cache_with_several_workers_is_rejected(self):
+        """Test: Varios workers con LocMemCache no arrancan"""
+        from django.core.exceptions import ImproperlyConfigured
+        from .versions import check_shared_cache
+
+        with self.assertRaises(ImproperlyConfigured):
+            check_shared_cache()
+
+    def test_single_worker_or_shared_cache_is_accepted(self):
+        """Test: Un worker con cache local, o un cache compartido, arrancan"""
+        import tempfile
+        from .versions import check_shared_cache
+
+        with override_settings(WEB_CONCURRENCY=1):
+            check_shared_cache()
+
+        with tempfile.TemporaryDirectory() as directory:
+            shared = {'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': directory,
+            }}
+            with override_settings(WEB_CONCURRENCY=4, CACHES=shared):
+                check_shared_cache()
+
+
+# ============================================
+# TESTS: PAGINACIÓN POR CURSOR Y CAMPOS A PEDIDO
+# ============================================
+
+class CatalogPaginationTests(APITestCase):
+    """Tests para paginación por llave y ?fields= en elecciones y candidatos"""
+
+    def setUp(self):
+        now = timezone.now()
+        self.elections = []
+        for i in range(5):
+            election = Election.objects.create(
+                title=f'Página {i}',
+                description='Texto largo',
+                start_date=now,
+                end_date=now + timedelta(days=1)
+            )
+            Election.objects.filter(id=election.id).update(created_at=now - timedelta(hours=i))
+            self.elections.append(election)
+        Candidate.objects.create(election=self.elections[0], name='B', display_order=1)
+        Candidate.objects.create(election=self.elections[0], name='A', display_order=1)
+        Candidate.objects.create(election=self.elections[0], name='C', display_order=0)
+
+    def test_cursor_pages_forward_and_back(self):
+        """Test: Recorre las elecciones por cursor sin repetir ni saltar"""
+        from unittest import mock
+        from .pagination import ElectionPagination
+
+        with mock.patch.object(ElectionPagination, 'page_size', 2):
+            response = self.client.get('/api/elections/')
+            self.assertIsNone(response.data['previous'])
+            titles = [item['title'] for item in response.data['results']]
+
+            while response.data['next']:
+                response = self.client.get(response.data['next'])
+                titles += [item['title'] for item in response.data['results']]
+
+            self.assertEqual(titles, [f'Página {i}' for i in range(5)])
+
+            response = self.client.get(response.data['previous'])
+            self.assertEqual([item['title'] for item in response.data['results']], ['Página 2', 'Página 3'])
+
+        response = self.client.get('/api/elections/', {'cursor': 'no-es-un-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_sparse_fields(self):
+        """Test: ?fields= limita los campos; desconocidos responden 400"""
+        response = self.client.get('/api/candidates/', {'fields': 'name,election_title'})
+        self.assertEqual(response.data['results'], [
+            {'name': 'C', 'election_title': 'Página 0'},
+            {'name': 'A', 'election_title': 'Página 0'},
+            {'name': 'B', 'election_title': 'Página 0'},
+        ])
+
+        response = self.client.get(f'/api/elections/{self.elections[0].id}/', {'fields': 'id,title'})
+        self.assertEqual(set(response.data), {'id', 'title'})
+
+        response = self.client.get('/api/elections/', {'fields': 'title,secret'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ties_in_first_key_do_not_repeat_or_skip(self):
+        """Test: Empates en display_order se paginan por la llave completa"""
+        from unittest import mock
+        from .pagination import CandidatePagination
+
+        for name in ['E', 'D', 'F']:
+            Candidate.objects.create(election=self.elections[1], name=name, display_order=1)
+
+        with mock.patch.object(CandidatePagination, 'page_size', 2):
+            response = self.client.get('/api/candidates/', {'fields': 'name'})
+            names = [item['name'] for item in response.data['results']]
+            while response.data['next']:
+                response = self.client.get(response.data['next'])
+                names += [item['name'] for item in response.data['results']]
+
+        self.assertEqual(names, ['C', 'A', 'B', 'D', 'E', 'F'])
+
+    def test_deep_page_is_one_bounded_query(self):
+        """Test: La página se pide a la base con la llave y LIMIT"""
+        from unittest import mock
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .pagination import ElectionPagination
+
+        with mock.patch.object(ElectionPagination, 'page_size', 2):
+            response = self.client.get('/api/elections/')
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(response.data['next'])
+
+        self.assertEqual([item['title'] for item in response.data['results']], ['Página 2', 'Página 3'])
+        self.assertEqual(len(queries), 1)
+        self.assertIn('LIMIT 3', queries[0]['sql'])
+
+
+# ============================================
+# TESTS: CACHE DE OBJETOS
+# ============================================
+
+class ObjectCacheTests(APITestCase):
+    """Tests para cache-aside de elecciones y candidatos"""
+
+    def setUp(self):
+        self.election = Election.objects.create(
+            title='Cache Election',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            status='active'
+        )
+        self.candidate = Candidate.objects.create(election=self.election, name='A', display_order=1)
+
+    def test_vote_validation_uses_cache(self):
+        """Test: Validar un voto repetido no consulta elección ni candidato"""
+        from .serializers import CastVoteSerializer
+
+        data = {
+            'election_id': str(self.election.id),
+            'candidate_id': str(self.candidate.id)
+        }
+        self.assertTrue(CastVoteSerializer(data=data).is_valid())
+
+        with self.assertNumQueries(0):
+            serializer = CastVoteSerializer(data=data)
+            self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.validated_data['election'], self.election)
+
+    def test_admin_edit_invalidates_cache(self):
+        """Test: Guardar una elección invalida listados cacheados"""
+        self.client.get('/api/elections/')
+
+        self.election.title = 'Título nuevo'
+        self.election.save()
+
+        response = self.client.get('/api/elections/')
+        self.assertEqual(response.data['results'][0]['title'], 'Título nuevo')
+
+    def test_metrics_requires_admin(self):
+        """Test: Métricas solo para administradores"""
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        voter = User.objects.create(email='v@test.com', password='x', full_name='V')
+        admin = User.objects.create(email='a@test.com', password='x', full_name='A', role='admin')
+
+        token = RefreshToken.for_user(voter).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(self.client.get('/api/metrics/').status_code, status.HTTP_403_FORBIDDEN)
+
+        token = RefreshToken.for_user(admin).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('misses', response.data['object_cache'])
+
+
+# ============================================
+# TESTS: VISTAS ASYNC Y POOL DE CONEXIONES
+# ============================================
+
+class AsyncViewTests(TestCase):
+    """Tests para las vistas de lectura async (ASGI) y el pool de PostgreSQL"""
+
+    def setUp(self):
+        self.election = Election.objects.create(
+            title='Async Election',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            status='active'
+        )
+        Candidate.objects.create(election=self.election, name='A', display_order=1)
+
+    async def test_results_view_is_async(self):
+        """Test: Resultados se sirven desde una vista async"""
+        from asgiref.sync import iscoroutinefunction
+        from django.test import AsyncClient
+        from django.urls import resolve
+
+        url = f'/api/results/{self.election.id}/'
+        self.assertTrue(iscoroutinefunction(resolve(url).func))
+
+        client = AsyncClient()
+        response = await client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['results'][0]['candidate_name'], 'A')
+
+        # Handlers síncronos de DRF (OPTIONS) siguen funcionando
+        response = await client.options(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_pool_returns_connection_on_close(self):
+        """Test: Cerrar la conexión la devuelve al pool en vez de cerrarla"""
+        from django.db import connections
+
+        if not connections['default'].settings_dict['OPTIONS'].get('pool'):
+            self.skipTest('Requiere DB_ENGINE=voting.backends.postgresql con pool')
+
+        wrapper = connections.create_connection('default')
+        wrapper.ensure_connection()
+        raw_connection = wrapper.connection
+        self.assertIsNotNone(wrapper.pool)
+
+        wrapper.close()
+        self.assertIsNone(wrapper.connection)
+        self.assertFalse(raw_connection.closed)
+
+
+# ============================================
+# TESTS: CONEXIONES Y STATEMENT TIMEOUT
+# ============================================
+
+class ConnectionSettingsTests(TestCase):
+    """Tests para la configuración de conexiones y statement_timeout"""
+
+    def load_settings(self, **env):
+        import os
+        import runpy
+        from unittest import mock
+
+        env = {'DB_ENGINE': 'voting.backends.postgresql', 'DB_NAME': 'postgres', **env}
+        with mock.patch.dict(os.environ, env):
+            return runpy.run_module('config.settings')['DATABASES']['default']
+
+    def test_transaction_pooler_disables_session_features(self):
+        """Test: Puerto 6543 desactiva cursores del servidor, prepared statements y SET de sesión"""
+        direct = self.load_settings(DB_PORT='5432')
+        self.assertFalse(direct.get('DISABLE_SERVER_SIDE_CURSORS', False))
+        self.assertIn('statement_timeout', direct['OPTIONS'])
+
+        pooler = self.load_settings(DB_PORT='6543')
+        self.assertTrue(pooler['DISABLE_SERVER_SIDE_CURSORS'])
+        self.assertIsNone(pooler['OPTIONS']['prepare_threshold'])
+        self.assertNotIn('statement_timeout', pooler['OPTIONS'])
+
+        # El pool por proceso se reparte el límite total entre los workers
+        self.assertEqual(
+            self.load_settings(DB_MAX_CONNECTIONS='40', WEB_CONCURRENCY='4')['OPTIONS']['pool']['max_size'],
+            10
+        )
+
+    def test_view_statement_timeout_lasts_one_request(self):
+        """Test: El statement_timeout de la vista rige hasta el fin de la petición"""
+        from django.db import connections
+        from .db import use_statement_timeout
+
+        if 'statement_timeout' not in connections['default'].settings_dict['OPTIONS']:
+            self.skipTest('Requiere DB_ENGINE=voting.backends.postgresql')
+
+        # Conexión propia en autocommit (la del test está dentro de una transacción)
+        wrapper = connections.create_connection('default')
+        default = wrapper.settings_dict['OPTIONS']['statement_timeout']
+        connections['default'], original = wrapper, connections['default']
+        try:
+            def current_timeout():
+                with wrapper.cursor() as cursor:
+                    cursor.execute("SELECT setting::int FROM pg_settings WHERE name = 'statement_timeout'")
+                    return cursor.fetchone()[0]
+
+            self.assertEqual(current_timeout(), default)
+
+            use_statement_timeout(default + 1000)
+            self.assertEqual(current_timeout(), default + 1000)
+
+            wrapper.close_if_unusable_or_obsolete()
+            self.assertEqual(current_timeout(), default)
+        finally:
+            connections['default'] = original
+            wrapper.close()
+
+
+# ============================================
+# TESTS: RÉPLICA DE LECTURA
+# ============================================
+
+class ReplicaRoutingTests(APITestCase):
+    """Tests para el enrutamiento de lecturas a la réplica"""
+
+    def setUp(self):
+        from unittest import mock
+        from . import routers
+        from .authentication import tokens_for_user
+
+        # La base de prueba hace de réplica
+        patcher = mock.patch.object(routers, 'REPLICA_ALIAS', 'default')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(routers.reset_reads)
+
+        self.user = User.objects.create(email='replica@test.com', password='x', full_name='Replica')
+        self.election = Election.objects.create(
+            title='Replica Election',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            status='active'
+        )
+        self.candidate = Candidate.objects.create(election=self.election, name='A', display_order=1)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(self.user).access_token}'
+        )
+
+    def test_user_reads_primary_after_voting(self):
+        """Test: Tras votar, las lecturas del usuario van al primario"""
+        from django.contrib.auth.models import AnonymousUser
+        from .routers import route_reads, reading_from_replica
+
+        route_reads(self.user)
+        self.assertTrue(reading_from_replica())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/vote/', {
+                'election_id': str(self.election.id),
+                'candidate_id': str(self.candidate.id)
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        route_reads(self.user)
+        self.assertFalse(reading_from_replica())
+        route_reads(AnonymousUser())
+        self.assertTrue(reading_from_replica())
+
+    def test_recent_results_from_replica_use_content_etag(self):
+        """Test: Resultados recién cambiados leídos de la réplica no usan el ETag de versión"""
+        from .routers import reading_from_replica
+        from .versions import bump_results_version
+
+        self.client.credentials()
+        url = f'/api/results/{self.election.id}/'
+
+        response = self.client.get(url)
+        self.assertTrue(response['ETag'].startswith('"results-'))
+        self.assertFalse(reading_from_replica())  # No queda activo tras la petición
+
+        bump_results_version(self.election.id)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response['ETag'].startswith('"results-'))
+
+    def test_catalog_lists_read_from_replica(self):
+        """Test: Los listados del catálogo leen de la réplica, salvo justo tras un cambio"""
+        from unittest import mock
+        from django.core.cache import cache
+        from . import routers
+        from .routers import ReplicaRouter, reading_from_replica
+        from .versions import bump_catalog_version
+
+        cache.delete(routers.CATALOG_PIN_KEY)  # Cambios de setUp u otros tests
+        self.client.credentials()
+        aliases = []
+        db_for_read = ReplicaRouter.db_for_read
+
+        def spy(router, model, **hints):
+            # Dentro del atomic de TestCase el router cede al primario
+            aliases.append((model, routers._read_alias.get()))
+            return db_for_read(router, model, **hints)
+
+        with mock.patch.object(ReplicaRouter, 'db_for_read', spy):
+            for url, model in [('/api/elections/', Election), ('/api/candidates/', Candidate)]:
+                aliases.clear()
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertIn((model, 'default'), aliases)  # 'default' hace de réplica
+                self.assertFalse(reading_from_replica())
+
+            bump_catalog_version()
+            aliases.clear()
+            response = self.client.get('/api/elections/')
+            self.assertEqual(len(response.data['results']), 1)
+            self.assertEqual(aliases, [(Election, None)])
+
+
+# ============================================
+# TESTS: PRESUPUESTOS POR ENDPOINT
+# ============================================
+
+class EndpointBudgetTests(APITestCase):
+    """Tests de queries y latencia por endpoint (detecta N+1)"""
+
+    def setUp(self):
+        from django.contrib.auth.hashers import make_password
+
+        self.admin = User.objects.create(
+            email='budget-admin@test.com',
+            password=make_password('BudgetPass123!'),
+            full_name='Budget Admin',
+            role='admin'
+        )
+        self.active = Election.objects.create(
+            title='Budget Active',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            status='active'
+        )
+        self.candidate = Candidate.objects.create(election=self.active, name='A', display_order=1)
+        Candidate.objects.create(election=self.active, name='B', display_order=2)
+
+        # Varias elecciones cerradas, con y sin snapshot: el costo no debe crecer con ellas
+        from .snapshots import snapshot_results
+        for i in range(6):
+            election = Election.objects.create(
+                title=f'Budget Closed {i}',
+                start_date=timezone.now() - timedelta(days=10 + i),
+                end_date=timezone.now() - timedelta(days=5 + i),
+                status='closed'
+            )
+            for j in range(3):
+                candidate = Candidate.objects.create(election=election, name=f'C{j}', display_order=j)
+                Vote.objects.create(election=election, candidate=candidate)
+            rebuild_tallies(election)
+            if i % 2:
+                snapshot_results(election)
+
+        from .authentication import tokens_for_user
+        self.refresh = tokens_for_user(self.admin)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.refresh.access_token}')
+
+    def test_every_endpoint_declares_budget(self):
+        """Test: Cada URL de voting/urls.py tiene presupuesto declarado"""
+        from .instrumentation import ENDPOINT_BUDGETS, iter_patterns
+
+        missing = {pattern.name for pattern in iter_patterns()} - set(ENDPOINT_BUDGETS)
+        self.assertEqual(missing, set())
+
+    def test_endpoints_stay_within_budget(self):
+        """Test: Ningún endpoint excede su presupuesto de queries/latencia"""
+        import tempfile
+        from .archive import archive_election
+        from .instrumentation import ENDPOINT_BUDGETS, EndpointProfiler
+
+        closed = Election.objects.filter(status='closed').first()
+
+        archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(archive_dir.cleanup)
+        archived = Election.objects.filter(status='closed', result_snapshot__isnull=False).last()
+        with override_settings(ARCHIVE_DIR=archive_dir.name):
+            archive_election(archived)
+
+        with EndpointProfiler() as profiler:
+            # Públicos (sin token)
+            self.client.credentials()
+            self.client.get('/api/')
+            self.client.post('/api/register/', {
+                'email': 'budget-new@test.com',
+                'password': 'BudgetPass123!',
+                'password_confirm': 'BudgetPass123!',
+                'full_name': 'Budget New'
+            }, format='json')
+            self.client.post('/api/login/', {
+                'email': 'budget-admin@test.com',
+                'password': 'BudgetPass123!'
+            }, format='json')
+            self.client.post('/api/token/refresh/', {'refresh': str(self.refresh)}, format='json')
+            self.client.get('/api/elections/')
+            self.client.get(f'/api/elections/{self.active.id}/')
+            self.client.get('/api/candidates/')
+            self.client.get(f'/api/candidates/{self.candidate.id}/')
+            self.client.get(f'/api/results/{self.active.id}/')
+            self.client.get(f'/api/results/{closed.id}/')
+            self.client.get('/api/history/')
+
+            # Autenticados
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.refresh.access_token}')
+            self.client.get('/api/profile/')
+            self.client.post('/api/vote/', {
+                'election_id': str(self.active.id),
+                'candidate_id': str(self.candidate.id)
+            }, format='json')
+            self.client.get(f'/api/has-voted/{self.active.id}/')
+            self.client.get(f'/api/ballot/{self.active.id}/')
+            self.client.get('/api/has-voted/')
+            self.client.get('/api/metrics/')
+            self.client.get(f'/api/export/{self.active.id}/votes.csv')
+            with override_settings(ARCHIVE_DIR=archive_dir.name):
+                self.client.get(f'/api/archive/{archived.id}/votes.csv')
+            self.client.get(f'/api/analytics/{self.active.id}/?by=candidate')
+
+        self.assertEqual(profiler.violations(), [], profiler.report())
+
+        exercised = {sample['name'] for sample in profiler.samples if sample['status'] < 400}
+        budgeted = {name for name, budget in ENDPOINT_BUDGETS.items() if budget is not None}
+        self.assertEqual(budgeted - exercised, set())
+
+
+# ============================================
+# TESTS: ASESOR DE ÍNDICES
+# ============================================
+
+class IndexAdvisorTests(TestCase):
+    """Tests para el comando advise_indexes"""
+
+    def test_coverage_and_redundancy_rules(self):
+        """Test: Un índice cubre el patrón por prefijo y los prefijos son redundantes"""
+        from .index_advisor import QUERY_PATTERNS, find_redundant
+
+        elections = next(p for p in QUERY_PATTERNS if p.table == 'elections')
+        self.assertTrue(elections.is_covered_by(['status', 'end_date', 'id']))
+        self.assertFalse(elections.is_covered_by(['end_date', 'status']))
+
+        votes = next(p for p in QUERY_PATTERNS if p.columns == ['election_id', 'candidate_id'])
+        self.assertTrue(votes.is_covered_by(['candidate_id', 'election_id']))
+
+        redundant = find_redundant({
+            'pk': {'columns': ['id'], 'unique': True},
+            'by_election': {'columns': ['election_id'], 'unique': False},
+            'by_election_candidate': {'columns': ['election_id', 'candidate_id'], 'unique': False},
+            'copy_a': {'columns': ['cast_at'], 'unique': False},
+            'copy_b': {'columns': ['cast_at'], 'unique': False},
+        })
+        self.assertEqual(redundant, [('by_election', 'by_election_candidate'), ('copy_b', 'copy_a')])
+
+    def test_command_emits_ddl_for_missing_indexes(self):
+        """Test: El comando reporta índices faltantes con su plan y DDL"""
+        import json
+        from io import StringIO
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command('advise_indexes', '--json', stdout=out)
+        report = json.loads(out.getvalue())
+
+        missing = {tuple(entry['columns']): entry for entry in report['missing']}
+        self.assertIn(('status', 'end_date'), missing)
+        self.assertTrue(missing[('status', 'end_date')]['plan'])
+
+        out = StringIO()
+        call_command('advise_indexes', '--sql', '--no-explain', stdout=out)
+        self.assertIn('"elections" ("status", "end_date");', out.getvalue())
+
+
+# ============================================
+# TESTS: PARTICIONES DE VOTOS
+# ============================================
+
+class PartitionTests(TestCase):
+    """Tests para el particionamiento de votes/vote_registry por elección"""
+
+    def setUp(self):
+        now = timezone.now()
+        self.election = Election.objects.create(
+            title='Particionada',
+            start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=1),
+            status='draft'
+        )
+        self.candidate = Candidate.objects.create(election=self.election, name='A')
+        self.user = User.objects.create(email='partition@test.com', password='x', full_name='P')
+
+    def test_hooks_do_nothing_without_partitioned_tables(self):
+        """Test: Sin tablas particionadas activar y cerrar no cambia nada"""
+        from django.core.management import CommandError, call_command
+        from django.db import connection
+        from .partitions import attach_partitions, detach_partitions
+
+        self.election.status = 'active'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.election.save()
+
+        self.assertEqual(attach_partitions(self.election.id), [])
+        self.assertEqual(detach_partitions(self.election.id), [])
+
+        if connection.vendor != 'postgresql':
+            with self.assertRaises(CommandError):
+                call_command('partition_votes', '--sql')
+
+    @override_settings(VOTES_DETACH_ON_CLOSE=True)
+    def test_activation_creates_partition_and_close_detaches_it(self):
+        """Test: Tras convertir, activar crea la partición y cerrar la separa"""
+        from io import StringIO
+        from django.core.management import call_command
+        from django.db import connection
+        from .casting import cast_vote
+        from .partitions import is_partitioned, list_partitions, partition_name
+
+        if connection.vendor != 'postgresql':
+            self.skipTest('Requiere PostgreSQL')
+
+        Vote.objects.create(election=self.election, candidate=self.candidate)
+        call_command('partition_votes', '--apply', stdout=StringIO())
+        self.assertTrue(is_partitioned('votes'))
+        self.assertTrue(is_partitioned('vote_registry'))
+
+        # Elección creada después de convertir: sus filas caen en la default
+        other = Election.objects.create(
+            title='Nueva', start_date=self.election.start_date,
+            end_date=self.election.end_date, status='draft'
+        )
+        candidate = Candidate.objects.create(election=other, name='B')
+        Vote.objects.create(election=other, candidate=candidate)
+
+        other.status = 'active'
+        with self.captureOnCommitCallbacks(execute=True):
+            other.save()
+
+        partition = partition_name('votes', other.id)
+        self.assertIn(partition, [name for name, _ in list_partitions('votes')])
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM {partition}')
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+        # ON CONFLICT (user_id, election_id) sigue funcionando
+        cast_vote(self.user.id, other.id, candidate.id)
+        self.assertEqual(Vote.objects.filter(election=other).count(), 2)
+
+        other.status = 'closed'
+        with self.captureOnCommitCallbacks(execute=True):
+            other.save()
+
+        self.assertFalse(Vote.objects.filter(election=other).exists())
+        self.assertEqual(Vote.objects.filter(election=self.election).count(), 1)
+
+
+# ============================================
+# TESTS: ARCHIVO DE ELECCIONES CERRADAS
+# ============================================
+
+class ArchiveTests(APITestCase):
+    """Tests para archive_elections y /api/archive/"""
+
+    def setUp(self):
+        import tempfile
+        from .snapshots import close_election
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(ARCHIVE_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        now = timezone.now()
+        self.election = Election.objects.create(
+            title='Archivable',
+            start_date=now - timedelta(days=3),
+            end_date=now - timedelta(days=1),
+            status='active'
+        )
+        candidates = [
+            Candidate.objects.create(election=self.election, name=name) for name in ('A', 'B')
+        ]
+        self.admin = User.objects.create(
+            email='archive-admin@test.com', password='x', full_name='Admin', role='admin'
+        )
+        for i in range(5):
+            voter = User.objects.create(email=f'archive{i}@test.com', password='x', full_name=f'V{i}')
+            VoteRegistry.objects.create(user=voter, election=self.election, has_voted=True, voted_at=now)
+            Vote.objects.create(election=self.election, candidate=candidates[i % 2])
+        rebuild_tallies(self.election)
+        close_election(self.election)
+
+    def test_archive_and_restore_roundtrip(self):
+        """Test: Archivar borra las filas y restaurar las devuelve idénticas"""
+        from io import StringIO
+        from django.core.management import call_command
+        from .archive import archive_path, file_checksum
+        from .models import ElectionArchive
+
+        def rows():
+            return (
+                sorted(Vote.objects.filter(election=self.election).values_list('id', 'candidate_id', 'cast_at')),
+                sorted(VoteRegistry.objects.filter(election=self.election).values_list('id', 'user_id', 'voted_at')),
+            )
+
+        before = rows()
+        tallies = sorted(VoteTally.objects.filter(election=self.election).values_list('candidate_id', 'votes'))
+
+        call_command('archive_elections', '--election', str(self.election.id), stdout=StringIO())
+        archive = ElectionArchive.objects.get(election=self.election)
+        self.assertEqual((archive.votes_count, archive.registry_count), (5, 5))
+        self.assertEqual(file_checksum(archive_path(archive)), (archive.sha256, archive.size_bytes))
+        self.assertEqual(rows(), ([], []))
+
+        # Los contadores no se recalculan desde una tabla vacía
+        call_command('rebuild_tallies', stdout=StringIO())
+        self.assertEqual(
+            sorted(VoteTally.objects.filter(election=self.election).values_list('candidate_id', 'votes')),
+            tallies
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('archive_elections', '--restore', str(self.election.id), stdout=StringIO())
+        self.assertEqual(rows(), before)
+        self.assertFalse(ElectionArchive.objects.filter(election=self.election).exists())
+        self.assertFalse(archive_path(archive).exists())
+
+    def test_audit_endpoint_streams_from_archive(self):
+        """Test: /api/archive/ sirve los votos archivados solo a administradores"""
+        import json
+        from .archive import archive_election
+        from .authentication import tokens_for_user
+
+        url = f'/api/archive/{self.election.id}/votes.csv'
+        token = tokens_for_user(self.admin).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        votes = {str(vote_id) for vote_id in Vote.objects.filter(election=self.election).values_list('id', flat=True)}
+        archive_election(self.election)
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,candidate_id,cast_at')
+        self.assertEqual({line.split(',')[0] for line in lines[1:]}, votes)
+
+        response = self.client.get(f'/api/archive/{self.election.id}/turnout.ndjson')
+        turnout = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(turnout), 5)
+        self.assertEqual(set(turnout[0]), {'user_id', 'has_voted'})
+
+        voter = User.objects.get(email='archive0@test.com')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(voter).access_token}')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+
+# ============================================
+# TESTS: APROVISIONAMIENTO
+# ============================================
+
+class ProvisioningTests(TestCase):
+    """Tests para siembra masiva de elecciones y votos"""
+
+    def test_seed_is_deterministic(self):
+        """Test: La misma semilla genera los mismos ids y votos"""
+        from .provisioning import SEED_TITLE_PREFIX, clear_provisioned, seed_elections
+
+        def snapshot():
+            return sorted(Vote.objects.values_list('id', 'candidate_id'))
+
+        first = [election.id for election in seed_elections(seed=7, votes=20)]
+        first_votes = snapshot()
+
+        clear_provisioned(title_prefix=SEED_TITLE_PREFIX)
+        self.assertEqual(Vote.objects.count(), 0)
+
+        second = [election.id for election in seed_elections(seed=7, votes=20)]
+        self.assertEqual(first, second)
+        self.assertEqual(first_votes, snapshot())
+
+    def test_seed_command_requires_reset_when_seeded(self):
+        """Test: Volver a sembrar sin --reset falla con CommandError antes de escribir"""
+        from io import StringIO
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+
+        call_command('seed_elections', '--votes', '10', stdout=StringIO())
+        votes = Vote.objects.count()
+
+        with self.assertRaisesMessage(CommandError, '--reset'):
+            call_command('seed_elections', '--votes', '10', stdout=StringIO())
+        self.assertEqual(Vote.objects.count(), votes)
+
+        call_command('seed_elections', '--votes', '10', '--reset', stdout=StringIO())
+        self.assertEqual(Election.objects.count(), 2)
+
+    def test_tallies_and_snapshot_match_votes(self):
+        """Test: Contadores y snapshot coinciden con los votos insertados"""
+        import random
+        from .provisioning import provision_election
+
+        now = timezone.now()
+        election = provision_election(
+            random.Random(1),
+            'Provisioned',
+            [{'name': 'A'}, {'name': 'B'}],
+            status='closed',
+            votes=50,
+            weights=[3, 1],
+            start_date=now - timedelta(days=3),
+            end_date=now - timedelta(days=1)
+        )
+
+        self.assertEqual(rebuild_tallies(election, dry_run=True), [])
+        self.assertEqual(election.result_snapshot.total_votes, 50)
+        self.assertFalse(Vote.objects.filter(election=election, cast_at__gt=election.end_date).exists())
+
+
+# ============================================
+# TESTS: BENCHMARK
+# ============================================
+
+class BenchmarkTests(TestCase):
+    """Tests para la suite de benchmark"""
+
+    def test_percentile_nearest_rank(self):
+        """Test: Percentiles por rango más cercano"""
+        from .benchmark import percentile
+
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_seeded_run_reports_latency_and_queries(self):
+        """Test: Siembra determinista y reporte por escenario"""
+        from .benchmark import seed_dataset, run_benchmark
+
+        dataset = seed_dataset(users=5, elections=1, closed_elections=2, candidates=2, votes=4)
+
+        self.assertEqual(User.objects.filter(email__endswith='@benchmark.local').count(), 5)
+        self.assertEqual(Vote.objects.count(), 4)
+        self.assertEqual(len(dataset.open_pairs), 5 - VoteRegistry.objects.filter(
+            election_id=dataset.active_elections[0]
+        ).count())
+
+        report = run_benchmark(dataset, scenarios=['results', 'history'], requests=3, concurrency=1)
+
+        for scenario in ('results', 'history'):
+            self.assertEqual(report[scenario]['requests'], 3)
+            self.assertEqual(report[scenario]['errors'], 0)
+            self.assertGreater(report[scenario]['queries_per_request']['mean'], 0)
+            self.assertIsNotNone(report[scenario]['latency_ms']['p95'])
+
 
 # ============================================
 # TESTS: MODELOS
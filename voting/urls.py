@@ -5,7 +5,8 @@ from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
     RegisterView, LoginView, ProfileView,
     ElectionViewSet, CandidateViewSet,
-    VoteView, HasVotedView, ResultsView, HistoryView
+    VoteView, HasVotedView, HasVotedBulkView, BallotView, ResultsView, ResultsStreamView, HistoryView,
+    MetricsView, ExportView, ArchiveView, AnalyticsView
 )
 
 # Router para viewsets
@@ -22,10 +23,19 @@ urlpatterns = [
 
     # Votación
     path('vote/', VoteView.as_view(), name='vote'),
+    path('has-voted/', HasVotedBulkView.as_view(), name='has-voted-bulk'),
     path('has-voted/<uuid:election_id>/', HasVotedView.as_view(), name='has-voted'),
+    path('ballot/<uuid:election_id>/', BallotView.as_view(), name='ballot'),
     path('results/<uuid:election_id>/', ResultsView.as_view(), name='results'),
+    path('results/<uuid:election_id>/stream/', ResultsStreamView.as_view(), name='results-stream'),
     path('history/', HistoryView.as_view(), name='history'),
 
+    # Operación
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path('analytics/<uuid:election_id>/', AnalyticsView.as_view(), name='analytics'),
+    path('export/<uuid:election_id>/<slug:dataset>.<slug:fmt>', ExportView.as_view(), name='export'),
+    path('archive/<uuid:election_id>/<slug:dataset>.<slug:fmt>', ArchiveView.as_view(), name='archive'),
+
     # Router
     path('', include(router.urls)),
 ]
@@ -0,0 +1,104 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+from .routers import pin_catalog, pin_results
+
+# ============================================
+# VERSIONES PARA VALIDACIÓN CONDICIONAL (ETag)
+#
+# Contadores baratos en cache que cambian cuando cambian los datos:
+# - resultados de una elección: al confirmar cada voto
+# - catálogo (elecciones/candidatos): al editarlos en el admin
+#
+# Cada versión inicia con el reloj y expira tras
+# CONDITIONAL_VERSION_TIMEOUT segundos, así nunca repite un valor
+# anterior.
+#
+# Estas versiones (y con ellas los ETag y el hub de resultados en vivo,
+# ver live.py) y el cache de has-voted solo son correctos si todos los
+# workers ven el mismo cache default: con WEB_CONCURRENCY > 1 el
+# proceso no arranca con un cache local (ver check_shared_cache).
+# ============================================
+
+CATALOG_VERSION_KEY = 'voting:catalog-version'
+
+# Backends cuyo contenido no ven los demás procesos
+LOCAL_CACHE_BACKENDS = (LocMemCache, DummyCache)
+
+
+def check_shared_cache():
+    """Lanza ImproperlyConfigured si hay varios workers y el cache es local."""
+    if settings.WEB_CONCURRENCY > 1 and isinstance(caches['default'], LOCAL_CACHE_BACKENDS):
+        raise ImproperlyConfigured(
+            f'WEB_CONCURRENCY={settings.WEB_CONCURRENCY} requiere un cache compartido '
+            f'(CACHE_BACKEND/CACHE_LOCATION, ej. Redis o Memcached): con '
+            f'{type(caches["default"]).__name__} cada worker tendría sus propias '
+            f'versiones de resultados y su propio cache de has-voted.'
+        )
+
+
+def results_version_key(election_id):
+    return f'voting:results-version:{election_id}'
+
+
+def get_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), settings.CONDITIONAL_VERSION_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    if cache.add(key, time.time_ns(), settings.CONDITIONAL_VERSION_TIMEOUT):
+        return cache.get(key)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # La llave expiró entre add e incr
+        cache.set(key, time.time_ns(), settings.CONDITIONAL_VERSION_TIMEOUT)
+        return cache.get(key)
+
+
+def get_results_version(election_id):
+    return get_version(results_version_key(election_id))
+
+
+def bump_results_version(election_id):
+    """Marca que los resultados de la elección cambiaron."""
+    pin_results(election_id)
+    return bump_version(results_version_key(election_id))
+
+
+def get_catalog_version():
+    return get_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version():
+    """Marca que elecciones o candidatos cambiaron."""
+    pin_catalog()
+    return bump_version(CATALOG_VERSION_KEY)
+
+
+# ============================================
+# FUNCIONES ETAG (para django.views.decorators.http.condition)
+# No consultan la base de datos.
+# ============================================
+
+def results_etag(request, election_id):
+    return f'results-{election_id}-{get_results_version(election_id)}-{get_catalog_version()}'
+
+
+def elections_etag(request, *args, **kwargs):
+    # is_active depende de la hora: renovar al menos cada minuto
+    minute = int(time.time() // 60)
+    return f'elections-{get_catalog_version()}-{minute}'
+
+
+def candidates_etag(request, *args, **kwargs):
+    return f'candidates-{get_catalog_version()}'
@@ -2,18 +2,71 @@ from rest_framework import viewsets, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth.hashers import check_password
+from rest_framework.pagination import CursorPagination
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from functools import wraps
+import uuid
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from django.http import JsonResponse, StreamingHttpResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views import View
 from django.db import transaction
-from django.db.models import Count
+from asgiref.sync import sync_to_async
 
-from .models import User, Election, Candidate, VoteRegistry, Vote
+from .models import User, Election, Candidate, VoteRegistry, ElectionArchive
 from .serializers import (
     UserSerializer, RegisterSerializer, LoginSerializer,
-    ElectionSerializer, CandidateSerializer, VoteSerializer,
+    ElectionSerializer, CandidateSerializer,
     CastVoteSerializer
 )
+from .tallies import annotate_votes, build_results
+from .casting import cast_vote, AlreadyVoted, ElectionNotOpen, voted_elections, forget_voted_elections
+from .ingest import enqueue_vote, get_journal
+from .snapshots import build_results_payload, compute_etag
+from .live import RETRY_AFTER_SECONDS, election_exists, stream_results, streams_full
+from .exports import DATASETS, CONTENT_TYPES, EXPORTERS, export_dataset
+from .archive import ARCHIVE_DATASETS, archive_path, dataset_rows
+from .analytics import BUCKETS, vote_rate, turnout
+from .versions import bump_results_version, results_etag, elections_etag, candidates_etag
+from .object_cache import (
+    object_cache, list_elections, list_candidates, active_election_ids, get_ballot,
+    get_election_or_404, get_candidate_or_404
+)
+from .permissions import IsAdminRole
+from .pagination import ElectionPagination, CandidatePagination
+from .async_views import AsyncAPIView, async_conditional, iterate_in_thread
+from .db import StatementTimeoutMixin
+from .routers import (
+    CatalogReadMixin, ReplicaReadMixin, pin_user_to_primary, reading_from_replica, results_pinned
+)
+from .authentication import tokens_for_user
+from .passwords import HashingBusy, get_hashing_pool, verify_password
+
+# ============================================
+# UTILIDAD: RESPUESTAS CONDICIONALES (ETag)
+# ============================================
+
+def conditional(etag_func):
+    """
+    Responde 304 Not Modified si If-None-Match coincide con el ETag
+    calculado por `etag_func` (sin consultar la base de datos).
+    Las respuestas completas llevan `Cache-Control: no-cache` para que
+    el navegador siempre revalide.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            response = view_func(request, *args, **kwargs)
+            if not response.has_header('Cache-Control'):
+                patch_cache_control(response, no_cache=True)
+            return response
+        return condition(etag_func=etag_func)(wrapper)
+    return decorator
+
 
 # ============================================
 # VISTA: REGISTRO DE USUARIOS
@@ -30,10 +83,13 @@ class RegisterView(APIView):
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
         if serializer.is_valid():
-            user = serializer.save()
+            try:
+                user = serializer.save()
+            except HashingBusy:
+                return hashing_busy_response()
 
-            # Generar tokens JWT
-            refresh = RefreshToken.for_user(user)
+            # Generar tokens JWT (un usuario nuevo no tiene tokens revocados)
+            refresh = tokens_for_user(user, version=0)
 
             return Response({
                 'message': 'Usuario registrado exitosamente',
@@ -55,6 +111,8 @@ class LoginView(APIView):
     """
     POST /api/login/
     Autentica usuario y retorna tokens JWT.
+
+    Responde 429 (Retry-After) si el pool de hashing está lleno.
     """
 
     permission_classes = [AllowAny]
@@ -76,13 +134,22 @@ class LoginView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        # Verificar password
-        if not check_password(password, user.password):
+        # Verificar password (en el pool de hashing, ver passwords.py)
+        try:
+            valid, rehashed = verify_password(password, user.password)
+        except HashingBusy:
+            return hashing_busy_response()
+
+        if not valid:
             return Response(
                 {'error': 'Credenciales inválidas'},
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
+        if rehashed:
+            # update() no dispara señales: el rehash no revoca los tokens
+            User.objects.filter(id=user.id).update(password=rehashed)
+
         # Verificar que usuario esté activo
         if not user.is_active:
             return Response(
@@ -91,7 +158,7 @@ class LoginView(APIView):
             )
 
         # Generar tokens JWT
-        refresh = RefreshToken.for_user(user)
+        refresh = tokens_for_user(user)
 
         return Response({
             'message': 'Login exitoso',
@@ -103,6 +170,16 @@ class LoginView(APIView):
         }, status=status.HTTP_200_OK)
 
 
+def hashing_busy_response():
+    """429 cuando el pool de hashing está lleno (pico de logins)"""
+    response = Response(
+        {'error': 'Demasiados inicios de sesión simultáneos, intenta de nuevo en unos segundos'},
+        status=status.HTTP_429_TOO_MANY_REQUESTS
+    )
+    response['Retry-After'] = str(settings.PASSWORD_HASH_RETRY_AFTER)
+    return response
+
+
 # ============================================
 # VISTA: PERFIL DE USUARIO
 # ============================================
@@ -117,7 +194,16 @@ class ProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        serializer = UserSerializer(request.user)
+        # request.user solo trae los claims del token: leer el perfil completo
+        try:
+            user = User.objects.get(id=request.user.id)
+        except User.DoesNotExist:
+            return Response(
+                {'error': 'Usuario no encontrado'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        serializer = UserSerializer(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -125,62 +211,80 @@ class ProfileView(APIView):
 # VIEWSET: ELECTIONS
 # ============================================
 
-class ElectionViewSet(viewsets.ReadOnlyModelViewSet):
+@method_decorator(conditional(elections_etag), name='list')
+@method_decorator(conditional(elections_etag), name='retrieve')
+class ElectionViewSet(CatalogReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet para consultar elecciones.
 
     Endpoints generados:
     - GET /api/elections/ - Lista todas las elecciones
     - GET /api/elections/{id}/ - Detalle de una elección
+
+    Paginación por cursor en orden (created_at, id) descendente y
+    ?fields=id,title para pedir solo algunos campos.
+    Soporta If-None-Match (ETag según versión del catálogo).
+    El listado lee de la réplica si hay una; el detalle sale del cache
+    de objetos (ver routers.py).
     """
 
     queryset = Election.objects.all()
     serializer_class = ElectionSerializer
     permission_classes = [AllowAny]
+    pagination_class = ElectionPagination
 
     def get_queryset(self):
         """
         Opcionalmente filtrar por status.
         Ej: /api/elections/?status=active
+
+        La página se lee de la base por llave (ver pagination.py).
         """
-        queryset = super().get_queryset()
         status_filter = self.request.query_params.get('status', None)
+        return list_elections(status_filter)
 
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-
-        return queryset
+    def get_object(self):
+        return get_election_or_404(self.kwargs['pk'])
 
 
 # ============================================
 # VIEWSET: CANDIDATES
 # ============================================
 
-class CandidateViewSet(viewsets.ReadOnlyModelViewSet):
+@method_decorator(conditional(candidates_etag), name='list')
+@method_decorator(conditional(candidates_etag), name='retrieve')
+class CandidateViewSet(CatalogReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet para consultar candidatos.
 
     Endpoints generados:
     - GET /api/candidates/ - Lista todos los candidatos
     - GET /api/candidates/{id}/ - Detalle de un candidato
+
+    Paginación por cursor en orden (display_order, name, id) y
+    ?fields=id,name para pedir solo algunos campos.
+    Soporta If-None-Match (ETag según versión del catálogo).
+    El listado lee de la réplica si hay una; el detalle sale del cache
+    de objetos (ver routers.py).
     """
 
     queryset = Candidate.objects.all()
     serializer_class = CandidateSerializer
     permission_classes = [AllowAny]
+    pagination_class = CandidatePagination
 
     def get_queryset(self):
         """
         Opcionalmente filtrar por election_id.
         Ej: /api/candidates/?election=uuid-de-eleccion
+
+        La página se lee de la base por llave (ver pagination.py).
         """
-        queryset = super().get_queryset()
         election_id = self.request.query_params.get('election', None)
+        return list_candidates(election_id)
 
-        if election_id:
-            queryset = queryset.filter(election_id=election_id)
-
-        return queryset
+    def get_object(self):
+        return get_candidate_or_404(self.kwargs['pk'])
 
 
 # ============================================
@@ -200,9 +304,14 @@ class VoteView(APIView):
     5. Candidato existe y pertenece a la elección
     6. Usuario NO ha votado antes en esta elección
 
-    Operación atómica:
+    Operación atómica (una sola sentencia en PostgreSQL, ver casting.py):
+    - Reclama registro en VoteRegistry (INSERT ... ON CONFLICT)
     - Crea registro en Vote (anónimo)
-    - Actualiza/crea registro en VoteRegistry
+    - Incrementa contador en VoteTally
+    - Al confirmar, notifica a los streams de resultados en vivo
+
+    Con VOTE_INGESTION_MODE = 'queued' solo se reclama el registro y el
+    voto se encola para inserción por lotes (responde 202).
     """
 
     permission_classes = [IsAuthenticated]
@@ -239,62 +348,64 @@ class VoteView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # 3. Verificar que usuario NO haya votado
-        try:
-            vote_registry = VoteRegistry.objects.get(user=user, election=election)
-            if vote_registry.has_voted:
-                return Response(
-                    {'error': 'Ya has votado en esta elección'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        except VoteRegistry.DoesNotExist:
-            vote_registry = None
-
         # ========== EMITIR VOTO (Operación Atómica) ==========
+        # 3. El registro único (user, election) impide votar dos veces
 
-        try:
-            with transaction.atomic():
-                # Crear voto anónimo
-                Vote.objects.create(
-                    election=election,
-                    candidate=candidate
-                    # NO incluir user (anonimato)
-                )
-
-                # Actualizar o crear registro de control
-                if vote_registry:
-                    vote_registry.has_voted = True
-                    vote_registry.voted_at = timezone.now()
-                    vote_registry.save()
-                else:
-                    VoteRegistry.objects.create(
-                        user=user,
-                        election=election,
-                        has_voted=True,
-                        voted_at=timezone.now()
-                    )
-
-                return Response({
-                    'message': 'Voto registrado exitosamente',
-                    'election': election.title,
-                    'candidate': candidate.name
-                }, status=status.HTTP_201_CREATED)
+        queued = settings.VOTE_INGESTION_MODE == 'queued'
 
+        try:
+            if queued:
+                enqueue_vote(user.id, election.id, candidate.id)
+            else:
+                cast_vote(user.id, election.id, candidate.id)
+        except AlreadyVoted:
+            return Response(
+                {'error': 'Ya has votado en esta elección'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except ElectionNotOpen:
+            # El cache de elecciones estaba atrasado: la base manda
+            return Response(
+                {'error': 'La elección ya no está abierta para votar'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             return Response(
                 {'error': f'Error al registrar voto: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+        transaction.on_commit(lambda: forget_voted_elections(user.id))
+        # Sus próximas lecturas no deben venir de una réplica atrasada
+        transaction.on_commit(lambda: pin_user_to_primary(user.id))
+
+        if queued:
+            # El voto se insertará en el próximo lote (ver ingest.py)
+            return Response({
+                'message': 'Voto registrado exitosamente',
+                'election': election.title,
+                'candidate': candidate.name
+            }, status=status.HTTP_202_ACCEPTED)
+
+        # Notificar resultados en vivo solo si la transacción confirma
+        transaction.on_commit(lambda: bump_results_version(election.id))
+
+        return Response({
+            'message': 'Voto registrado exitosamente',
+            'election': election.title,
+            'candidate': candidate.name
+        }, status=status.HTTP_201_CREATED)
+
 
 # ============================================
 # VISTA: VERIFICAR SI YA VOTÓ
 # ============================================
 
-class HasVotedView(APIView):
+class HasVotedView(AsyncAPIView):
     """
     GET /api/has-voted/{election_id}/
     Verifica si el usuario autenticado ya votó en una elección.
+    Vista async: no ocupa un thread mientras espera a la base de datos.
 
     Retorna:
     {
@@ -307,12 +418,12 @@ class HasVotedView(APIView):
 
     permission_classes = [IsAuthenticated]
 
-    def get(self, request, election_id):
+    async def get(self, request, election_id):
         user = request.user
 
         # Verificar que elección existe
         try:
-            election = Election.objects.get(id=election_id)
+            election = await Election.objects.aget(id=election_id)
         except Election.DoesNotExist:
             return Response(
                 {'error': 'Elección no encontrada'},
@@ -321,7 +432,7 @@ class HasVotedView(APIView):
 
         # Buscar registro de votación
         try:
-            vote_registry = VoteRegistry.objects.get(user=user, election=election)
+            vote_registry = await VoteRegistry.objects.aget(user_id=user.id, election=election)
             return Response({
                 'has_voted': vote_registry.has_voted,
                 'election_id': str(election.id),
@@ -337,11 +448,105 @@ class HasVotedView(APIView):
             }, status=status.HTTP_200_OK)
 
 
+# ============================================
+# VISTA: VERIFICAR VOTOS EN VARIAS ELECCIONES
+# ============================================
+
+class HasVotedBulkView(APIView):
+    """
+    GET /api/has-voted/?elections=uuid1,uuid2
+    Estado de voto del usuario en varias elecciones (sin el parámetro:
+    todas las elecciones activas). Una sola consulta a vote_registry,
+    cacheada por usuario HAS_VOTED_CACHE_TTL segundos.
+
+    Retorna:
+    {
+        "elections": {
+            "uuid1": {"has_voted": true, "voted_at": "timestamp"},
+            "uuid2": {"has_voted": false, "voted_at": null}
+        }
+    }
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        param = request.query_params.get('elections')
+        if param:
+            try:
+                election_ids = [str(uuid.UUID(value.strip())) for value in param.split(',') if value.strip()]
+            except ValueError:
+                return Response(
+                    {'error': 'elections debe ser una lista de UUID separados por coma'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            election_ids = active_election_ids()
+
+        voted = voted_elections(request.user.id)
+
+        return Response({
+            'elections': {
+                election_id: {
+                    'has_voted': election_id in voted,
+                    'voted_at': voted.get(election_id)
+                }
+                for election_id in election_ids
+            }
+        }, status=status.HTTP_200_OK)
+
+
+# ============================================
+# VISTA: PAPELETA (ELECCIÓN + CANDIDATOS + SI YA VOTÓ)
+# ============================================
+
+class BallotView(APIView):
+    """
+    GET /api/ballot/{election_id}/
+    Todo lo que necesita la página de votación en una sola petición.
+
+    Elección y candidatos salen del cache de objetos (compartido entre
+    usuarios); solo el estado de voto se consulta por usuario.
+
+    Retorna:
+    {
+        "election": {...},
+        "candidates": [{...}, ...],
+        "has_voted": true/false,
+        "voted_at": "timestamp" | null
+    }
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, election_id):
+        ballot = get_ballot(election_id)
+        if ballot is None:
+            return Response(
+                {'error': 'Elección no encontrada'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        election, candidates = ballot
+        registry = VoteRegistry.objects.filter(
+            user_id=request.user.id,
+            election_id=election.id,
+            has_voted=True
+        ).values('voted_at').first()
+
+        return Response({
+            'election': ElectionSerializer(election).data,
+            'candidates': CandidateSerializer(candidates, many=True).data,
+            'has_voted': registry is not None,
+            'voted_at': registry['voted_at'] if registry else None
+        }, status=status.HTTP_200_OK)
+
+
 # ============================================
 # VISTA: RESULTADOS DE ELECCIÓN
 # ============================================
 
-class ResultsView(APIView):
+class ResultsView(ReplicaReadMixin, StatementTimeoutMixin, AsyncAPIView):
     """
     GET /api/results/{election_id}/
     Retorna resultados de una elección con conteo de votos.
@@ -360,112 +565,405 @@ class ResultsView(APIView):
             ...
         ]
     }
+
+    Soporta If-None-Match: el ETag se calcula desde las versiones de
+    resultados y catálogo, sin consultar la base de datos.
+    Elecciones cerradas se sirven desde su snapshot congelado,
+    con ETag propio y Cache-Control.
+    Vista async: no ocupa un thread mientras espera a la base de datos.
+    Lee de la réplica si hay una (ver routers.py).
     """
 
     permission_classes = [AllowAny]
+    statement_timeout = settings.DB_READ_STATEMENT_TIMEOUT
 
-    def get(self, request, election_id):
+    @async_conditional(results_etag)
+    async def get(self, request, election_id):
         # Verificar que elección existe
         try:
-            election = Election.objects.get(id=election_id)
+            election = await Election.objects.select_related('result_snapshot').aget(id=election_id)
         except Election.DoesNotExist:
             return Response(
                 {'error': 'Elección no encontrada'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Obtener candidatos de la elección
-        candidates = Candidate.objects.filter(election=election)
+        # Elección cerrada: resultados finales congelados
+        snapshot = getattr(election, 'result_snapshot', None)
+        if election.status == 'closed' and snapshot:
+            return snapshot_response(request, snapshot)
 
-        # Contar votos por candidato
-        vote_counts = Vote.objects.filter(election=election).values('candidate').annotate(
-            count=Count('id')
-        )
+        # Resultados desde contadores (O(#candidatos))
+        payload, winner = await sync_to_async(build_results_payload)(election)
 
-        # Crear diccionario de conteos
-        votes_dict = {item['candidate']: item['count'] for item in vote_counts}
-
-        # Calcular total de votos
-        total_votes = sum(votes_dict.values())
-
-        # Construir resultados
-        results = []
-        for candidate in candidates:
-            votes = votes_dict.get(candidate.id, 0)
-            percentage = (votes / total_votes * 100) if total_votes > 0 else 0
-
-            results.append({
-                'candidate_id': str(candidate.id),
-                'candidate_name': candidate.name,
-                'candidate_photo': candidate.photo_url,
-                'party_group': candidate.party_group,
-                'votes': votes,
-                'percentage': round(percentage, 2)
-            })
+        response = Response(payload, status=status.HTTP_200_OK)
+        if reading_from_replica() and results_pinned(election.id):
+            # La réplica puede no tener aún los últimos votos: un ETag de
+            # versión dejaría este contenido cacheado hasta el próximo voto
+            response['ETag'] = quote_etag(compute_etag(payload))
+        return response
 
-        # Ordenar por votos descendente
-        results.sort(key=lambda x: x['votes'], reverse=True)
 
-        return Response({
-            'election': ElectionSerializer(election).data,
-            'total_votes': total_votes,
-            'results': results
-        }, status=status.HTTP_200_OK)
+def snapshot_response(request, snapshot):
+    """Respuesta de resultados congelados con validación por ETag"""
+    etag = f'"{snapshot.etag}"'
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = Response(snapshot.payload, status=status.HTTP_200_OK)
+
+    response['ETag'] = etag
+    response['Cache-Control'] = 'public, max-age=86400'
+    return response
+
+
+# ============================================
+# VISTA: RESULTADOS EN VIVO (SSE)
+# ============================================
+
+class ResultsStreamView(View):
+    """
+    GET /api/results/{election_id}/stream/
+    Stream Server-Sent Events con los contadores de la elección.
+
+    Eventos:
+    - snapshot: {"total_votes": 100, "votes": {"candidate_id": 45, ...}}
+    - tally:    mismo formato, solo con los candidatos que cambiaron
+
+    Requiere servir la app por config/asgi.py (uvicorn/daphne).
+    """
+
+    async def get(self, request, election_id):
+        # La conexión vuelve al pool antes de empezar el stream
+        if not await sync_to_async(election_exists)(election_id):
+            return JsonResponse(
+                {'error': 'Elección no encontrada'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # Límite por proceso (LIVE_RESULTS_MAX_SUBSCRIBERS)
+        if streams_full():
+            response = JsonResponse(
+                {'error': 'Demasiadas conexiones en vivo; reintentar más tarde'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+            response['Retry-After'] = str(RETRY_AFTER_SECONDS)
+            return response
+
+        # Bajo WSGI el stream se bufferizaría completo: pedir ASGI
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {'error': 'Resultados en vivo requieren servidor ASGI'},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+
+        response = StreamingHttpResponse(
+            stream_results(election_id),
+            content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # Evitar buffering en proxies
+        return response
 
 
 # ============================================
 # VISTA: HISTORIAL DE ELECCIONES CERRADAS
 # ============================================
 
-class HistoryView(APIView):
+class HistoryPagination(CursorPagination):
+    """Paginación por cursor: costo constante sin importar la profundidad."""
+
+    page_size = 20
+    ordering = ('-end_date', '-id')
+
+
+class HistoryView(ReplicaReadMixin, StatementTimeoutMixin, AsyncAPIView):
     """
     GET /api/history/
-    Retorna lista de elecciones cerradas con sus resultados finales.
+    Retorna elecciones cerradas con sus resultados finales, paginadas por cursor.
+
+    Usa a lo sumo 2 consultas por página sin importar cuántas elecciones
+    haya: la página de elecciones (con su snapshot de resultados finales)
+    y, para las que no tengan snapshot, los candidatos con sus contadores.
+    Vista async: no ocupa un thread mientras espera a la base de datos.
+    Lee de la réplica si hay una (ver routers.py).
+
+    Retorna:
+    {
+        "next": "url-siguiente-pagina" | null,
+        "previous": "url-pagina-anterior" | null,
+        "results": [...]
+    }
     """
 
     permission_classes = [AllowAny]
+    statement_timeout = settings.DB_READ_STATEMENT_TIMEOUT
+    pagination_class = HistoryPagination
 
-    def get(self, request):
-        # Obtener elecciones cerradas
-        closed_elections = Election.objects.filter(status='closed').order_by('-end_date')
+    async def get(self, request):
+        paginator = self.pagination_class()
+
+        # Obtener página de elecciones cerradas con su snapshot
+        closed_elections = await sync_to_async(paginator.paginate_queryset)(
+            Election.objects.filter(status='closed').select_related('result_snapshot'),
+            request,
+            view=self
+        )
+
+        # Elecciones sin snapshot: candidatos y contadores en una consulta
+        candidates_by_election = {
+            election.id: []
+            for election in closed_elections
+            if getattr(election, 'result_snapshot', None) is None
+        }
+        if candidates_by_election:
+            candidates = annotate_votes(
+                Candidate.objects.filter(election__in=list(candidates_by_election))
+            )
+            async for candidate in candidates:
+                candidates_by_election[candidate.election_id].append(candidate)
 
         history = []
 
         for election in closed_elections:
-            # Calcular resultados
-            candidates = Candidate.objects.filter(election=election)
-            vote_counts = Vote.objects.filter(election=election).values('candidate').annotate(
-                count=Count('id')
+            snapshot = getattr(election, 'result_snapshot', None)
+
+            if snapshot:
+                election_data = snapshot.payload['election']
+                total_votes = snapshot.total_votes
+                winner = snapshot.winner
+                results = snapshot.payload['results']
+            else:
+                election_data = ElectionSerializer(election).data
+                total_votes, results, winner = build_results(
+                    candidates_by_election[election.id]
+                )
+
+            history.append({
+                'election': election_data,
+                'total_votes': total_votes,
+                'winner': winner,
+                'results': [
+                    {
+                        'candidate_name': result['candidate_name'],
+                        'votes': result['votes'],
+                        'percentage': result['percentage']
+                    }
+                    for result in results
+                ]
+            })
+
+        return paginator.get_paginated_response(history)
+
+
+# ============================================
+# VISTA: MÉTRICAS DEL PROCESO
+# ============================================
+
+class MetricsView(APIView):
+    """
+    GET /api/metrics/
+    Contadores del proceso que atiende la petición (solo administradores).
+
+    Retorna:
+    {
+        "object_cache": {
+            "local_hits": 120, "shared_hits": 4, "misses": 6,
+            "invalidations": 1, "hit_ratio": 0.9538, "local_entries": 5
+        },
+        "password_hashing": {
+            "workers": 2, "max_pending": 32, "hashes": 840, "rejected": 12,
+            "rehashed": 3, "pending": 0, "hash_ms_mean": 310.5,
+            "hash_ms_max": 402.1, "queue_wait_ms_mean": 85.2
+        },
+        "vote_journal": {"pending": 0}   (solo en modo 'queued')
+    }
+    """
+
+    permission_classes = [IsAdminRole]
+
+    def get(self, request):
+        metrics = {
+            'object_cache': object_cache.stats(),
+            'password_hashing': get_hashing_pool().stats()
+        }
+
+        if settings.VOTE_INGESTION_MODE == 'queued':
+            journal = get_journal()
+            metrics['vote_journal'] = {
+                'pending': journal.pending_count(),
+                'dead_letter': journal.dead_letter_count(),
+            }
+
+        return Response(metrics, status=status.HTTP_200_OK)
+
+
+# ============================================
+# VISTA: VELOCIDAD DE VOTACIÓN Y PARTICIPACIÓN
+# ============================================
+
+class AnalyticsView(APIView):
+    """
+    GET /api/analytics/{election_id}/?bucket=minute|hour&since=ISO-8601&by=candidate
+    Votos por minuto u hora y participación (solo administradores).
+
+    Retorna:
+    {
+        "election_id": "uuid",
+        "bucket": "minute",
+        "buckets": [{"start": "2025-01-01T10:00:00Z", "votes": 12}, ...],
+        "next_since": "2025-01-01T10:05:00Z",
+        "turnout": {"voted": 120, "eligible": 400, "percentage": 30.0}
+    }
+
+    Con by=candidate cada intervalo incluye candidate_id. Pasar
+    next_since como `since` en el siguiente pedido: solo llegan los
+    intervalos nuevos (el último se repite porque puede estar incompleto).
+    """
+
+    permission_classes = [IsAdminRole]
+
+    def get(self, request, election_id):
+        bucket = request.query_params.get('bucket', 'minute')
+        if bucket not in BUCKETS:
+            return Response(
+                {'error': f'bucket debe ser uno de: {", ".join(BUCKETS)}'},
+                status=status.HTTP_400_BAD_REQUEST
             )
-            votes_dict = {item['candidate']: item['count'] for item in vote_counts}
-            total_votes = sum(votes_dict.values())
 
-            results = []
-            winner = None
-            max_votes = 0
+        since = request.query_params.get('since') or None
+        if since is not None:
+            try:
+                since = parse_datetime(since)
+            except ValueError:
+                since = None
+            if since is None:
+                return Response(
+                    {'error': 'since debe ser una fecha ISO-8601'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
 
-            for candidate in candidates:
-                votes = votes_dict.get(candidate.id, 0)
-                percentage = (votes / total_votes * 100) if total_votes > 0 else 0
+        try:
+            election = Election.objects.get(id=election_id)
+        except Election.DoesNotExist:
+            return Response(
+                {'error': 'Elección no encontrada'},
+                status=status.HTTP_404_NOT_FOUND
+            )
 
-                result = {
-                    'candidate_name': candidate.name,
-                    'votes': votes,
-                    'percentage': round(percentage, 2)
-                }
-                results.append(result)
+        buckets = vote_rate(
+            election,
+            bucket=bucket,
+            since=since,
+            by_candidate=request.query_params.get('by') == 'candidate'
+        )
 
-                if votes > max_votes:
-                    max_votes = votes
-                    winner = candidate.name
+        return Response({
+            'election_id': str(election.id),
+            'bucket': bucket,
+            'buckets': buckets,
+            'next_since': buckets[-1]['start'] if buckets else since,
+            'turnout': turnout(election)
+        }, status=status.HTTP_200_OK)
 
-            results.sort(key=lambda x: x['votes'], reverse=True)
 
-            history.append({
-                'election': ElectionSerializer(election).data,
-                'total_votes': total_votes,
-                'winner': winner,
-                'results': results
-            })
+# ============================================
+# VISTA: EXPORTACIÓN PARA AUDITORÍA
+# ============================================
+
+class ExportView(StatementTimeoutMixin, APIView):
+    """
+    GET /api/export/{election_id}/{dataset}.{csv|ndjson}
+    Descarga completa de un dataset de la elección (solo administradores).
+
+    Datasets:
+    - results: candidate_id, candidate_name, party_group, votes, percentage
+    - votes:   id, candidate_id, cast_at (votos anónimos)
+    - turnout: user_id, email, full_name, has_voted
+
+    La respuesta se genera en streaming desde un cursor del servidor
+    (ver exports.py): memoria constante aunque haya millones de votos.
+    """
+
+    permission_classes = [IsAdminRole]
+    statement_timeout = settings.DB_EXPORT_STATEMENT_TIMEOUT
+
+    def perform_content_negotiation(self, request, force=False):
+        # Accept: text/csv no debe responder 406; los errores van en JSON
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, election_id, dataset, fmt):
+        if dataset not in DATASETS or fmt not in CONTENT_TYPES:
+            return Response(
+                {'error': f'Exportación no disponible: {dataset}.{fmt}'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        try:
+            election = Election.objects.select_related('result_snapshot').get(id=election_id)
+        except Election.DoesNotExist:
+            return Response(
+                {'error': 'Elección no encontrada'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        content = export_dataset(election, dataset, fmt)
+        if isinstance(request._request, ASGIRequest):
+            content = iterate_in_thread(content)
+
+        response = StreamingHttpResponse(content, content_type=CONTENT_TYPES[fmt])
+        response['Content-Disposition'] = f'attachment; filename="{election.id}-{dataset}.{fmt}"'
+        response['Cache-Control'] = 'no-store'
+        return response
+
+
+# ============================================
+# VISTA: AUDITORÍA DE ELECCIONES ARCHIVADAS
+# ============================================
+
+class ArchiveView(APIView):
+    """
+    GET /api/archive/{election_id}/{dataset}.{csv|ndjson}
+    Votos o participación de una elección archivada, leídos en streaming
+    desde su archivo (ver archive.py) sin restaurarlos (solo administradores).
+
+    Datasets:
+    - votes:   id, candidate_id, cast_at (votos anónimos)
+    - turnout: user_id, has_voted
+    """
+
+    permission_classes = [IsAdminRole]
+
+    def perform_content_negotiation(self, request, force=False):
+        # Accept: text/csv no debe responder 406; los errores van en JSON
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, election_id, dataset, fmt):
+        if dataset not in ARCHIVE_DATASETS or fmt not in CONTENT_TYPES:
+            return Response(
+                {'error': f'Dataset no disponible: {dataset}.{fmt}'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        archive = ElectionArchive.objects.filter(election_id=election_id).first()
+        if archive is None:
+            return Response(
+                {'error': 'La elección no está archivada'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        if not archive_path(archive).exists():
+            return Response(
+                {'error': 'Archivo no disponible en este servidor'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        content = EXPORTERS[fmt](*dataset_rows(archive, dataset))
+        if isinstance(request._request, ASGIRequest):
+            content = iterate_in_thread(content)
 
-        return Response(history, status=status.HTTP_200_OK)
+        response = StreamingHttpResponse(content, content_type=CONTENT_TYPES[fmt])
+        response['Content-Disposition'] = f'attachment; filename="{election_id}-{dataset}-archive.{fmt}"'
+        response['Cache-Control'] = 'no-store'
+        return response